@@ -1,9 +1,9 @@
+from utils.startup_trace import get_tracer, span as TRACE_SPAN
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import threading, os, sys
 import ctypes
 from pathlib import Path
-from core.version_manager import VersionManager
 from utils import paths as PATHS
 from ui import assets_helper as ASSETS
 from config.manager import ConfigManager
@@ -11,9 +11,11 @@ from utils.common import SingletonLock
 from utils.logging import install_logging
 import logging
 from ui import theme as THEME
-from ui.constants import COLORS
+from ui.constants import COLORS, GIT_PROXY_MODE_TEXT
 from ui.window import setup_window as UI_SETUP_WINDOW
 from ui.layout import build_layout as UI_BUILD_LAYOUT
+from ui.layout import build_nav_buttons as UI_BUILD_NAV_BUTTONS
+from ui.layout import build_tab_frames as UI_BUILD_TAB_FRAMES
 from ui.events import select_tab as UI_SELECT_TAB
 from core.process_manager import ProcessManager
 from services.di import ServiceContainer
@@ -51,7 +53,10 @@ class ComfyUILauncherEnhanced:
             self._startup_t0 = _t.perf_counter()
         except Exception:
             self._startup_t0 = None
-        self.root = tk.Tk()
+        # 启动追踪：模块导入阶段从追踪器创建算起
+        get_tracer().since_start("module_imports")
+        with TRACE_SPAN("tk_root"):
+            self.root = tk.Tk()
         # 缓存 Windows wmic 可用性，避免重复尝试
         try:
             self._wmic_available = None
@@ -71,7 +76,8 @@ class ComfyUILauncherEnhanced:
                 pass
         # 统一工作目录为项目根目录（优先选择包含 ComfyUI/main.py 的目录），并在该根目录同级创建 launcher 日志目录
         try:
-            base_root = PATHS.resolve_base_root()
+            with TRACE_SPAN("resolve_base_root"):
+                base_root = PATHS.resolve_base_root()
             # 缓存根目录，并切换工作目录
             try:
                 self._base_root = base_root
@@ -80,7 +86,8 @@ class ComfyUILauncherEnhanced:
             os.chdir(base_root)
             # 在确定根目录后再安装日志，确保日志始终写入 ComfyUI 同级的 launcher 目录
             try:
-                self.logger = install_logging(log_root=base_root)
+                with TRACE_SPAN("install_logging"):
+                    self.logger = install_logging(log_root=base_root)
                 try:
                     self.logger.info("启动器初始化")
                     self.logger.info("工作目录: %s", str(base_root))
@@ -92,7 +99,8 @@ class ComfyUILauncherEnhanced:
             pass
 
         # 初始化窗口外观
-        UI_SETUP_WINDOW(self)
+        with TRACE_SPAN("setup_window"):
+            UI_SETUP_WINDOW(self)
 
         # 基础配置与变量需尽早初始化，避免后续保护性路径检查时出现属性缺失
         try:
@@ -101,7 +109,8 @@ class ComfyUILauncherEnhanced:
             config_file = Path("launcher/config.json")
         self.config_manager = ConfigManager(config_file, self.logger)
         try:
-            self.config = self.config_manager.load_config()
+            with TRACE_SPAN("load_config"):
+                self.config = self.config_manager.load_config()
         finally:
             try:
                 import time as _t
@@ -140,7 +149,8 @@ class ComfyUILauncherEnhanced:
                 pass
         except Exception:
             pass
-        self.setup_variables()
+        with TRACE_SPAN("setup_variables"):
+            self.setup_variables()
 
         # 允许在任意目录运行：如果未检测到有效的 ComfyUI 路径，则提示用户选择
         def is_valid_comfy_path(p: Path) -> bool:
@@ -198,37 +208,42 @@ class ComfyUILauncherEnhanced:
             pass
 
         # 载入其他设置
-        self.load_settings()
+        with TRACE_SPAN("load_settings"):
+            self.load_settings()
         try:
             self._initializing = False
         except Exception:
             pass
 
-        # 初始化版本管理器（传入完整的 ComfyUI 目录路径与 Python 路径）
-        self.version_manager = VersionManager(
-            self,
-            str(comfy_path),
-            self.config["paths"]["python_path"]
-        )
+        # 版本管理器按需创建（见 version_manager 属性），这里只记录 ComfyUI 目录
+        self._vm_comfy_path = str(comfy_path)
 
         # 初始化进程管理器
-        self.process_manager = ProcessManager(self)
+        with TRACE_SPAN("process_manager_init"):
+            self.process_manager = ProcessManager(self)
         try:
-            self.services = ServiceContainer.from_app(self)
+            with TRACE_SPAN("service_container"):
+                self.services = ServiceContainer.from_app(self)
         except Exception:
             self.services = None
+        # 可选的本机控制接口（control_api.enabled）
+        try:
+            if self.services and self.services.control:
+                self.services.control.start()
+        except Exception:
+            pass
 
-        UI_BUILD_LAYOUT(self)
+        with TRACE_SPAN("build_layout"):
+            UI_BUILD_LAYOUT(self)
+        # 首屏绘制后在主线程创建版本管理器，排在启动任务之前，后台线程取用时不会在非主线程创建 Tk 变量
+        self.root.after_idle(lambda: self.version_manager)
         threading.Thread(target=self.process_manager.monitor_process, daemon=True).start()
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         try:
             if getattr(self, 'services', None):
                 try:
+                    # 启动任务只投递一次，由后台调度器执行（此前 after_idle 与线程各触发一次，导致版本刷新与公告重复）
                     self.root.after_idle(lambda: self.services.startup.start_all())
-                    try:
-                        threading.Thread(target=self.services.startup.start_all, daemon=True).start()
-                    except Exception:
-                        pass
                     if getattr(self, 'logger', None):
                         self.logger.info('startup tasks: scheduled on idle')
                 except Exception:
@@ -246,6 +261,15 @@ class ComfyUILauncherEnhanced:
                 self.logger.info("startup: ui ready in %.1f ms", (_t.perf_counter() - self._startup_t0) * 1000.0)
         except Exception:
             pass
+        # 写出启动追踪（launcher/startup_trace.json）；首次 resolve_git 完成后会再次覆盖写出
+        try:
+            tracer = get_tracer()
+            tracer.instant("ui_ready")
+            tracer.write()
+            if getattr(self, 'logger', None):
+                self.logger.info("startup: 最耗时阶段 %s", tracer.summary())
+        except Exception:
+            pass
 
     def apply_pip_proxy_settings(self):
         """根据当前 PyPI 代理设置更新 python_embeded/pip.ini（委托 Service 层）。"""
@@ -257,6 +281,21 @@ class ComfyUILauncherEnhanced:
 
     # ---------- 样式 ----------
 
+    @property
+    def version_manager(self):
+        """内核版本管理器：首次访问时才导入 core.version_manager 并创建。"""
+        vm = self.__dict__.get('_version_manager')
+        if vm is None:
+            with TRACE_SPAN("version_manager_init"):
+                from core.version_manager import VersionManager
+                vm = VersionManager(self, self._vm_comfy_path, self.config["paths"]["python_path"])
+            self._version_manager = vm
+        return vm
+
+    @version_manager.setter
+    def version_manager(self, vm):
+        self._version_manager = vm
+
     # ---------- 变量 ----------
     def setup_variables(self):
         self.compute_mode = tk.StringVar(value="gpu")
@@ -295,9 +334,17 @@ class ComfyUILauncherEnhanced:
         self.pypi_proxy_url = tk.StringVar(value=default_pypi_url)
         # UI 展示值（中文）
         def _pypi_mode_ui_text(mode: str):
-            return "阿里云" if mode == "aliyun" else ("自定义" if mode == "custom" else "不使用")
+            return {"aliyun": "阿里云", "custom": "自定义", "auto": "自动"}.get(mode, "不使用")
         self.pypi_proxy_mode_ui = tk.StringVar(value=_pypi_mode_ui_text(default_pypi_mode))
 
+        # GitHub 代理：启动页网络设置与内核版本管理共用这组变量（VersionManager 创建时沿用）
+        default_git_mode = proxy_cfg.get("git_proxy_mode", "gh-proxy")
+        self.git_proxy_mode = tk.StringVar(value=default_git_mode)
+        self.git_proxy_url = tk.StringVar(value=proxy_cfg.get("git_proxy_url", "https://gh-proxy.com/"))
+        self.git_proxy_mode_ui = tk.StringVar(value=GIT_PROXY_MODE_TEXT.get(default_git_mode, "不使用"))
+        self.git_proxy_mode.trace_add("write", lambda *a: self.save_config())
+        self.git_proxy_url.trace_add("write", lambda *a: self.save_config())
+
         # 变更时持久化并自动应用到 pip.ini
         self.pypi_proxy_mode.trace_add("write", lambda *a: (self.save_config(), self.apply_pip_proxy_settings()))
         self.pypi_proxy_url.trace_add("write", lambda *a: (self.save_config(), self.apply_pip_proxy_settings()))
@@ -345,6 +392,15 @@ class ComfyUILauncherEnhanced:
         except Exception:
             pass
 
+    def _git_proxy_settings(self) -> dict:
+        try:
+            mode = self.git_proxy_mode.get()
+            # 统一 gh-proxy 模式的域名，避免误填 ghproxy.com
+            url = "https://gh-proxy.com/" if mode == "gh-proxy" else self.git_proxy_url.get()
+            return {"git_proxy_mode": mode, "git_proxy_url": url}
+        except Exception:
+            return {}
+
     def save_config(self):
         # 保护性获取变量，避免在初始化早期因为变量不存在而报错
         def _get(var, default):
@@ -378,7 +434,8 @@ class ComfyUILauncherEnhanced:
                 self.services.config.update_proxy_settings(
                     pypi_proxy_mode=_get(self.pypi_proxy_mode, "aliyun"),
                     pypi_proxy_url=_get(self.pypi_proxy_url, "https://mirrors.aliyun.com/pypi/simple/"),
-                    hf_mirror_url=_get(self.hf_mirror_url, "https://hf-mirror.com")
+                    hf_mirror_url=_get(self.hf_mirror_url, "https://hf-mirror.com"),
+                    **self._git_proxy_settings()
                 )
                 self.services.config.set("version_preferences.stable_only", _get(self.stable_only_var, True))
                 self.services.config.set("version_preferences.requirements_sync", _get(self.requirements_sync_var, False))
@@ -409,7 +466,8 @@ class ComfyUILauncherEnhanced:
                     self.config_manager.update_proxy_settings(
                         pypi_proxy_mode=_get(self.pypi_proxy_mode, "aliyun"),
                         pypi_proxy_url=_get(self.pypi_proxy_url, "https://mirrors.aliyun.com/pypi/simple/"),
-                        hf_mirror_url=_get(self.hf_mirror_url, "https://hf-mirror.com")
+                        hf_mirror_url=_get(self.hf_mirror_url, "https://hf-mirror.com"),
+                        **self._git_proxy_settings()
                     )
                 except Exception:
                     pass
@@ -476,12 +534,7 @@ class ComfyUILauncherEnhanced:
             font=("Microsoft YaHei", 11),
             anchor='center', justify='center'
         ).pack(fill=tk.X, pady=(4, 0))
-        self.nav_buttons = {}
-        for key, label in [("launch", "🚀 启动与更新"), ("version", "🧬 内核版本管理"), ("about", "👤 关于我"), ("comfyui", "📚 关于ComfyUI"), ("about_launcher", "🧰 关于启动器")]:
-            btn = ttk.Button(self.sidebar, text=label, style='Nav.TButton',
-                             command=lambda k=key: self.select_tab(k))
-            btn.pack(fill=tk.X, padx=8, pady=3)
-            self.nav_buttons[key] = btn
+        UI_BUILD_NAV_BUTTONS(self)
 
         if self.SHOW_SIDEBAR_DIVIDER:
             if self.SIDEBAR_DIVIDER_SHADOW:
@@ -511,27 +564,8 @@ class ComfyUILauncherEnhanced:
         # ==== 用 ttk.Notebook 实现 tab ====
         self.notebook = ttk.Notebook(self.content_area, style='Hidden.TNotebook')
         self.notebook.pack(fill=tk.BOTH, expand=True)
-        self.tab_frames = {
-            "launch": tk.Frame(self.notebook, bg=c["BG"]),
-            "version": tk.Frame(self.notebook, bg=c["BG"]),
-            "comfyui": tk.Frame(self.notebook, bg=c["BG"]),
-            "about": tk.Frame(self.notebook, bg=c["BG"]),
-            "about_launcher": tk.Frame(self.notebook, bg=c["BG"]),
-        }
-        self.notebook.add(self.tab_frames["launch"], text="启动与更新")
-        self.notebook.add(self.tab_frames["version"], text="内核版本管理")
-        self.notebook.add(self.tab_frames["about"], text="关于我")
-        self.notebook.add(self.tab_frames["comfyui"], text="关于 ComfyUI")
-        self.notebook.add(self.tab_frames["about_launcher"], text="关于启动器")
-
-        self.build_launch_tab(self.tab_frames["launch"])
-        self.build_version_tab(self.tab_frames["version"])
-        ABOUT.build_about_tab(self, self.tab_frames["about"])
-        LAUNCHER_ABOUT.build_about_launcher(self, self.tab_frames["about_launcher"])
-        COMFY.build_about_comfyui(self, self.tab_frames["comfyui"])
-
-        self.notebook.select(self.notebook.tabs()[0])
-        self.current_tab_name = "launch"
+        # 侧栏与各页均来自 ui.layout 的页表，非首屏页在首次选中时构建
+        UI_BUILD_TAB_FRAMES(self, c["BG"])
 
     def select_tab(self, name):
         UI_SELECT_TAB(self, name)
@@ -663,9 +697,9 @@ class ComfyUILauncherEnhanced:
         # 委托到进程管理器统一处理
         return self.process_manager._kill_pids(pids)
 
-    def _is_http_reachable(self) -> bool:
+    def _is_http_reachable(self, timeout: float = None) -> bool:
         # 委托到进程管理器统一处理
-        return self.process_manager._is_http_reachable()
+        return self.process_manager._is_http_reachable(timeout=timeout)
 
     def _refresh_running_status(self):
         # 委托到进程管理器统一处理
@@ -766,6 +800,7 @@ class ComfyUILauncherEnhanced:
             except Exception:
                 pass
             try:
+                from core.version_manager import VersionManager
                 self.version_manager = VersionManager(self, str(cand), self.config["paths"]["python_path"])
             except Exception:
                 pass
@@ -838,7 +873,8 @@ class ComfyUILauncherEnhanced:
                         except Exception:
                             pass
                 self.root.after(0, _reset_btn)
-        threading.Thread(target=worker, daemon=True).start()
+        from core import scheduler as SCHED
+        SCHED.submit(worker, key="update:batch")
 
     def update_frontend(self, notify: bool = True):
         try:
@@ -890,7 +926,14 @@ class ComfyUILauncherEnhanced:
 
     # ---------- Git 解析 ----------
     def resolve_git(self):
-        return self.services.git.resolve_git()
+        tracer = get_tracer()
+        if not tracer.first("resolve_git"):
+            return self.services.git.resolve_git()
+        try:
+            with TRACE_SPAN("resolve_git", first=True):
+                return self.services.git.resolve_git()
+        finally:
+            tracer.write()
 
     def _apply_manager_git_exe(self, git_path: str):
         self.services.git.apply_to_manager(git_path)
@@ -936,7 +979,8 @@ class ComfyUILauncherEnhanced:
             running_tracked = False
         externally_running = False
         try:
-            externally_running = self._is_http_reachable()
+            from core.probe import UI_PROBE_TIMEOUT
+            externally_running = self._is_http_reachable(timeout=UI_PROBE_TIMEOUT)
         except Exception:
             pass
         if running_tracked or externally_running:
@@ -951,15 +995,42 @@ class ComfyUILauncherEnhanced:
                 ok = bool(self.process_manager.stop_comfyui_sync())
             except Exception:
                 ok = False
-            try:
-                self.root.destroy()
-            except Exception:
-                pass
-        else:
-            try:
-                self.root.destroy()
-            except Exception:
-                pass
+        try:
+            instances = self.process_manager.instances
+            if any(i.is_running() for i in instances.instances()):
+                try:
+                    stop_extra = messagebox.askyesno("提示", f"{instances.format_aggregate()}\n是否同时停止这些附加实例？")
+                except Exception:
+                    stop_extra = True
+                if stop_extra:
+                    instances.stop_all()
+        except Exception:
+            pass
+        try:
+            if getattr(self, 'services', None) and self.services.control:
+                self.services.control.stop()
+        except Exception:
+            pass
+        try:
+            self.process_manager.supervisor.shutdown()
+        except Exception:
+            pass
+        # 丢弃尚未开始的后台任务
+        try:
+            from core.scheduler import get_scheduler
+            get_scheduler().shutdown()
+        except Exception:
+            pass
+        # 结束常驻的 git cat-file 进程
+        try:
+            from core import git_query as GQ
+            GQ.close_all()
+        except Exception:
+            pass
+        try:
+            self.root.destroy()
+        except Exception:
+            pass
 
     def stop_all_comfyui_instances(self) -> bool:
         # 委托到进程管理器统一处理
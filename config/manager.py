@@ -36,7 +36,15 @@ class ConfigManager:
                 "extra_args": "",
                 "attention_mode": "",
                 "browser_open_mode": "default",
-                "custom_browser_path": ""
+                "custom_browser_path": "",
+                "capture_output": False,
+                "stop_grace_seconds": 5.0,
+                "stop_kill_wait_seconds": 2.0,
+                "auto_restart": False,
+                "restart_backoff_seconds": 2.0,
+                "restart_backoff_max_seconds": 60.0,
+                "crash_loop_exits": 5,
+                "crash_loop_window_seconds": 300
             },
             "ui_settings": {
                 "window_width": 800,
@@ -63,6 +71,8 @@ class ConfigManager:
             "proxy_settings": {
                 "git_proxy_mode": "gh-proxy",
                 "git_proxy_url": "https://gh-proxy.com/",
+                "git_fetch_mode": "auto",
+                "git_fetch_depth": 50,
                 "pypi_proxy_mode": "aliyun",
                 "pypi_proxy_url": "https://mirrors.aliyun.com/pypi/simple/",
                 "hf_mirror_mode": "hf-mirror",
@@ -72,6 +82,12 @@ class ConfigManager:
                 "enabled": True,
                 "source_url": "https://gitee.com/MieMieeeee/comfyui-mie-resources/raw/master/launcher/announcements/index.json",
                 "fallback_urls": []
+            },
+            "instances": [],
+            "control_api": {
+                "enabled": False,
+                "port": 18188,
+                "token": ""
             }
         }
     
@@ -0,0 +1,177 @@
+"""
+分页的提交历史模型。
+
+按页（PAGE_SIZE 条）从 `git log --skip` 加载提交，随滚动继续加载更早的历史；
+界面只物化一个滑动窗口（HistoryWindow），滚动到边缘时成批插入/移除行，
+筛选与按哈希/提交信息的增量搜索都在内存列表上完成。
+"""
+
+import threading
+
+LOG_FORMAT = "%H|%cd|%an|%s"
+PAGE_SIZE = 200
+WINDOW_CHUNK = 100
+WINDOW_MAX_ROWS = 400
+
+
+def log_args(ref=None, skip: int = 0, count: int = PAGE_SIZE, revision_range=None) -> list:
+    args = ["log", f"--pretty=format:{LOG_FORMAT}", "--date=short", "--date-order"]
+    if skip:
+        args.append(f"--skip={int(skip)}")
+    if count:
+        args.append(f"-{int(count)}")
+    if revision_range:
+        args.append(revision_range)
+    elif ref:
+        args.append(ref)
+    return args
+
+
+def parse_log(text: str) -> list:
+    commits = []
+    for line in (text or "").strip().split("\n"):
+        if "|" in line:
+            parts = line.split("|", 3)
+            if len(parts) == 4:
+                commits.append({
+                    "hash": parts[0][:8],
+                    "full_hash": parts[0],
+                    "date": parts[1],
+                    "author": parts[2],
+                    "message": parts[3],
+                })
+    return commits
+
+
+def matches(commit: dict, query: str) -> bool:
+    """哈希前缀或提交信息/作者包含（不区分大小写）即匹配。"""
+    q = (query or "").strip().lower()
+    if not q:
+        return True
+    return (commit.get("full_hash", "").lower().startswith(q)
+            or q in commit.get("message", "").lower()
+            or q in commit.get("author", "").lower())
+
+
+class CommitHistory:
+    """已加载的提交列表；load_more(run) 在后台线程中调用，run(args) 执行 git 并返回 CompletedProcess。
+
+    tip 为列表对应的引用提交；翻页基于 base（默认 tip/ref）执行 `git log --skip`，
+    列表开头的 base_offset 条不属于 base 的历史（增量追加的新提交），计算 --skip 时扣除。
+    """
+
+    def __init__(self, ref=None, page_size: int = PAGE_SIZE):
+        self.ref = ref
+        self.page_size = page_size
+        self.commits = []
+        self.exhausted = False
+        self.tip = None
+        self.base = None
+        self.base_offset = 0
+        self._lock = threading.Lock()
+        self._seen = set()
+
+    def reset(self, ref=None, commits=None, exhausted: bool = False, tip=None, base=None, base_offset: int = 0):
+        with self._lock:
+            self.ref = ref
+            self.commits = []
+            self._seen = set()
+            self.exhausted = exhausted
+            self.tip = tip
+            self.base = base or tip
+            self.base_offset = max(0, int(base_offset or 0))
+            self._extend_locked(commits or [])
+
+    def _extend_locked(self, page):
+        added = 0
+        for c in page:
+            h = c.get("full_hash")
+            if h and h not in self._seen:
+                self._seen.add(h)
+                self.commits.append(c)
+                added += 1
+        return added
+
+    def __len__(self):
+        return len(self.commits)
+
+    def load_more(self, run) -> int:
+        """加载下一页，返回新增条数；git 失败返回 -1。"""
+        if self.exhausted:
+            return 0
+        r = run(log_args(self.base or self.ref, skip=len(self.commits) - self.base_offset, count=self.page_size))
+        if r is None or r.returncode != 0:
+            return -1
+        page = parse_log(r.stdout)
+        with self._lock:
+            added = self._extend_locked(page)
+            if len(page) < self.page_size:
+                self.exhausted = True
+        return added
+
+    def find(self, hash_prefix: str):
+        p = (hash_prefix or "").lower()
+        if not p:
+            return None
+        for c in self.commits:
+            if c["full_hash"].startswith(p):
+                return c
+        return None
+
+    def view(self, filter_type: str = "all", stable_hashes=None, query: str = "") -> list:
+        """按版本类型与搜索词筛选后的提交列表。"""
+        stable_hashes = stable_hashes or set()
+        out = []
+        for c in list(self.commits):
+            is_stable = c["full_hash"] in stable_hashes
+            if filter_type == "stable" and not is_stable:
+                continue
+            if filter_type == "test" and is_stable:
+                continue
+            if matches(c, query):
+                out.append(c)
+        return out
+
+
+class HistoryWindow:
+    """Treeview 中实际物化的行区间 [start, end)；滑动时返回需要插入/删除的行。"""
+
+    def __init__(self, rows=None, chunk: int = WINDOW_CHUNK, max_rows: int = WINDOW_MAX_ROWS):
+        self.chunk = chunk
+        self.max_rows = max(max_rows, chunk * 2)
+        self.rows = list(rows or [])
+        self.start = 0
+        self.end = 0
+
+    def reset(self, rows) -> list:
+        """替换全部行并返回首批需要插入的行。"""
+        self.rows = list(rows)
+        self.start = 0
+        self.end = min(len(self.rows), self.chunk * 2)
+        return self.rows[:self.end]
+
+    def extend(self, rows) -> None:
+        """列表尾部追加了新数据（如加载了下一页）；已物化区间不变。"""
+        self.rows = list(rows)
+
+    @property
+    def at_end(self) -> bool:
+        return self.end >= len(self.rows)
+
+    def slide_down(self):
+        """向下滑动：返回 (追加到末尾的行, 需从顶部移除的行数)。"""
+        new_end = min(len(self.rows), self.end + self.chunk)
+        appended = self.rows[self.end:new_end]
+        self.end = new_end
+        dropped = max(0, (self.end - self.start) - self.max_rows)
+        self.start += dropped
+        return appended, dropped
+
+    def slide_up(self):
+        """向上滑动：返回 (插入到开头的行, 需从底部移除的行数)。"""
+        new_start = max(0, self.start - self.chunk)
+        prepended = self.rows[new_start:self.start]
+        self.start = new_start
+        dropped = max(0, (self.end - self.start) - self.max_rows)
+        self.end -= dropped
+        return prepended, dropped
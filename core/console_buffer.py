@@ -0,0 +1,69 @@
+"""
+ComfyUI 输出的有界环形缓冲。
+
+按行数（ui_settings.log_max_lines）与单行长度双重限制内存占用；
+每行带单调递增序号，消费者（控制台视图）可按序号增量读取。
+"""
+
+import threading
+from collections import deque
+from itertools import islice
+
+DEFAULT_MAX_LINES = 1000
+MAX_LINE_CHARS = 4000
+
+
+class ConsoleBuffer:
+    def __init__(self, max_lines: int = DEFAULT_MAX_LINES, max_line_chars: int = MAX_LINE_CHARS):
+        try:
+            max_lines = int(max_lines)
+        except Exception:
+            max_lines = DEFAULT_MAX_LINES
+        self.max_lines = max(1, max_lines)
+        self.max_line_chars = max_line_chars
+        self._lines = deque(maxlen=self.max_lines)
+        self._lock = threading.Lock()
+        # 下一行的序号；缓冲中第一行的序号为 _next_seq - len(_lines)
+        self._next_seq = 0
+
+    def append(self, line: str):
+        if line is None:
+            return
+        if self.max_line_chars and len(line) > self.max_line_chars:
+            line = line[:self.max_line_chars] + " …"
+        with self._lock:
+            self._lines.append(line)
+            self._next_seq += 1
+
+    def clear(self):
+        with self._lock:
+            self._lines.clear()
+            # 序号前进一位留出空档：任何清空前的游标（含已读到末尾的）下次读取都会得到 truncated
+            self._next_seq += 1
+
+    @property
+    def next_seq(self) -> int:
+        return self._next_seq
+
+    def read_since(self, seq: int):
+        """返回 (lines, next_seq, truncated)。
+
+        truncated 为 True 表示 seq 之后的部分行已被覆盖（或缓冲被清空），消费者应整体重绘。
+        """
+        with self._lock:
+            first = self._next_seq - len(self._lines)
+            if seq >= self._next_seq:
+                return [], self._next_seq, False
+            if seq < first:
+                return list(self._lines), self._next_seq, True
+            start = seq - first
+            lines = list(islice(self._lines, start, None))
+            return lines, self._next_seq, False
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return list(self._lines)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._lines)
@@ -0,0 +1,232 @@
+"""
+内核更新的拉取策略。
+
+- full：沿用原有的全量拉取（fetch --all / fetch <url>，附带全部标签）；
+- branch：只拉取目标分支（显式 refspec 写入 origin 跟踪分支，--no-tags）；
+- partial：在 branch 基础上加 --filter=blob:none（仅对已是部分克隆的 origin 生效，否则退回 branch）；
+- shallow：在 branch 基础上加 --depth（仅对已是浅克隆的整合包仓库生效，避免把完整仓库截断成浅克隆）；
+  拉取后若本地 HEAD 与远端分支之间不连通（落后超过 depth 个提交），按 --deepen 逐步加深，
+  仍不连通时 --unshallow，保证随后的 merge --ff-only 不会报 unrelated histories；
+- auto：部分克隆用 partial，其余（包括浅克隆）用 branch，不会隐式按深度截断。
+
+除 full 外，标签只拉取 `git ls-remote --tags` 显示本地缺失或指向不同提交的那些。
+每次拉取都会统计接收字节数（解析 --progress 输出）与耗时。
+"""
+
+import logging
+import re
+import time
+
+from core import tag_index as TAGS
+from utils import git_refs as REFS
+
+MODE_AUTO = "auto"
+MODE_FULL = "full"
+MODE_BRANCH = "branch"
+MODE_PARTIAL = "partial"
+MODE_SHALLOW = "shallow"
+MODES = (MODE_AUTO, MODE_BRANCH, MODE_PARTIAL, MODE_SHALLOW, MODE_FULL)
+MODE_LABELS = {
+    MODE_AUTO: "自动",
+    MODE_BRANCH: "仅当前分支",
+    MODE_PARTIAL: "按需下载文件",
+    MODE_SHALLOW: "浅拉取",
+    MODE_FULL: "完整拉取",
+}
+DEFAULT_DEPTH = 50
+# shallow 模式下 HEAD 与远端不连通时，--deepen 的最多轮数（每轮加深量翻倍），之后 --unshallow
+MAX_DEEPEN_ROUNDS = 4
+# 单次 fetch 携带的标签 refspec 上限（Windows 命令行长度有限）
+TAG_BATCH = 200
+
+_UNITS = {"bytes": 1, "KiB": 1024, "MiB": 1024 ** 2, "GiB": 1024 ** 3}
+_RECEIVED_RE = re.compile(r"(?:Receiving|Unpacking) objects:[^\r\n]*?,\s*([\d.]+)\s*(bytes|KiB|MiB|GiB)")
+
+
+class FetchResult:
+    def __init__(self, mode, returncode=0, stdout="", stderr="", received_bytes=0, seconds=0.0, tags_fetched=0):
+        self.mode = mode
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.received_bytes = received_bytes
+        self.seconds = seconds
+        self.tags_fetched = tags_fetched
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+    def summary(self) -> str:
+        return f"拉取 {format_bytes(self.received_bytes)}，用时 {self.seconds:.1f} 秒"
+
+
+def format_bytes(n) -> str:
+    n = float(n or 0)
+    for unit in ("B", "KiB", "MiB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.2f} GiB"
+
+
+def parse_received_bytes(stderr: str) -> int:
+    """从 `git fetch --progress` 的输出中取最后一次报告的接收字节数；无报告时返回 0。"""
+    hits = _RECEIVED_RE.findall(stderr or "")
+    if not hits:
+        return 0
+    value, unit = hits[-1]
+    try:
+        return int(float(value) * _UNITS[unit])
+    except Exception:
+        return 0
+
+
+def is_shallow(repo) -> bool:
+    dirs = REFS.git_dirs(repo)
+    try:
+        return bool(dirs) and (dirs[1] / "shallow").is_file()
+    except Exception:
+        return False
+
+
+def is_partial(run, remote="origin") -> bool:
+    r = run(["config", "--get", f"remote.{remote}.promisor"])
+    return bool(r is not None and r.returncode == 0 and r.stdout.strip().lower() == "true")
+
+
+def resolve_mode(mode, repo, run, remote="origin") -> str:
+    """把配置的模式换算为本仓库实际可用的模式。"""
+    mode = mode if mode in MODES else MODE_AUTO
+    if mode == MODE_FULL:
+        return mode
+    if mode == MODE_SHALLOW:
+        return MODE_SHALLOW if is_shallow(repo) else MODE_BRANCH
+    # --filter 只能用于配置为 promisor 的具名远端，经代理 URL 拉取时无法使用
+    partial_ok = remote == "origin" and is_partial(run, remote)
+    if mode == MODE_PARTIAL or (mode == MODE_AUTO and partial_ok):
+        return MODE_PARTIAL if partial_ok else MODE_BRANCH
+    return MODE_BRANCH
+
+
+def branch_args(mode, remote, branch, depth=DEFAULT_DEPTH) -> list:
+    if mode == MODE_FULL or not branch:
+        if remote == "origin":
+            return ["fetch", "--progress", "--all", "--prune"]
+        return ["fetch", "--progress", "--prune", remote]
+    args = ["fetch", "--progress", "--prune", "--no-tags"]
+    if mode == MODE_PARTIAL:
+        args.append("--filter=blob:none")
+    elif mode == MODE_SHALLOW:
+        args.append(f"--depth={int(depth or DEFAULT_DEPTH)}")
+    args += [remote, f"+refs/heads/{branch}:refs/remotes/origin/{branch}"]
+    return args
+
+
+def is_connected(run, branch) -> bool:
+    """本地 HEAD 是否为 origin/<branch> 的祖先（浅克隆中被截断的历史视为不连通）。"""
+    r = run(["merge-base", "--is-ancestor", "HEAD", f"refs/remotes/origin/{branch}"])
+    return r is not None and r.returncode == 0
+
+
+def deepen_until_connected(run, remote, branch, depth=DEFAULT_DEPTH) -> tuple:
+    """浅拉取后补齐 HEAD 到远端分支之间的历史，返回 (最后一次 git 结果, 额外接收字节数)。"""
+    received = 0
+    r = None
+    step = int(depth or DEFAULT_DEPTH)
+    refspec = f"+refs/heads/{branch}:refs/remotes/origin/{branch}"
+    for _ in range(MAX_DEEPEN_ROUNDS):
+        if is_connected(run, branch):
+            return r, received
+        r = run(["fetch", "--progress", "--no-tags", f"--deepen={step}", remote, refspec])
+        if r is None or r.returncode != 0:
+            return r, received
+        received += parse_received_bytes(r.stderr)
+        step *= 2
+    if is_connected(run, branch):
+        return r, received
+    r = run(["fetch", "--progress", "--no-tags", "--unshallow", remote, refspec])
+    if r is not None and r.returncode == 0:
+        received += parse_received_bytes(r.stderr)
+    return r, received
+
+
+def parse_ls_remote_tags(text: str) -> dict:
+    """解析 `git ls-remote --tags` 输出，返回 {标签: 提交哈希}（附注标签取 ^{} 解引用行）。"""
+    tags = {}
+    peeled = {}
+    for line in (text or "").splitlines():
+        parts = line.strip().split("\t")
+        if len(parts) != 2 or not parts[1].startswith("refs/tags/"):
+            continue
+        sha, name = parts[0], parts[1][len("refs/tags/"):]
+        if name.endswith("^{}"):
+            peeled[name[:-3]] = sha
+        else:
+            tags[name] = sha
+    tags.update(peeled)
+    return tags
+
+
+def missing_tags(remote_tags: dict, local_tags: dict) -> list:
+    return sorted(t for t, sha in remote_tags.items() if local_tags.get(t) != sha)
+
+
+def fetch_new_tags(run, repo, remote="origin") -> tuple:
+    """只拉取远端新增或变化的标签，返回 (拉取的标签数, 接收字节数)；失败时返回 (-1, 0)。"""
+    r = run(["ls-remote", "--tags", remote])
+    if r is None or r.returncode != 0:
+        return -1, 0
+    names = missing_tags(parse_ls_remote_tags(r.stdout), TAGS.load(repo, run))
+    received = 0
+    fetched = 0
+    for i in range(0, len(names), TAG_BATCH):
+        chunk = names[i:i + TAG_BATCH]
+        rt = run(["fetch", "--progress", "--no-tags", remote] + [f"+refs/tags/{t}:refs/tags/{t}" for t in chunk])
+        if rt is None or rt.returncode != 0:
+            return (fetched if fetched else -1), received
+        received += parse_received_bytes(rt.stderr)
+        fetched += len(chunk)
+    if fetched:
+        TAGS.invalidate(repo)
+    return fetched, received
+
+
+def fetch(run, repo, remote="origin", branch=None, mode=MODE_AUTO, depth=DEFAULT_DEPTH, tags: bool = True) -> FetchResult:
+    """按策略拉取 branch（为空时全量拉取），run(args) 执行 git 子命令并返回 CompletedProcess。"""
+    logger = logging.getLogger("comfyui_launcher")
+    actual = resolve_mode(mode, repo, run, remote) if branch else MODE_FULL
+    t0 = time.perf_counter()
+    r = run(branch_args(actual, remote, branch, depth))
+    if actual == MODE_PARTIAL and (r is None or r.returncode != 0):
+        # 服务端（或代理）不支持过滤时退回单分支拉取
+        actual = MODE_BRANCH
+        r = run(branch_args(actual, remote, branch, depth))
+    deepened = 0
+    if actual == MODE_SHALLOW and r is not None and r.returncode == 0:
+        rd, deepened = deepen_until_connected(run, remote, branch, depth)
+        if rd is not None and rd.returncode != 0:
+            r = rd
+    result = FetchResult(
+        actual,
+        returncode=getattr(r, "returncode", -1) if r is not None else -1,
+        stdout=getattr(r, "stdout", "") or "",
+        stderr=getattr(r, "stderr", "") or "",
+        received_bytes=parse_received_bytes(getattr(r, "stderr", "")) + deepened,
+    )
+    if result.ok and actual == MODE_FULL and tags:
+        rt = run(["fetch", "--progress", "--tags", remote])
+        if rt is not None and rt.returncode == 0:
+            result.received_bytes += parse_received_bytes(rt.stderr)
+    elif result.ok and tags:
+        n, received = fetch_new_tags(run, repo, remote)
+        result.tags_fetched = max(n, 0)
+        result.received_bytes += received
+    result.seconds = time.perf_counter() - t0
+    try:
+        logger.info("fetch 完成: mode=%s(%s) branch=%s rc=%s bytes=%d seconds=%.2f tags=%d",
+                    actual, mode, branch or '<all>', result.returncode, result.received_bytes,
+                    result.seconds, result.tags_fetched)
+    except Exception:
+        pass
+    return result
@@ -0,0 +1,259 @@
+"""
+Git 小查询服务。
+
+引用名、当前分支与符号引用先由 utils.git_refs 直接读取 .git 文件回答；
+其余对象查询由每个 (git, 仓库) 常驻的 `git cat-file --batch-check` / `--batch` 进程
+通过管道回答（rev-parse --verify、rev-parse <rev>、对象读取），
+不再为每个小查询各启动一次 git；`rev-parse --short`、`remote get-url`、
+`describe --tags --abbrev=0` 的结果按提交/配置指纹缓存。
+其余命令中，fetch/log 等可能耗时的命令经有界池（同时最多 MAX_CONCURRENT_GIT 个）执行，
+避免刷新时的子进程风暴；QUICK_COMMANDS 中的小查询不占用池，不会排在长命令之后。
+"""
+
+import contextlib
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from utils.common import run_hidden
+from core import tag_index as TAGS
+from utils import git_refs as REFS
+
+MAX_CONCURRENT_GIT = 4
+# 只读且通常毫秒级完成的子命令，绕过有界池直接执行（remote 仅限 get-url）
+QUICK_COMMANDS = frozenset({
+    "rev-parse", "symbolic-ref", "config", "describe", "merge-base", "cat-file", "show-ref", "var",
+})
+BATCH_TIMEOUT = 10.0
+
+_pool = threading.BoundedSemaphore(MAX_CONCURRENT_GIT)
+_lock = threading.Lock()
+_repos = {}
+
+
+def _completed(args, returncode, stdout="", stderr=""):
+    return subprocess.CompletedProcess(args, returncode, stdout, stderr)
+
+
+def popen_kwargs() -> dict:
+    if sys.platform.startswith("win"):
+        si = subprocess.STARTUPINFO()
+        si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        return {"startupinfo": si, "creationflags": subprocess.CREATE_NO_WINDOW}
+    return {}
+
+
+class _CatFile:
+    """单个常驻 cat-file 进程；mode 为 --batch-check 或 --batch。"""
+
+    def __init__(self, git_cmd, repo, mode):
+        self.git_cmd = git_cmd
+        self.repo = repo
+        self.mode = mode
+        self.proc = None
+        self._lock = threading.Lock()
+
+    def _ensure(self):
+        if self.proc is not None and self.proc.poll() is None:
+            return self.proc
+        self.proc = subprocess.Popen(
+            [self.git_cmd, "cat-file", self.mode],
+            cwd=str(self.repo), stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            **popen_kwargs(),
+        )
+        return self.proc
+
+    def query(self, rev: str, timeout: float = BATCH_TIMEOUT):
+        """返回 (sha, type, size, content)；对象不存在时返回 None；进程异常时抛出。"""
+        if not rev or "\n" in rev:
+            return None
+        with self._lock:
+            proc = self._ensure()
+            # 管道读取没有超时，卡住时由定时器结束进程，下次查询会重新拉起
+            timer = threading.Timer(timeout, proc.kill)
+            timer.daemon = True
+            timer.start()
+            try:
+                proc.stdin.write(rev.encode("utf-8") + b"\n")
+                proc.stdin.flush()
+                header = proc.stdout.readline()
+                if not header:
+                    raise OSError("git cat-file 已退出")
+                parts = header.decode("utf-8", "replace").split()
+                if len(parts) >= 2 and parts[-1] in ("missing", "ambiguous"):
+                    return None
+                if len(parts) != 3:
+                    raise OSError(f"git cat-file 输出无法解析: {header!r}")
+                sha, typ, size = parts[0], parts[1], int(parts[2])
+                content = None
+                if self.mode == "--batch":
+                    content = proc.stdout.read(size)
+                    proc.stdout.read(1)
+                return sha, typ, size, content
+            except Exception:
+                self.close()
+                raise
+            finally:
+                timer.cancel()
+
+    def close(self):
+        proc, self.proc = self.proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except Exception:
+            pass
+        try:
+            proc.kill()
+            proc.wait(timeout=2)
+        except Exception:
+            pass
+
+
+class GitQuery:
+    def __init__(self, git_cmd, repo):
+        self.git_cmd = git_cmd or "git"
+        self.repo = Path(repo)
+        self._check = _CatFile(self.git_cmd, self.repo, "--batch-check")
+        self._batch = _CatFile(self.git_cmd, self.repo, "--batch")
+        self._short = {}
+        self._describe = {}
+        self._remote = {}
+
+    # ---------- 管道查询 ----------
+    def resolve(self, rev: str):
+        """rev -> 完整哈希；不存在返回 None；cat-file 不可用时抛出。
+
+        分支/标签/HEAD 等引用名先由 utils.git_refs 直接读文件解析，其余交给 cat-file。
+        """
+        sha = REFS.dwim(self.repo, rev)
+        if sha:
+            return sha
+        hit = self._check.query(rev)
+        return hit[0] if hit else None
+
+    def object_type(self, rev: str):
+        hit = self._check.query(rev)
+        return hit[1] if hit else None
+
+    def read_object(self, rev: str):
+        """返回 (type, bytes)；不存在返回 None。"""
+        hit = self._batch.query(rev)
+        return (hit[1], hit[3]) if hit else None
+
+    # ---------- 带缓存的小命令 ----------
+    def _config_sig(self):
+        try:
+            gd = TAGS.git_dir(self.repo)
+            st = (gd / "config").stat()
+            return st.st_mtime_ns, st.st_size
+        except Exception:
+            return None
+
+    def short(self, rev: str, timeout=None):
+        full = self.resolve(rev)
+        if full is None:
+            return _completed(["rev-parse", "--short", rev], 128, "", f"fatal: ambiguous argument '{rev}'\n")
+        hit = self._short.get(full)
+        if hit is None:
+            r = self.porcelain(["rev-parse", "--short", full], timeout=timeout)
+            if r is None or r.returncode != 0:
+                return r
+            hit = self._short[full] = r.stdout.strip()
+        return _completed(["rev-parse", "--short", rev], 0, hit + "\n")
+
+    def describe_tag(self, timeout=None):
+        head = self.resolve("HEAD")
+        key = (head, TAGS.refs_signature(self.repo))
+        hit = self._describe.get(key)
+        if hit is None:
+            r = self.porcelain(["describe", "--tags", "--abbrev=0"], timeout=timeout)
+            if r is None or r.returncode != 0 or head is None:
+                return r
+            self._describe.clear()
+            hit = self._describe[key] = r
+        return hit
+
+    def remote_url(self, name: str, timeout=None):
+        key = (name, self._config_sig())
+        hit = self._remote.get(key)
+        if hit is None:
+            r = self.porcelain(["remote", "get-url", name], timeout=timeout)
+            if r is None or r.returncode != 0 or key[1] is None:
+                return r
+            hit = self._remote[key] = r
+        return hit
+
+    def porcelain(self, args, timeout=None):
+        args = list(args)
+        quick = bool(args) and (args[0] in QUICK_COMMANDS or args[:2] == ["remote", "get-url"])
+        with (contextlib.nullcontext() if quick else _pool):
+            return run_hidden([self.git_cmd] + args, cwd=str(self.repo), capture_output=True, text=True,
+                              encoding="utf-8", errors="replace", timeout=timeout)
+
+    # ---------- 统一入口 ----------
+    def answer(self, args, timeout=None):
+        """能由常驻进程或缓存回答的只读查询返回 CompletedProcess，否则返回 None。"""
+        a = list(args)
+        if len(a) == 3 and a[:2] == ["rev-parse", "--verify"]:
+            full = self.resolve(a[2])
+            if full is None:
+                return _completed(a, 128, "", "fatal: Needed a single revision\n")
+            return _completed(a, 0, full + "\n")
+        if len(a) == 2 and a[0] == "rev-parse" and not a[1].startswith("-"):
+            full = self.resolve(a[1])
+            if full is None:
+                return None
+            return _completed(a, 0, full + "\n")
+        if len(a) == 3 and a[:2] == ["rev-parse", "--short"] and not a[2].startswith("-"):
+            return self.short(a[2], timeout=timeout)
+        if a == ["branch", "--show-current"]:
+            branch = REFS.current_branch(self.repo)
+            return None if branch is None else _completed(a, 0, branch + "\n" if branch else "")
+        if len(a) == 2 and a[0] == "symbolic-ref" and not a[1].startswith("-"):
+            target = REFS.symbolic_ref(self.repo, a[1])
+            return None if target is None else _completed(a, 0, target + "\n")
+        if a == ["describe", "--tags", "--abbrev=0"]:
+            return self.describe_tag(timeout=timeout)
+        if len(a) == 3 and a[:2] == ["remote", "get-url"]:
+            return self.remote_url(a[2], timeout=timeout)
+        return None
+
+    def run(self, args, timeout=None):
+        try:
+            r = self.answer(args, timeout=timeout)
+            if r is not None:
+                return r
+        except Exception:
+            # cat-file 不可用（如 dubious ownership），回退到普通子进程以便上层看到真实错误
+            pass
+        return self.porcelain(args, timeout=timeout)
+
+    def close(self):
+        self._check.close()
+        self._batch.close()
+
+
+def get(git_cmd, repo) -> GitQuery:
+    key = (git_cmd or "git", os.path.normcase(str(Path(repo).resolve())))
+    with _lock:
+        q = _repos.get(key)
+        if q is None:
+            q = _repos[key] = GitQuery(key[0], key[1])
+        return q
+
+
+def run(git_cmd, repo, args, timeout=None):
+    """执行 git 子命令（args 不含 git 本身），返回 CompletedProcess。"""
+    return get(git_cmd, repo).run(args, timeout=timeout)
+
+
+def close_all():
+    with _lock:
+        qs = list(_repos.values())
+        _repos.clear()
+    for q in qs:
+        q.close()
@@ -0,0 +1,108 @@
+"""
+流式读取 git 输出。
+
+用于提交详情/补丁查看：后台线程按块读取 `git show` 的标准输出并逐块回调，
+累计达到上限后暂停读取（git 因管道写满而阻塞，不再占用内存），调用 more() 继续下一段；
+cancel() 结束 git 进程。回调在读取线程中执行，界面更新需由调用方转到主线程。
+"""
+
+import codecs
+import subprocess
+import threading
+
+from core.git_query import popen_kwargs
+
+CHUNK_SIZE = 64 * 1024
+PAGE_LIMIT = 1024 * 1024
+
+
+class GitStream:
+    def __init__(self, git_cmd, repo, args, on_chunk, on_done=None, on_pause=None,
+                 chunk_size: int = CHUNK_SIZE, limit: int = PAGE_LIMIT):
+        """on_chunk(text)；on_pause(已读字节数)；on_done(returncode, stderr, cancelled)。"""
+        self.git_cmd = git_cmd or "git"
+        self.repo = repo
+        self.args = list(args)
+        self.on_chunk = on_chunk
+        self.on_done = on_done
+        self.on_pause = on_pause
+        self.chunk_size = chunk_size
+        self.limit = limit
+        self.received = 0
+        self.paused = False
+        self.cancelled = False
+        self.proc = None
+        self._allowed = limit
+        self._resume = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.proc = subprocess.Popen(
+            [self.git_cmd] + self.args, cwd=str(self.repo),
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            **popen_kwargs(),
+        )
+        self._thread = threading.Thread(target=self._reader, daemon=True)
+        self._thread.start()
+        return self
+
+    def _reader(self):
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        try:
+            while not self.cancelled:
+                if self.received >= self._allowed:
+                    self.paused = True
+                    if self.on_pause:
+                        self.on_pause(self.received)
+                    self._resume.wait()
+                    self._resume.clear()
+                    self.paused = False
+                    continue
+                data = self.proc.stdout.read1(self.chunk_size)
+                if not data:
+                    break
+                self.received += len(data)
+                text = decoder.decode(data)
+                if text:
+                    self.on_chunk(text)
+            tail = decoder.decode(b"", final=True)
+            if tail and not self.cancelled:
+                self.on_chunk(tail)
+        except Exception:
+            pass
+        stderr = ""
+        try:
+            if not self.cancelled:
+                stderr = (self.proc.stderr.read() or b"").decode("utf-8", "replace")
+            rc = self.proc.wait(timeout=5)
+        except Exception:
+            rc = -1
+        self._close_pipes()
+        if self.on_done:
+            self.on_done(rc, stderr, self.cancelled)
+
+    def more(self, limit: int = None):
+        """允许再读取 limit（默认同初始上限）字节。"""
+        self._allowed = self.received + (limit or self.limit)
+        self._resume.set()
+
+    def cancel(self):
+        self.cancelled = True
+        try:
+            if self.proc is not None and self.proc.poll() is None:
+                self.proc.kill()
+        except Exception:
+            pass
+        self._resume.set()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _close_pipes(self):
+        for f in (getattr(self.proc, "stdout", None), getattr(self.proc, "stderr", None)):
+            try:
+                if f:
+                    f.close()
+            except Exception:
+                pass
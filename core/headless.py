@@ -0,0 +1,415 @@
+"""
+无界面（headless）命令行入口：start / stop / status / update。
+
+不导入 tkinter：以轻量的 HeadlessApp 代替主窗口，按配置构造与界面同名的变量，
+复用 core.launcher_cmd、core.runner_stop、core.probe 与 services/ 中的服务。
+用法：python -m launcher <command> [options]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+EXIT_OK = 0
+EXIT_FAIL = 1
+EXIT_NOT_RUNNING = 3
+
+PID_FILE_NAME = "comfyui.pid"
+OUTPUT_FILE_NAME = "comfyui_headless.log"
+
+
+class _Var:
+    """tk.Variable 的最小替身，仅提供 get/set。"""
+
+    def __init__(self, value=None):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+
+def _pid_alive(pid: int) -> bool:
+    """进程是否仍在运行（僵尸进程视为已退出）。
+
+    Windows 上 os.kill(pid, 0) 会向控制台进程组发送 CTRL_C_EVENT，不能用于探测，
+    优先用 psutil，否则通过 OpenProcess/GetExitCodeProcess 查询。
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+        except psutil.NoSuchProcess:
+            return False
+        except Exception:
+            return psutil.pid_exists(pid)
+    if os.name == 'nt':
+        try:
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            handle = kernel32.OpenProcess(0x1000, False, int(pid))  # PROCESS_QUERY_LIMITED_INFORMATION
+            if not handle:
+                # 拒绝访问说明进程存在，其余错误（参数无效）说明不存在
+                return ctypes.GetLastError() == 5
+            try:
+                code = ctypes.c_ulong()
+                if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+                    return True
+                return code.value == 259  # STILL_ACTIVE
+            finally:
+                kernel32.CloseHandle(handle)
+        except Exception:
+            return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except Exception:
+        pass
+    try:
+        with open(f"/proc/{pid}/stat", "r", encoding="ascii", errors="ignore") as f:
+            stat = f.read()
+        if stat[stat.rindex(")") + 2:].split()[0] == "Z":
+            return False
+    except Exception:
+        pass
+    return True
+
+
+class _PidHandle:
+    """按 PID 操作非本进程子进程的 Popen 兼容句柄，供 runner_stop 与 terminate_tree 使用。"""
+
+    def __init__(self, pid: int):
+        self.pid = int(pid)
+        self.returncode = None
+
+    def poll(self):
+        if self.returncode is None and not _pid_alive(self.pid):
+            self.returncode = 0
+        return self.returncode
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.poll() is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(str(self.pid), timeout)
+            time.sleep(0.05)
+        return self.returncode
+
+    def _signal(self, sig):
+        try:
+            os.kill(self.pid, sig)
+        except Exception:
+            pass
+
+    def terminate(self):
+        import signal
+        self._signal(signal.SIGTERM)
+
+    def kill(self):
+        import signal
+        self._signal(getattr(signal, "SIGKILL", signal.SIGTERM))
+
+
+class HeadlessApp:
+    headless = True
+
+    def __init__(self, base_root=None):
+        from utils import paths as PATHS
+        from utils.logging import install_logging
+        from config.manager import ConfigManager
+        try:
+            base = Path(base_root).resolve() if base_root else PATHS.resolve_base_root()
+            os.chdir(base)
+        except Exception:
+            base = Path.cwd()
+        self._base_root = base
+        self.logger = install_logging(log_root=base)
+        # 命令行下保留默认异常输出，不把未捕获异常只写入日志
+        sys.excepthook = sys.__excepthook__
+        self.config_manager = ConfigManager(self.launcher_dir / "config.json", self.logger)
+        self.config = self.config_manager.load_config()
+        self._setup_variables()
+        self.git_path = None
+        self._wmic_available = None
+        self._shutting_down = False
+        self.services = None
+
+    def report_error(self, msg: str):
+        """供 core.runner_stop 等共享流程报告错误（界面下为弹窗）。"""
+        print(msg, file=sys.stderr)
+
+    @property
+    def launcher_dir(self) -> Path:
+        return Path.cwd() / "launcher"
+
+    def _setup_variables(self):
+        # 与界面 setup_variables / load_settings 使用相同的配置键
+        opt = self.config.get("launch_options", {}) or {}
+        proxy = self.config.get("proxy_settings", {}) or {}
+        vp = self.config.get("version_preferences", {}) or {}
+        self.compute_mode = _Var(opt.get("default_compute_mode", "gpu"))
+        self.custom_port = _Var(str(opt.get("default_port", "8188")))
+        self.use_fast_mode = _Var(bool(opt.get("enable_fast_mode", False)))
+        self.enable_cors = _Var(bool(opt.get("enable_cors", True)))
+        self.listen_all = _Var(bool(opt.get("listen_all", True)))
+        self.extra_launch_args = _Var(opt.get("extra_args", ""))
+        self.attention_mode = _Var(opt.get("attention_mode", ""))
+        self.browser_open_mode = _Var(opt.get("browser_open_mode", "default"))
+        self.selected_hf_mirror = _Var(proxy.get("hf_mirror_mode", "hf-mirror"))
+        self.hf_mirror_url = _Var(proxy.get("hf_mirror_url", "https://hf-mirror.com"))
+        self.pypi_proxy_mode = _Var(proxy.get("pypi_proxy_mode", "aliyun"))
+        self.pypi_proxy_url = _Var(proxy.get("pypi_proxy_url", "https://mirrors.aliyun.com/pypi/simple/"))
+        self.stable_only_var = _Var(bool(vp.get("stable_only", True)))
+        self.requirements_sync_var = _Var(bool(vp.get("requirements_sync", True)))
+        self.update_core_var = _Var(True)
+        self.update_frontend_var = _Var(True)
+        self.update_template_var = _Var(True)
+        try:
+            from utils import paths as PATHS
+            comfy_root = PATHS.get_comfy_root(self.config.get("paths", {}))
+            self.python_exec = str(PATHS.resolve_python_exec(comfy_root, self.config.get("paths", {}).get("python_path", "")))
+        except Exception:
+            self.python_exec = sys.executable
+
+    def init_services(self):
+        # 仅构造命令行需要的服务；ServiceContainer.from_app 依赖界面的 ProcessManager
+        if self.services is None:
+            from services.version_service import VersionService
+            from services.update_service import UpdateService
+            from services.git_service import GitService
+            self.services = SimpleNamespace(
+                version=VersionService(self),
+                update=UpdateService(self),
+                git=GitService(self),
+            )
+        return self.services
+
+    def save_config(self):
+        try:
+            self.config_manager.save_config(self.config)
+        except Exception:
+            pass
+
+    def resolve_git(self):
+        return self.init_services().git.resolve_git()
+
+    # ---------- PID 文件 ----------
+    @property
+    def pid_file(self) -> Path:
+        return self.launcher_dir / PID_FILE_NAME
+
+    def read_pid(self):
+        try:
+            return int(self.pid_file.read_text(encoding="utf-8").strip())
+        except Exception:
+            return None
+
+    def tracked_handle(self):
+        pid = self.read_pid()
+        if pid is None:
+            return None
+        handle = _PidHandle(pid)
+        if handle.poll() is not None:
+            self.clear_pid()
+            return None
+        return handle
+
+    def write_pid(self, pid: int):
+        try:
+            self.pid_file.parent.mkdir(parents=True, exist_ok=True)
+            self.pid_file.write_text(str(pid), encoding="utf-8")
+        except Exception:
+            pass
+
+    def clear_pid(self):
+        try:
+            self.pid_file.unlink()
+        except Exception:
+            pass
+
+
+# ---------- 命令 ----------
+def _port(app) -> str:
+    return (app.custom_port.get() or "8188").strip()
+
+
+def collect_status(app) -> dict:
+    from core.probe import find_pids_by_port_safe, is_http_reachable
+    port = _port(app)
+    handle = app.tracked_handle()
+    try:
+        pids = sorted(find_pids_by_port_safe(port))
+    except Exception:
+        pids = []
+    reachable = bool(is_http_reachable(app))
+    return {
+        "port": port,
+        "running": reachable or handle is not None,
+        "reachable": reachable,
+        "tracked_pid": handle.pid if handle else None,
+        "port_pids": pids,
+    }
+
+
+def cmd_status(app, args) -> int:
+    st = collect_status(app)
+    if args.json:
+        print(json.dumps(st, ensure_ascii=False))
+    else:
+        state = "运行中" if st["reachable"] else ("启动中/无响应" if st["running"] else "未运行")
+        print(f"ComfyUI {state}  port={st['port']}  pid={st['tracked_pid'] or '-'}  port_pids={','.join(map(str, st['port_pids'])) or '-'}")
+    return EXIT_OK if st["running"] else EXIT_NOT_RUNNING
+
+
+def _wait_ready(app, proc, timeout: float) -> bool:
+    from core.probe import is_http_reachable
+    from core.health_probe import get_prober
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            return False
+        if is_http_reachable(app):
+            return True
+        # 按探测器记录的连续失败次数退避
+        delay = get_prober().next_delay(_port(app), max_delay=2.0)
+        time.sleep(max(0.0, min(delay, deadline - time.monotonic())))
+    return False
+
+
+def cmd_start(app, args) -> int:
+    from core.launcher_cmd import build_launch_params
+    from core.probe import find_pids_by_port_safe
+    from core.interpreter_cache import validate_interpreter
+    from core.kill import popen_group_kwargs
+    if args.port:
+        app.custom_port.set(str(args.port))
+    port = _port(app)
+    pids = find_pids_by_port_safe(port)
+    if pids:
+        print(f"端口 {port} 已被占用 (PID: {', '.join(map(str, pids))})", file=sys.stderr)
+        return EXIT_FAIL
+    cmd, env, run_cwd, py, main = build_launch_params(app)
+    if not py.exists():
+        print(f"Python不存在: {py}", file=sys.stderr)
+        return EXIT_FAIL
+    if not main.exists():
+        print(f"主文件不存在: {main}", file=sys.stderr)
+        return EXIT_FAIL
+    ok, info = validate_interpreter(py)
+    if not ok:
+        print(info, file=sys.stderr)
+        return EXIT_FAIL
+    try:
+        app.logger.info("命令行启动: %s", " ".join(cmd))
+    except Exception:
+        pass
+    if args.foreground:
+        proc = subprocess.Popen(cmd, env=env, cwd=run_cwd, **popen_group_kwargs())
+        app.write_pid(proc.pid)
+        try:
+            return proc.wait()
+        except KeyboardInterrupt:
+            from core.kill import terminate_tree
+            terminate_tree(app, proc)
+            return EXIT_OK
+        finally:
+            app.clear_pid()
+    kwargs = popen_group_kwargs()
+    if os.name == 'nt':
+        kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.CREATE_NO_WINDOW
+    out_path = app.launcher_dir / OUTPUT_FILE_NAME
+    with open(out_path, "ab") as out:
+        proc = subprocess.Popen(cmd, env=env, cwd=run_cwd, stdin=subprocess.DEVNULL, stdout=out, stderr=subprocess.STDOUT, **kwargs)
+    app.write_pid(proc.pid)
+    print(f"已启动 ComfyUI: pid={proc.pid} port={port} 输出={out_path}")
+    if args.wait:
+        if _wait_ready(app, proc, args.wait):
+            print("ComfyUI 已就绪")
+            return EXIT_OK
+        print("等待就绪超时或进程已退出", file=sys.stderr)
+        return EXIT_FAIL
+    return EXIT_OK
+
+
+def cmd_stop(app, args) -> int:
+    from core.runner_stop import stop as run_stop
+    if args.port:
+        app.custom_port.set(str(args.port))
+    pm = SimpleNamespace(comfyui_process=app.tracked_handle())
+    killed = run_stop(app, pm)
+    app.clear_pid()
+    print("已停止 ComfyUI" if killed else "未发现运行中的 ComfyUI")
+    return EXIT_OK if killed else EXIT_NOT_RUNNING
+
+
+def cmd_update(app, args) -> int:
+    selected = [args.core, args.frontend, args.templates]
+    if not any(selected):
+        selected = [True, True, True]
+    app.update_core_var.set(selected[0])
+    app.update_frontend_var.set(selected[1])
+    app.update_template_var.set(selected[2])
+    if args.stable_only is not None:
+        app.stable_only_var.set(args.stable_only)
+    services = app.init_services()
+    try:
+        app.resolve_git()
+    except Exception:
+        pass
+    results, summary = services.update.perform_batch_update()
+    if args.json:
+        print(json.dumps({"results": results, "summary": summary}, ensure_ascii=False))
+    else:
+        print(summary)
+    return EXIT_FAIL if any(r.get("error") for r in results) else EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m launcher", description="ComfyUI 启动器命令行（无界面）")
+    parser.add_argument("--root", help="整合包根目录（包含 ComfyUI/ 与 launcher/）；默认自动识别")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("start", help="启动 ComfyUI")
+    p.add_argument("--port", help="覆盖配置中的端口")
+    p.add_argument("--wait", type=float, default=0, metavar="SECONDS", help="等待端口就绪的最长秒数")
+    p.add_argument("--foreground", action="store_true", help="前台运行，Ctrl+C 停止")
+    p.set_defaults(func=cmd_start)
+
+    p = sub.add_parser("stop", help="停止 ComfyUI")
+    p.add_argument("--port", help="覆盖配置中的端口")
+    p.set_defaults(func=cmd_stop)
+
+    p = sub.add_parser("status", help="查看运行状态（未运行时退出码为 3）")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_status)
+
+    p = sub.add_parser("update", help="更新内核/前端/模板库（默认全部）")
+    p.add_argument("--core", action="store_true")
+    p.add_argument("--frontend", action="store_true")
+    p.add_argument("--templates", action="store_true")
+    g = p.add_mutually_exclusive_group()
+    g.add_argument("--stable-only", dest="stable_only", action="store_true", default=None)
+    g.add_argument("--latest", dest="stable_only", action="store_false")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_update)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    app = HeadlessApp(args.root)
+    try:
+        return int(args.func(app, args) or 0)
+    except KeyboardInterrupt:
+        return EXIT_FAIL
@@ -0,0 +1,238 @@
+"""
+ComfyUI 健康探测器。
+
+每个端口复用一条 keep-alive 的 http.client 连接请求 `/system_stats`，
+按近期延迟自适应超时，连续失败时退避探测间隔，
+并维护滚动延迟直方图供界面与日志读取。
+"""
+
+import http.client
+import threading
+import time
+from collections import deque
+
+# 直方图桶上界（毫秒），最后一个桶收纳超出部分
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class _PortState:
+    def __init__(self, window):
+        self.lock = threading.Lock()
+        self.conn = None
+        self.latencies = deque(maxlen=window)
+        self.ok = 0
+        self.fail = 0
+        self.consecutive_fail = 0
+        self.timeout = None
+        self.last_ok = None
+        self.last_ts = None
+
+
+class HealthProber:
+    def __init__(self, host: str = "127.0.0.1", path: str = "/system_stats",
+                 min_timeout: float = 0.4, max_timeout: float = 5.0,
+                 min_interval: float = 0.25, max_interval: float = 5.0, window: int = 256):
+        self.host = host
+        self.path = path
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.window = window
+        self._states = {}
+        self._states_lock = threading.Lock()
+
+    def _state(self, port: int) -> _PortState:
+        with self._states_lock:
+            st = self._states.get(port)
+            if st is None:
+                st = _PortState(self.window)
+                st.timeout = self.min_timeout
+                self._states[port] = st
+            return st
+
+    def _connect(self, port: int, timeout: float) -> http.client.HTTPConnection:
+        return http.client.HTTPConnection(self.host, port, timeout=timeout)
+
+    def _request(self, conn: http.client.HTTPConnection, timeout: float):
+        """在给定连接上请求一次，返回 (状态码, 连接是否可复用)。"""
+        conn.timeout = timeout
+        try:
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+        except Exception:
+            pass
+        conn.request("GET", self.path, headers={"Accept": "application/json", "User-Agent": "ComfyUI-Launcher"})
+        resp = conn.getresponse()
+        # 读完响应体才能复用连接
+        resp.read()
+        return resp.status, not resp.will_close
+
+    @staticmethod
+    def _close(conn):
+        try:
+            if conn is not None:
+                conn.close()
+        except Exception:
+            pass
+
+    def _drop(self, st: _PortState):
+        self._close(st.conn)
+        st.conn = None
+
+    def probe(self, port, timeout: float = None) -> bool:
+        """探测一次端口；返回 `/system_stats` 是否返回 200。
+
+        timeout 为本次请求超时的上限（界面线程调用方传入，避免自适应超时放宽后卡住界面）。
+        锁只用于取出/归还连接与更新统计，网络请求在锁外进行：后台探测进行中时，
+        界面线程的探测另开一条连接，不会排队等待对方的超时。
+        """
+        try:
+            port = int(port)
+        except Exception:
+            return False
+        st = self._state(port)
+        with st.lock:
+            conn, st.conn = st.conn, None
+            limit = st.timeout if timeout is None else max(0.05, min(st.timeout, float(timeout)))
+        reused = conn is not None
+        if conn is None:
+            conn = self._connect(port, limit)
+        t0 = time.perf_counter()
+        code = None
+        keep = False
+        timed_out = False
+        try:
+            code, keep = self._request(conn, limit)
+        except (http.client.RemoteDisconnected, http.client.CannotSendRequest, BrokenPipeError, ConnectionResetError):
+            # 服务端关闭了空闲连接：用新连接重试一次
+            self._close(conn)
+            conn = None
+            if reused:
+                conn = self._connect(port, limit)
+                try:
+                    t0 = time.perf_counter()
+                    code, keep = self._request(conn, limit)
+                except TimeoutError:
+                    timed_out = True
+                except Exception:
+                    pass
+        except TimeoutError:
+            timed_out = True
+        except Exception:
+            pass
+        elapsed = time.perf_counter() - t0
+        ok = code == 200
+        with st.lock:
+            # 归还可复用的连接；并发探测已归还过连接时关闭多余的这条
+            if keep and st.conn is None:
+                st.conn, conn = conn, None
+            st.last_ok = ok
+            st.last_ts = time.time()
+            if ok:
+                st.ok += 1
+                st.consecutive_fail = 0
+                st.latencies.append(elapsed * 1000.0)
+                st.timeout = self._adaptive_timeout(st)
+            else:
+                st.fail += 1
+                st.consecutive_fail += 1
+                if timed_out:
+                    # 端口已接受连接但响应慢（负载高），放宽下一次超时而不是判定为宕机
+                    st.timeout = min(self.max_timeout, st.timeout * 2)
+        self._close(conn)
+        return ok
+
+    def _adaptive_timeout(self, st: _PortState) -> float:
+        p95 = self._percentile(sorted(st.latencies), 0.95)
+        if p95 is None:
+            return self.min_timeout
+        return max(self.min_timeout, min(self.max_timeout, p95 / 1000.0 * 4))
+
+    def next_delay(self, port, max_delay: float = None) -> float:
+        """按连续失败次数指数退避的建议探测间隔（秒），max_delay 可进一步收紧上限。"""
+        cap = self.max_interval if max_delay is None else min(self.max_interval, max_delay)
+        try:
+            st = self._state(int(port))
+        except Exception:
+            return cap
+        n = st.consecutive_fail
+        if n <= 0:
+            return min(self.min_interval, cap)
+        return min(cap, self.min_interval * (2 ** min(n, 16)))
+
+    @staticmethod
+    def _percentile(values, q):
+        if not values:
+            return None
+        idx = min(len(values) - 1, max(0, int(round(q * (len(values) - 1)))))
+        return values[idx]
+
+    def histogram(self, port) -> list:
+        """返回 [(桶上界毫秒或 None, 次数), ...]，None 表示超出最大桶。"""
+        try:
+            st = self._state(int(port))
+        except Exception:
+            return []
+        with st.lock:
+            values = list(st.latencies)
+        counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        for v in values:
+            for i, upper in enumerate(LATENCY_BUCKETS_MS):
+                if v <= upper:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+        return list(zip(list(LATENCY_BUCKETS_MS) + [None], counts))
+
+    def stats(self, port) -> dict:
+        try:
+            st = self._state(int(port))
+        except Exception:
+            return {}
+        with st.lock:
+            values = sorted(st.latencies)
+            data = {
+                "port": int(port),
+                "ok": st.ok,
+                "fail": st.fail,
+                "consecutive_fail": st.consecutive_fail,
+                "last_ok": st.last_ok,
+                "last_ts": st.last_ts,
+                "timeout_s": round(st.timeout, 3),
+                "samples": len(values),
+            }
+        for name, q in (("p50_ms", 0.5), ("p95_ms", 0.95), ("max_ms", 1.0)):
+            v = self._percentile(values, q)
+            data[name] = round(v, 1) if v is not None else None
+        return data
+
+    def format_stats(self, port) -> str:
+        d = self.stats(port)
+        if not d:
+            return ""
+        return (f"port={d['port']} ok={d['ok']} fail={d['fail']} samples={d['samples']} "
+                f"p50={d['p50_ms']}ms p95={d['p95_ms']}ms max={d['max_ms']}ms timeout={d['timeout_s']}s")
+
+    def close(self, port=None):
+        with self._states_lock:
+            states = [self._states.get(int(port))] if port is not None else list(self._states.values())
+        for st in states:
+            if st is None:
+                continue
+            with st.lock:
+                self._drop(st)
+
+
+_default_prober = None
+_default_lock = threading.Lock()
+
+
+def get_prober() -> HealthProber:
+    """进程内共享的探测器实例，各调用方复用同一组 keep-alive 连接与统计。"""
+    global _default_prober
+    with _default_lock:
+        if _default_prober is None:
+            _default_prober = HealthProber()
+        return _default_prober
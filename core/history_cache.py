@@ -0,0 +1,155 @@
+"""
+提交历史的磁盘缓存。
+
+按 (仓库, 引用) 保存已加载的提交列表与当时的引用提交（tip），位于 launcher/history_cache/。
+刷新时先用缓存立即渲染；tip 未变则不再执行 git log，tip 前进（快进）时只追加
+`git log <旧tip>..<新tip>`，否则（强推、换分支等）重新加载第一页。
+增量追加后继续翻页时仍以旧 tip 为基准（见 CommitHistory.base），
+避免合并提交使按日期排序的 `--skip` 与“新提交 + 旧列表”错位而漏掉提交。
+"""
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+
+from core import commit_history as HISTORY
+from utils.json_cache import launcher_path, read_json, write_json
+
+CACHE_VERSION = 2
+MAX_CACHED_COMMITS = 5000
+# 增量超过该条数时直接重新加载第一页
+INCREMENTAL_MAX = 1000
+
+SOURCE_CACHE = "cache"
+SOURCE_INCREMENTAL = "incremental"
+SOURCE_FULL = "full"
+
+_lock = threading.Lock()
+
+
+def _cache_dir() -> Path:
+    return launcher_path("history_cache")
+
+
+def _repo_id(repo) -> str:
+    try:
+        return os.path.normcase(str(Path(repo).resolve()))
+    except Exception:
+        return str(repo)
+
+
+def _file(repo, ref) -> Path:
+    digest = hashlib.sha1(f"{_repo_id(repo)}\n{ref or 'HEAD'}".encode("utf-8")).hexdigest()[:16]
+    return _cache_dir() / f"{digest}.json"
+
+
+def _index_file() -> Path:
+    return _cache_dir() / "index.json"
+
+
+def load(repo, ref):
+    """返回 {"ref", "tip", "base", "base_offset", "exhausted", "commits"}；无缓存或格式不符时返回 None。"""
+    data = read_json(_file(repo, ref))
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return None
+    if data.get("repo") != _repo_id(repo) or data.get("ref") != (ref or "HEAD"):
+        return None
+    if not isinstance(data.get("commits"), list) or not data.get("tip"):
+        return None
+    return data
+
+
+def load_last(repo):
+    """返回该仓库最近一次保存的缓存（用于在确定引用之前先渲染）。"""
+    index = read_json(_index_file())
+    if not isinstance(index, dict):
+        return None
+    ref = index.get(_repo_id(repo))
+    if not ref:
+        return None
+    return load(repo, ref)
+
+
+def restore(history, data):
+    """用 load()/load_last() 的结果恢复 history（含翻页基准）。"""
+    history.reset(data["ref"], data["commits"], exhausted=data.get("exhausted", False), tip=data.get("tip"),
+                  base=data.get("base"), base_offset=data.get("base_offset", 0))
+
+
+def save(repo, ref, tip, commits, exhausted: bool = False, base=None, base_offset: int = 0):
+    if not tip:
+        return
+    commits = list(commits or [])
+    if len(commits) > MAX_CACHED_COMMITS:
+        commits = commits[:MAX_CACHED_COMMITS]
+        exhausted = False
+    data = {
+        "version": CACHE_VERSION,
+        "repo": _repo_id(repo),
+        "ref": ref or "HEAD",
+        "tip": tip,
+        "base": base or tip,
+        "base_offset": int(base_offset or 0),
+        "exhausted": bool(exhausted),
+        "saved_at": int(time.time()),
+        "commits": commits,
+    }
+    with _lock:
+        write_json(_file(repo, ref), data)
+        index = read_json(_index_file())
+        if not isinstance(index, dict):
+            index = {}
+        if index.get(data["repo"]) != data["ref"]:
+            index[data["repo"]] = data["ref"]
+            write_json(_index_file(), index)
+
+
+def _tip(run, ref):
+    r = run(["rev-parse", "--verify", ref or "HEAD"])
+    if r is None or r.returncode != 0:
+        return None
+    return (r.stdout or "").strip() or None
+
+
+def sync(history, repo, ref, run) -> str:
+    """把 history 同步到 ref 的最新状态，返回数据来源（cache / incremental / full）；失败返回空串。
+
+    run(args) 执行 git 子命令并返回 CompletedProcess。
+    """
+    tip = _tip(run, ref)
+    cached = load(repo, ref)
+    if tip and cached and cached["tip"] == tip:
+        restore(history, cached)
+        return SOURCE_CACHE
+    if tip and cached:
+        r = run(["merge-base", "--is-ancestor", cached["tip"], tip])
+        if r is not None and r.returncode == 0:
+            r_new = run(HISTORY.log_args(count=INCREMENTAL_MAX, revision_range=f"{cached['tip']}..{tip}"))
+            if r_new is not None and r_new.returncode == 0:
+                new = HISTORY.parse_log(r_new.stdout)
+                if len(new) < INCREMENTAL_MAX:
+                    # 新提交都不在旧 tip 的历史中：继续按旧 tip 翻页，列表开头的新提交不计入 --skip
+                    history.reset(ref, new + cached["commits"], exhausted=cached.get("exhausted", False), tip=tip,
+                                  base=cached.get("base") or cached["tip"],
+                                  base_offset=len(new) + cached.get("base_offset", 0))
+                    _save_history(repo, history)
+                    return SOURCE_INCREMENTAL
+    r = run(HISTORY.log_args(ref, count=history.page_size))
+    if r is None or r.returncode != 0:
+        return ""
+    commits = HISTORY.parse_log(r.stdout)
+    history.reset(ref, commits, exhausted=len(commits) < history.page_size, tip=tip)
+    _save_history(repo, history)
+    return SOURCE_FULL
+
+
+def _save_history(repo, history):
+    save(repo, history.ref, history.tip, history.commits, history.exhausted,
+         base=history.base, base_offset=history.base_offset)
+
+
+def remember(history, repo):
+    """加载更多页后写回缓存；tip 取 sync 时解析的提交，避免引用在此期间移动后把旧列表记到新 tip 名下。"""
+    _save_history(repo, history)
@@ -0,0 +1,325 @@
+"""
+多实例 ComfyUI 管理。
+
+每个附加实例以端口为键，拥有独立的启动参数、子进程与监督器状态机
+（core.supervisor.ProcessSupervisor），探测与停止只针对自身端口；
+主实例（界面大按钮与 custom_port）仍由 ProcessManager 管理。
+实例列表持久化在配置 `instances` 中：[{"name", "port", "extra_args"}, ...]。
+"""
+
+import os
+import shlex
+import subprocess
+import threading
+
+from core.supervisor import ProcessSupervisor, STATE_STARTING, STATE_READY, STATE_STOPPING
+
+
+def _strip_port_args(cmd: list) -> list:
+    out = []
+    skip = False
+    for tok in cmd:
+        if skip:
+            skip = False
+            continue
+        if tok == "--port":
+            skip = True
+            continue
+        if tok.startswith("--port="):
+            continue
+        out.append(tok)
+    return out
+
+
+class ComfyInstance:
+    def __init__(self, app, port: str, name: str = "", extra_args: str = ""):
+        self.app = app
+        self.port = str(port).strip()
+        self.name = name or f"ComfyUI:{self.port}"
+        self.extra_args = extra_args or ""
+        self.supervisor = ProcessSupervisor(app, probe=self._probe, port=self.port)
+        self._monitor = None
+
+    # ---------- 探测 ----------
+    def _probe(self) -> bool:
+        try:
+            from core.health_probe import get_prober
+            return get_prober().probe(int(self.port))
+        except Exception:
+            return False
+
+    @property
+    def process(self):
+        return self.supervisor.process
+
+    @property
+    def state(self) -> str:
+        return self.supervisor.state
+
+    def is_running(self) -> bool:
+        proc = self.process
+        try:
+            return proc is not None and proc.poll() is None
+        except Exception:
+            return False
+
+    def _ensure_monitor(self):
+        if self._monitor is None or not self._monitor.is_alive():
+            self._monitor = threading.Thread(target=self.supervisor.run, name=f"comfyui-instance-{self.port}", daemon=True)
+            self._monitor.start()
+
+    # ---------- 启动 / 停止 ----------
+    def build_command(self):
+        """复用主实例的启动参数，替换端口并追加本实例的额外参数。"""
+        from core.launcher_cmd import build_launch_params
+        cmd, env, run_cwd, py, main = build_launch_params(self.app)
+        cmd = _strip_port_args(cmd)
+        cmd.extend(["--port", self.port])
+        extra = self.extra_args.strip()
+        if extra:
+            try:
+                cmd.extend(shlex.split(extra))
+            except Exception:
+                cmd.extend(extra.split())
+        return cmd, env, run_cwd
+
+    def start(self):
+        if self.is_running():
+            return self.process
+        from core.probe import find_pids_by_port_safe
+        from core.kill import popen_group_kwargs
+        pids = find_pids_by_port_safe(self.port)
+        if pids:
+            raise RuntimeError(f"端口 {self.port} 已被占用 (PID: {', '.join(map(str, pids))})")
+        cmd, env, run_cwd = self.build_command()
+        kwargs = popen_group_kwargs()
+        if os.name == 'nt':
+            kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+        try:
+            self.app.logger.info("启动实例 %s: %s", self.name, " ".join(cmd))
+        except Exception:
+            pass
+        proc = subprocess.Popen(cmd, env=env, cwd=run_cwd, stdin=subprocess.DEVNULL,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **kwargs)
+        self._ensure_monitor()
+        self.supervisor.attach(proc)
+        return proc
+
+    def stop(self) -> bool:
+        import time
+        from core.kill import terminate_tree, kill_pids, record_stop
+        from core.probe import find_pids_by_port_safe, is_comfyui_pid, invalidate_port_index
+        self.supervisor.mark_stopping()
+        started = time.monotonic()
+        proc = self.process
+        if proc is not None and proc.poll() is None:
+            if os.name == 'nt':
+                from utils.common import run_hidden
+                try:
+                    run_hidden(["taskkill", "/PID", str(proc.pid), "/T", "/F"], capture_output=True, text=True)
+                    proc.wait(timeout=5)
+                    ok = True
+                except Exception:
+                    ok = proc.poll() is not None
+                record_stop(self.app, started, "taskkill", False, ok)
+                invalidate_port_index()
+                return ok
+            ok, escalated = terminate_tree(self.app, proc)
+            record_stop(self.app, started, "group", escalated, ok)
+            invalidate_port_index()
+            return ok
+        # 未跟踪到子进程（例如外部启动）：只终止占用本端口的 ComfyUI 进程
+        try:
+            pids = [pid for pid in find_pids_by_port_safe(self.port) if is_comfyui_pid(self.app, pid)]
+        except Exception:
+            pids = []
+        if not pids:
+            self.supervisor.mark_idle()
+            return False
+        try:
+            kill_pids(self.app, pids)
+            self.supervisor.mark_idle()
+            return True
+        except Exception:
+            return False
+
+    def status(self) -> dict:
+        proc = self.process
+        return {
+            "name": self.name,
+            "port": self.port,
+            "state": self.state,
+            "pid": getattr(proc, "pid", None) if proc is not None else None,
+            "uptime": self.supervisor.uptime(),
+            "last_exit_code": self.supervisor.last_exit_code,
+        }
+
+    def to_config(self) -> dict:
+        return {"name": self.name, "port": self.port, "extra_args": self.extra_args}
+
+
+class InstanceManager:
+    def __init__(self, app):
+        self.app = app
+        self._lock = threading.Lock()
+        self._instances = {}
+        self._listeners = []
+        self.load()
+
+    # ---------- 订阅 ----------
+    def add_listener(self, fn):
+        """注册 fn(port, state, info)；在后台线程中调用。"""
+        with self._lock:
+            if fn not in self._listeners:
+                self._listeners.append(fn)
+
+    def remove_listener(self, fn):
+        with self._lock:
+            try:
+                self._listeners.remove(fn)
+            except ValueError:
+                pass
+
+    def _forward(self, port):
+        def _cb(state, info):
+            with self._lock:
+                listeners = list(self._listeners)
+            for fn in listeners:
+                try:
+                    fn(port, state, info)
+                except Exception:
+                    pass
+        return _cb
+
+    # ---------- 配置 ----------
+    def _primary_port(self) -> str:
+        try:
+            return (self.app.custom_port.get() or "8188").strip()
+        except Exception:
+            try:
+                return str(self.app.config.get("launch_options", {}).get("default_port", "8188")).strip()
+            except Exception:
+                return "8188"
+
+    def load(self):
+        try:
+            items = self.app.config.get("instances", []) or []
+        except Exception:
+            items = []
+        for item in items:
+            try:
+                self._add(ComfyInstance(self.app, item.get("port"), item.get("name", ""), item.get("extra_args", "")))
+            except Exception:
+                pass
+
+    def save(self):
+        try:
+            self.app.config["instances"] = [inst.to_config() for inst in self.instances()]
+            self.app.save_config()
+        except Exception:
+            pass
+
+    def _add(self, inst):
+        with self._lock:
+            self._instances[inst.port] = inst
+        inst.supervisor.add_listener(self._forward(inst.port))
+        return inst
+
+    # ---------- 实例增删 ----------
+    def instances(self) -> list:
+        with self._lock:
+            return sorted(self._instances.values(), key=lambda i: int(i.port) if i.port.isdigit() else 0)
+
+    def get(self, port):
+        with self._lock:
+            return self._instances.get(str(port).strip())
+
+    def add(self, port, name: str = "", extra_args: str = "") -> ComfyInstance:
+        port = str(port).strip()
+        if not port.isdigit() or not (0 < int(port) < 65536):
+            raise ValueError(f"无效端口: {port}")
+        if port == self._primary_port():
+            raise ValueError(f"端口 {port} 已被主实例使用")
+        if self.get(port) is not None:
+            raise ValueError(f"端口 {port} 的实例已存在")
+        inst = self._add(ComfyInstance(self.app, port, name, extra_args))
+        self.save()
+        return inst
+
+    def remove(self, port):
+        inst = self.get(port)
+        if inst is None:
+            return False
+        if inst.is_running():
+            raise RuntimeError(f"实例 {inst.name} 仍在运行，请先停止")
+        inst.supervisor.close()
+        with self._lock:
+            self._instances.pop(inst.port, None)
+        self.save()
+        return True
+
+    # ---------- 启停 ----------
+    def start(self, port):
+        inst = self.get(port)
+        if inst is None:
+            raise KeyError(port)
+        return inst.start()
+
+    def stop(self, port) -> bool:
+        inst = self.get(port)
+        if inst is None:
+            raise KeyError(port)
+        return inst.stop()
+
+    def stop_all(self) -> bool:
+        insts = [i for i in self.instances() if i.is_running()]
+        results = [False] * len(insts)
+
+        # 各实例并发停止，总耗时取决于最慢的一个而非总和
+        def _one(idx, inst):
+            try:
+                results[idx] = inst.stop()
+            except Exception:
+                results[idx] = False
+        threads = [threading.Thread(target=_one, args=(i, inst), daemon=True) for i, inst in enumerate(insts)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return any(results)
+
+    def managed_pids(self) -> set:
+        """返回各附加实例正在跟踪的 PID（含其后代），供主实例的全局停止逻辑排除。"""
+        from core.kill import _descendants
+        pids = set()
+        for inst in self.instances():
+            if inst.is_running():
+                pids.add(inst.process.pid)
+                for child in _descendants(inst.process.pid):
+                    try:
+                        pids.add(child.pid)
+                    except Exception:
+                        pass
+        return pids
+
+    # ---------- 状态 ----------
+    def statuses(self) -> list:
+        return [inst.status() for inst in self.instances()]
+
+    def aggregate(self) -> dict:
+        """按状态汇总：{"total": n, "ready": .., "starting": .., "stopping": .., "stopped": ..}。"""
+        counts = {"total": 0, STATE_READY: 0, STATE_STARTING: 0, STATE_STOPPING: 0, "stopped": 0}
+        for inst in self.instances():
+            counts["total"] += 1
+            st = inst.state
+            if st in (STATE_READY, STATE_STARTING, STATE_STOPPING):
+                counts[st] += 1
+            else:
+                counts["stopped"] += 1
+        return counts
+
+    def format_aggregate(self) -> str:
+        a = self.aggregate()
+        if not a["total"]:
+            return "无附加实例"
+        return f"共 {a['total']} 个实例：运行 {a[STATE_READY]}，启动中 {a[STATE_STARTING]}，停止中 {a[STATE_STOPPING]}，已停止 {a['stopped']}"
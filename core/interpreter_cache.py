@@ -0,0 +1,89 @@
+"""
+Python 解释器校验缓存。
+
+以 (解析后的路径, 文件大小, mtime) 作为指纹记录 `python --version` 的校验结果，
+指纹不变时启动流程直接复用结果，不再每次启动都执行探测；
+结果持久化到 launcher/interpreter_cache.json，跨启动有效。
+"""
+
+import subprocess
+from pathlib import Path
+
+from utils.common import run_hidden
+from utils.json_cache import JsonStore
+
+# 探测超时（秒）；慢盘首次冷启动解释器可能远超 1 秒
+PROBE_TIMEOUT = 5.0
+_CACHE_MAX = 16
+
+_store = JsonStore("interpreter_cache.json", indent=2)
+
+
+def fingerprint(py) -> tuple:
+    """返回 (路径, 大小, mtime_ns)；文件不可访问时返回 None。"""
+    try:
+        p = Path(py).resolve()
+        st = p.stat()
+        return str(p), int(st.st_size), int(st.st_mtime_ns)
+    except Exception:
+        return None
+
+
+def lookup(py):
+    """指纹命中时返回缓存的版本字符串，否则返回 None。"""
+    fp = fingerprint(py)
+    if fp is None:
+        return None
+    with _store.lock:
+        entry = _store.data().get(fp[0])
+    if isinstance(entry, dict) and entry.get("size") == fp[1] and entry.get("mtime_ns") == fp[2]:
+        return entry.get("version") or ""
+    return None
+
+
+def remember(py, version: str):
+    fp = fingerprint(py)
+    if fp is None:
+        return
+    with _store.lock:
+        cache = _store.data()
+        cache.pop(fp[0], None)
+        while len(cache) >= _CACHE_MAX:
+            cache.pop(next(iter(cache)), None)
+        cache[fp[0]] = {"size": fp[1], "mtime_ns": fp[2], "version": version}
+        _store.save()
+
+
+def invalidate(py=None):
+    with _store.lock:
+        cache = _store.data()
+        if py is None:
+            cache.clear()
+        else:
+            fp = fingerprint(py)
+            cache.pop(fp[0] if fp else str(py), None)
+        _store.save()
+
+
+def validate_interpreter(py, timeout: float = PROBE_TIMEOUT):
+    """校验解释器是否可执行，返回 (ok, 信息)。
+
+    - 指纹命中缓存：直接返回 (True, 版本)，不启动子进程；
+    - 探测成功：写入缓存；
+    - 探测超时：视为无法确认而非失败，返回 (True, "")，不写缓存，交由真正的启动去暴露问题；
+    - 返回码非 0 或无法执行：返回 (False, 错误信息)。
+    """
+    cached = lookup(py)
+    if cached is not None:
+        return True, cached
+    try:
+        r = run_hidden([str(py), "--version"], capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return True, ""
+    except Exception as e:
+        return False, str(e)
+    if r.returncode != 0:
+        return False, f"Python无法执行: {py}"
+    version = ((r.stdout or "") + (r.stderr or "")).strip()
+    remember(py, version)
+    return True, version
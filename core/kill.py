@@ -1,33 +1,254 @@
 import os
+import signal
+import time
+from collections import deque
 from utils.common import run_hidden
+from core.probe import invalidate_port_index
 
 try:
     import psutil
 except ImportError:
     psutil = None
 
+# 停止时间线默认值（秒）：发送 SIGTERM 后等待 grace，仍存活则 SIGKILL 并再等待 kill_wait
+DEFAULT_STOP_GRACE = 5.0
+DEFAULT_STOP_KILL_WAIT = 2.0
+_POLL_INTERVAL = 0.05
+
+# 最近若干次停止耗时记录
+_stop_history = deque(maxlen=50)
+
+
+def stop_timeline(app) -> tuple:
+    """读取 launch_options.stop_grace_seconds / stop_kill_wait_seconds，返回 (grace, kill_wait)。"""
+    grace, kill_wait = DEFAULT_STOP_GRACE, DEFAULT_STOP_KILL_WAIT
+    try:
+        opts = app.config.get("launch_options", {}) or {}
+        grace = max(0.0, float(opts.get("stop_grace_seconds", grace)))
+        kill_wait = max(0.0, float(opts.get("stop_kill_wait_seconds", kill_wait)))
+    except Exception:
+        pass
+    return grace, kill_wait
+
+
+def record_stop(app, started: float, method: str, escalated: bool = False, ok: bool = True):
+    """记录一次停止的耗时并写日志；started 为 time.monotonic() 起点。"""
+    entry = {
+        "ts": time.time(),
+        "latency_ms": round((time.monotonic() - started) * 1000.0, 1),
+        "method": method,
+        "escalated": bool(escalated),
+        "ok": bool(ok),
+    }
+    _stop_history.append(entry)
+    try:
+        app.logger.info("停止耗时: %.0f ms (method=%s, escalated=%s, ok=%s)", entry["latency_ms"], method, escalated, ok)
+    except Exception:
+        pass
+    return entry
+
+
+def stop_history() -> list:
+    return list(_stop_history)
+
+
+def popen_group_kwargs() -> dict:
+    """POSIX 下让子进程成为新会话/进程组的组长，停止时可整组发送信号。"""
+    if os.name == 'nt':
+        return {}
+    return {"start_new_session": True}
+
+
+def _member_state(pid):
+    """读取 /proc/<pid>/stat，返回 (state, pgrp)；进程不存在时返回 None。"""
+    try:
+        with open(f"/proc/{pid}/stat", "r", encoding="ascii", errors="ignore") as f:
+            stat = f.read()
+        # comm 字段可能含空格，从最后一个 ')' 之后解析：state ppid pgrp ...
+        fields = stat[stat.rindex(")") + 2:].split()
+        return fields[0], int(fields[2])
+    except Exception:
+        return None
+
+
+def _scan_group(pgid):
+    """扫描 /proc 返回进程组内的非僵尸成员；无 /proc 时返回 None。"""
+    if not os.path.isdir("/proc"):
+        return None
+    try:
+        entries = [d for d in os.listdir("/proc") if d.isdigit()]
+    except Exception:
+        return None
+    members = []
+    for d in entries:
+        st = _member_state(d)
+        if st is not None and st[1] == pgid and st[0] != "Z":
+            members.append(int(d))
+    return members
+
+
+# pgid -> 上次扫描到的存活成员，轮询时只复查这些 PID
+_group_members = {}
+
+
+def _group_has_live_member(pgid):
+    """Linux：进程组内是否还有非僵尸成员；无法判断时返回 None。
+
+    先复查已知成员，全部退出后才重新扫描 /proc（捕获期间新派生的成员）。
+    """
+    known = []
+    for pid in _group_members.get(pgid) or ():
+        st = _member_state(pid)
+        if st is not None and st[1] == pgid and st[0] != "Z":
+            known.append(pid)
+    if known:
+        _group_members[pgid] = known
+        return True
+    members = _scan_group(pgid)
+    if members is None:
+        return None
+    if members:
+        _group_members[pgid] = members
+    else:
+        _group_members.pop(pgid, None)
+    return bool(members)
+
+
+def _group_alive(pgid) -> bool:
+    try:
+        os.killpg(pgid, 0)
+    except ProcessLookupError:
+        _group_members.pop(pgid, None)
+        return False
+    except PermissionError:
+        return True
+    except Exception:
+        return False
+    # 已退出但未被回收的僵尸成员同样能接收信号 0，不应视为存活
+    live = _group_has_live_member(pgid)
+    return True if live is None else live
+
+
+def _descendants(pid) -> list:
+    # 捕获另起会话、脱离进程组的孙进程（部分自定义节点会 setsid）
+    if not psutil:
+        return []
+    try:
+        return psutil.Process(pid).children(recursive=True)
+    except Exception:
+        return []
+
+
+def _wait_all(proc, pgid, extra, deadline) -> bool:
+    """同时等待组长、整个进程组与额外后代退出；全部结束返回 True。"""
+    while True:
+        done = True
+        try:
+            if proc is not None and proc.poll() is None:
+                done = False
+        except Exception:
+            pass
+        if done and pgid is not None and _group_alive(pgid):
+            done = False
+        if done and extra:
+            try:
+                extra[:] = [p for p in extra if p.is_running() and p.status() != psutil.STATUS_ZOMBIE]
+            except Exception:
+                pass
+            if extra:
+                done = False
+        if done:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(_POLL_INTERVAL)
+
+
+def _signal_all(pgid, extra, sig):
+    if pgid is not None:
+        try:
+            os.killpg(pgid, sig)
+        except Exception:
+            pass
+    for p in extra:
+        try:
+            p.send_signal(sig)
+        except Exception:
+            pass
+
+
+def terminate_tree(app, proc) -> tuple:
+    """按时间线终止 POSIX 子进程及其整个进程组：SIGTERM -> 等待 grace -> SIGKILL -> 等待 kill_wait。
+
+    所有成员并发等待，返回 (是否全部退出, 是否升级到 SIGKILL)。
+    """
+    grace, kill_wait = stop_timeline(app)
+    pgid = None
+    try:
+        pgid = os.getpgid(proc.pid)
+        # 仅当子进程是独立进程组组长时整组发送信号，避免误伤启动器自身所在组
+        if pgid != proc.pid or pgid == os.getpgrp():
+            pgid = None
+    except Exception:
+        pgid = None
+    extra = _descendants(proc.pid)
+    if pgid is not None:
+        _signal_all(pgid, extra, signal.SIGTERM)
+    else:
+        try:
+            proc.terminate()
+        except Exception:
+            pass
+        _signal_all(None, extra, signal.SIGTERM)
+    if _wait_all(proc, pgid, extra, time.monotonic() + grace):
+        return True, False
+    try:
+        app.logger.warning("进程组未在 %.1fs 内退出，发送 SIGKILL", grace)
+    except Exception:
+        pass
+    if pgid is not None:
+        _signal_all(pgid, extra, signal.SIGKILL)
+    else:
+        try:
+            proc.kill()
+        except Exception:
+            pass
+        _signal_all(None, extra, signal.SIGKILL)
+    return _wait_all(proc, pgid, extra, time.monotonic() + kill_wait), True
+
+
 def kill_pids(app, pids):
     killed_any = False
+    started = time.monotonic()
+    escalated = False
     if psutil:
         try:
+            grace, kill_wait = stop_timeline(app)
             procs_to_wait = []
             for pid in pids:
                 try:
-                    p = psutil.Process(pid)
+                    procs_to_wait.append(psutil.Process(pid))
+                    procs_to_wait.extend(_descendants(pid))
+                except Exception:
+                    pass
+            for p in procs_to_wait:
+                try:
                     p.terminate()
-                    procs_to_wait.append(p)
                 except Exception:
                     pass
             if procs_to_wait:
-                gone, alive = psutil.wait_procs(procs_to_wait, timeout=3)
+                gone, alive = psutil.wait_procs(procs_to_wait, timeout=grace)
                 if gone:
                     killed_any = True
                 for p in alive:
                     try:
                         p.kill()
                         killed_any = True
+                        escalated = True
                     except Exception:
                         pass
+                if alive:
+                    psutil.wait_procs(alive, timeout=kill_wait)
         except Exception:
             pass
     if os.name == 'nt':
@@ -37,5 +258,8 @@ def kill_pids(app, pids):
             killed_any = True
         except Exception:
             pass
+    # 进程已变化，丢弃端口索引快照
+    invalidate_port_index()
+    record_stop(app, started, "pids", escalated, killed_any)
     if not killed_any:
-        raise RuntimeError("无法终止目标进程")
\ No newline at end of file
+        raise RuntimeError("无法终止目标进程")
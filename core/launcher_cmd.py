@@ -9,8 +9,10 @@ def build_launch_params(app):
     comfy_root = (base / "ComfyUI").resolve()
     py = PATHS.resolve_python_exec(comfy_root, app.config["paths"].get("python_path", "python_embeded/python.exe"))
     try:
-        app.config["paths"]["python_path"] = str(py)
-        app.save_config()
+        # 解析结果未变化时不重写配置，避免每次启动都同步写盘
+        if app.config["paths"].get("python_path") != str(py):
+            app.config["paths"]["python_path"] = str(py)
+            app.save_config()
     except Exception:
         pass
     main = comfy_root / "main.py"
@@ -57,7 +59,13 @@ def build_launch_params(app):
     env = os.environ.copy()
     try:
         sel = app.selected_hf_mirror.get()
-        if sel != "不使用镜像":
+        if sel == "自动":
+            # 按测速结果选择；官方站点最快时 endpoint 为官方地址
+            svc = getattr(app, 'services', None)
+            endpoint = svc.mirror.hf_endpoint() if svc and getattr(svc, 'mirror', None) else "https://hf-mirror.com"
+            if endpoint:
+                env["HF_ENDPOINT"] = endpoint
+        elif sel != "不使用镜像":
             endpoint = (app.hf_mirror_url.get() or "").strip()
             if endpoint:
                 env["HF_ENDPOINT"] = endpoint
@@ -65,8 +73,11 @@ def build_launch_params(app):
         pass
     try:
         vm = getattr(app, 'version_manager', None)
-        if vm and vm.proxy_mode_var.get() in ('gh-proxy', 'custom'):
+        if vm and vm.proxy_mode_var.get() in ('gh-proxy', 'custom', 'auto'):
             base = (vm.proxy_url_var.get() or '').strip()
+            if vm.proxy_mode_var.get() == 'auto':
+                svc = getattr(app, 'services', None)
+                base = svc.mirror.github_base() if svc and getattr(svc, 'mirror', None) else ''
             if base:
                 if not base.endswith('/'):
                     base += '/'
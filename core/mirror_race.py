@@ -0,0 +1,117 @@
+"""
+镜像测速与自动选择。
+
+对候选端点并行发起小请求（GitHub：`git ls-remote`；PyPI：simple 索引页；HF：小文件的 Range 请求），
+取最快且成功的端点；结果连同各端点耗时持久化到 launcher/mirror_cache.json，
+超过 TTL 后仍先返回旧结果，由调用方在后台重新测速。
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import Request, urlopen
+
+from utils.common import run_hidden
+from utils.json_cache import JsonStore
+
+KIND_GITHUB = "github"
+KIND_PYPI = "pypi"
+KIND_HF = "hf"
+KINDS = (KIND_GITHUB, KIND_PYPI, KIND_HF)
+
+# 空串表示直连（不使用代理/镜像）
+GITHUB_CANDIDATES = ("", "https://gh-proxy.com/")
+PYPI_CANDIDATES = (
+    "https://pypi.org/simple/",
+    "https://mirrors.aliyun.com/pypi/simple/",
+    "https://pypi.tuna.tsinghua.edu.cn/simple/",
+)
+HF_CANDIDATES = ("https://huggingface.co", "https://hf-mirror.com")
+
+GITHUB_PROBE_REPO = "https://github.com/comfyanonymous/ComfyUI.git"
+PYPI_PROBE_PACKAGE = "comfyui-frontend-package"
+HF_PROBE_PATH = "/openai-community/gpt2/resolve/main/config.json"
+
+PROBE_TIMEOUT = 8.0
+DEFAULT_TTL = 1800
+_READ_LIMIT = 16 * 1024
+
+_store = JsonStore("mirror_cache.json", indent=2)
+
+
+def cached(kind: str, candidates=None):
+    """返回 {"url", "ts", "results"}；无记录或胜者已不在候选列表中时返回 None。"""
+    with _store.lock:
+        entry = _store.data().get(kind)
+    if not isinstance(entry, dict) or "url" not in entry:
+        return None
+    if candidates is not None and entry["url"] not in candidates:
+        return None
+    return entry
+
+
+def is_fresh(entry, ttl: float = DEFAULT_TTL) -> bool:
+    try:
+        return bool(entry) and (time.time() - float(entry.get("ts", 0))) < ttl
+    except Exception:
+        return False
+
+
+def remember(kind: str, url: str, results: dict):
+    with _store.lock:
+        _store.data()[kind] = {"url": url, "ts": time.time(), "results": dict(results)}
+        _store.save()
+
+
+# ---------- 探测 ----------
+def probe_github(base: str, git_cmd: str = "git", timeout: float = PROBE_TIMEOUT) -> bool:
+    url = f"{base}{GITHUB_PROBE_REPO}" if base else GITHUB_PROBE_REPO
+    r = run_hidden([git_cmd or "git", "ls-remote", "--heads", url, "refs/heads/master"],
+                   capture_output=True, text=True, timeout=timeout)
+    return r.returncode == 0 and bool((r.stdout or "").strip())
+
+
+def probe_pypi(index_url: str, timeout: float = PROBE_TIMEOUT) -> bool:
+    base = index_url if index_url.endswith("/") else index_url + "/"
+    req = Request(f"{base}{PYPI_PROBE_PACKAGE}/", headers={"User-Agent": "ComfyUI-Launcher"})
+    with urlopen(req, timeout=timeout) as resp:
+        resp.read(_READ_LIMIT)
+        return 200 <= resp.status < 300
+
+
+def probe_hf(endpoint: str, timeout: float = PROBE_TIMEOUT) -> bool:
+    req = Request(f"{endpoint.rstrip('/')}{HF_PROBE_PATH}",
+                  headers={"User-Agent": "ComfyUI-Launcher", "Range": "bytes=0-1023"})
+    with urlopen(req, timeout=timeout) as resp:
+        resp.read(_READ_LIMIT)
+        return 200 <= resp.status < 300
+
+
+def race(candidates, probe, timeout: float = PROBE_TIMEOUT):
+    """并行探测全部候选，返回 (最快的成功端点或 None, {端点: 耗时秒数或 None})。
+
+    probe(candidate) 成功返回真值，失败返回假值或抛出异常。
+    """
+    candidates = list(dict.fromkeys(candidates))
+    results = {}
+
+    def _one(c):
+        t0 = time.perf_counter()
+        try:
+            ok = probe(c)
+        except Exception:
+            ok = False
+        return c, (time.perf_counter() - t0) if ok else None
+
+    if not candidates:
+        return None, results
+    with ThreadPoolExecutor(max_workers=len(candidates)) as pool:
+        futures = [pool.submit(_one, c) for c in candidates]
+        for f in futures:
+            try:
+                c, seconds = f.result(timeout=timeout + 2)
+            except Exception:
+                continue
+            results[c] = seconds
+    ok = [(s, c) for c, s in results.items() if s is not None]
+    best = min(ok)[1] if ok else None
+    return best, results
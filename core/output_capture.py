@@ -0,0 +1,113 @@
+"""
+ComfyUI 子进程输出捕获。
+
+在独立线程中逐行读取子进程合并后的 stdout/stderr，不阻塞界面线程；
+识别就绪标记行（"To see the GUI go to"）与 Python 异常回溯，
+并把每一行分发给订阅者（如控制台视图）。
+"""
+
+import threading
+from collections import deque
+
+READY_MARKERS = ("To see the GUI go to",)
+TRACEBACK_MARKER = "Traceback (most recent call last):"
+
+
+class OutputCapture:
+    def __init__(self, stream, on_ready=None, on_traceback=None, on_closed=None, tail_lines: int = 200, encoding: str = "utf-8"):
+        """
+        :param stream: 子进程的 stdout（二进制管道）。
+        :param on_ready: 检测到就绪标记时调用 on_ready(line)，仅触发一次。
+        :param on_traceback: 检测到异常回溯开头时调用 on_traceback(line)。
+        :param on_closed: 输出流结束（通常意味着子进程退出）时调用 on_closed()。
+        """
+        self.stream = stream
+        self.encoding = encoding
+        self._on_ready = on_ready
+        self._on_traceback = on_traceback
+        self._on_closed = on_closed
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._tail = deque(maxlen=tail_lines)
+        self._traceback = []
+        self._in_traceback = False
+        self.ready_event = threading.Event()
+        self.closed_event = threading.Event()
+        self._thread = None
+
+    def add_listener(self, fn):
+        """订阅输出行 fn(line)；在读取线程中调用。"""
+        with self._lock:
+            if fn not in self._listeners:
+                self._listeners.append(fn)
+
+    def remove_listener(self, fn):
+        with self._lock:
+            try:
+                self._listeners.remove(fn)
+            except ValueError:
+                pass
+
+    def start(self):
+        self._thread = threading.Thread(target=self._pump, name="comfyui-output", daemon=True)
+        self._thread.start()
+        return self
+
+    def _pump(self):
+        try:
+            for raw in iter(self.stream.readline, b""):
+                try:
+                    line = raw.decode(self.encoding, errors="replace").rstrip("\r\n")
+                except Exception:
+                    continue
+                self._handle(line)
+        except Exception:
+            pass
+        finally:
+            try:
+                self.stream.close()
+            except Exception:
+                pass
+            self.closed_event.set()
+            if self._on_closed:
+                try:
+                    self._on_closed()
+                except Exception:
+                    pass
+
+    def _handle(self, line: str):
+        with self._lock:
+            self._tail.append(line)
+            listeners = list(self._listeners)
+        if TRACEBACK_MARKER in line:
+            self._in_traceback = True
+            self._traceback = [line]
+            if self._on_traceback:
+                try:
+                    self._on_traceback(line)
+                except Exception:
+                    pass
+        elif self._in_traceback:
+            self._traceback.append(line)
+            # 回溯以无缩进的异常行结束
+            if line and not line.startswith((" ", "\t")):
+                self._in_traceback = False
+        if not self.ready_event.is_set() and any(m in line for m in READY_MARKERS):
+            self.ready_event.set()
+            if self._on_ready:
+                try:
+                    self._on_ready(line)
+                except Exception:
+                    pass
+        for fn in listeners:
+            try:
+                fn(line)
+            except Exception:
+                pass
+
+    def tail(self, n: int = 20) -> list:
+        with self._lock:
+            return list(self._tail)[-n:]
+
+    def last_traceback(self) -> str:
+        return "\n".join(self._traceback)
@@ -2,75 +2,227 @@ import os
 import locale
 import shutil
 import re
+import threading
+import time
 from pathlib import Path
 from utils.common import run_hidden
-from urllib.request import urlopen, Request
 
 try:
     import psutil
 except ImportError:
     psutil = None
 
-def find_pids_by_port_safe(port: str):
-    if psutil:
+# 端口 -> PID 索引快照的有效期（秒）；启动/停止流程中的多次查询共享同一快照
+PORT_INDEX_TTL = 2.0
+
+_port_index_lock = threading.Lock()
+_port_index = {"ts": 0.0, "index": None, "netstat": None}
+
+_PROC_TCP_STATES = ("0A", "01")  # LISTEN / ESTABLISHED
+
+
+def _read_proc_net_index():
+    """Linux：一次读取 /proc/net/tcp{,6} 与一次 inode->pid 映射构建端口索引。
+
+    不可用时返回 None。
+    """
+    if not os.path.isdir("/proc/net"):
+        return None
+    inode_port = {}
+    read_any = False
+    for name in ("tcp", "tcp6"):
         try:
-            pids = set()
-            for p in psutil.process_iter(attrs=["pid"]):
-                try:
-                    conns = p.connections(kind='inet')
-                    for conn in conns:
-                        try:
-                            if getattr(conn, 'laddr', None) and getattr(conn.laddr, 'port', None) == int(port):
-                                pids.add(p.pid)
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-            if pids:
-                return list(pids)
+            with open(f"/proc/net/{name}", "r", encoding="ascii", errors="ignore") as f:
+                lines = f.read().splitlines()[1:]
+            read_any = True
+        except Exception:
+            continue
+        for line in lines:
+            parts = line.split()
+            if len(parts) < 10 or parts[3] not in _PROC_TCP_STATES:
+                continue
+            try:
+                port = int(parts[1].rsplit(":", 1)[1], 16)
+                inode = parts[9]
+            except Exception:
+                continue
+            if inode and inode != "0":
+                inode_port[inode] = port
+    if not read_any:
+        return None
+    index = {}
+    if not inode_port:
+        return index
+    try:
+        pid_dirs = [d for d in os.listdir("/proc") if d.isdigit()]
+    except Exception:
+        return None
+    for d in pid_dirs:
+        fd_dir = f"/proc/{d}/fd"
+        try:
+            fds = os.listdir(fd_dir)
+        except Exception:
+            continue
+        for fd in fds:
+            try:
+                link = os.readlink(f"{fd_dir}/{fd}")
+            except Exception:
+                continue
+            if not link.startswith("socket:["):
+                continue
+            port = inode_port.get(link[8:-1])
+            if port is not None:
+                index.setdefault(port, set()).add(int(d))
+    return index
+
+
+def _read_psutil_index():
+    """通过一次 psutil.net_connections 调用构建端口索引；不可用时返回 None。"""
+    if not psutil:
+        return None
+    try:
+        conns = psutil.net_connections(kind='inet')
+    except Exception:
+        return None
+    index = {}
+    for conn in conns:
+        try:
+            if conn.laddr and conn.pid and conn.status in ('LISTEN', 'ESTABLISHED'):
+                index.setdefault(int(conn.laddr.port), set()).add(int(conn.pid))
         except Exception:
             pass
+    return index
+
+
+def _read_netstat_index():
+    # 回退到 netstat 解析（Windows），只认 TCP 的 LISTENING 或 ESTABLISHED
+    index = {}
     try:
         cmd = ["netstat", "-ano"]
         preferred_enc = locale.getpreferredencoding(False) or "utf-8"
         r = run_hidden(cmd, capture_output=True, text=True, encoding=preferred_enc, errors="ignore")
         if r.returncode == 0 and r.stdout:
-            pids = set()
-            pattern_tcp = re.compile(rf"^\s*TCP\s+\S+:{port}\s+\S+:\S+\s+(LISTENING|ESTABLISHED)\s+(\d+)\s*$", re.IGNORECASE)
+            pattern_tcp = re.compile(r"^\s*TCP\s+\S+:(\d+)\s+\S+:\S+\s+(LISTENING|ESTABLISHED)\s+(\d+)\s*$", re.IGNORECASE)
             for line in r.stdout.splitlines():
                 m = pattern_tcp.match(line)
                 if m:
                     try:
-                        pids.add(int(m.group(2)))
+                        index.setdefault(int(m.group(1)), set()).add(int(m.group(3)))
                     except Exception:
                         pass
-            return list(pids)
     except Exception:
         pass
-    return []
+    return index
+
+
+def invalidate_port_index():
+    """在终止进程或启动新实例后调用，使下一次查询重新读取套接字表。"""
+    with _port_index_lock:
+        _port_index["ts"] = 0.0
+        _port_index["index"] = None
+        _port_index["netstat"] = None
+
+
+def find_pids_by_port_safe(port: str, max_age: float = PORT_INDEX_TTL):
+    try:
+        port_num = int(str(port).strip())
+    except Exception:
+        return []
+    with _port_index_lock:
+        now = time.monotonic()
+        if _port_index["index"] is None or (now - _port_index["ts"]) > max_age:
+            index = _read_psutil_index()
+            if index is None:
+                index = _read_proc_net_index()
+            _port_index["index"] = index or {}
+            _port_index["netstat"] = None
+            _port_index["ts"] = now
+        pids = _port_index["index"].get(port_num)
+        if pids:
+            return list(pids)
+        # 主索引未命中时回退 netstat，结果同样缓存在本次快照内
+        if _port_index["netstat"] is None:
+            _port_index["netstat"] = _read_netstat_index()
+        return list(_port_index["netstat"].get(port_num, ()))
+
+# 界面线程同步探测端口时的超时上限（秒）
+UI_PROBE_TIMEOUT = 0.5
+
+# (pid, create_time) -> 是否为 ComfyUI；create_time 区分被复用的 PID
+_CLASSIFY_CACHE_MAX = 4096
+_classify_lock = threading.Lock()
+_classify_cache = {}
+
+
+def _match_comfyui(cmdline: str, exe: str, cwd: str) -> bool:
+    if ("main.py" in cmdline and ("comfyui" in cmdline or "windows-standalone-build" in cmdline)):
+        return True
+    if ("comfyui" in cmdline or "comfyui" in exe or "comfyui" in cwd):
+        return True
+    return False
+
+
+def _classify_process(p):
+    """True/False；未匹配且有属性读取失败（如 AccessDenied）时返回 None，表示无法判定、不应缓存。"""
+    unreadable = False
+    with p.oneshot():
+        try:
+            cmdline = " ".join(p.cmdline() or []).lower()
+        except Exception:
+            cmdline = ""
+            unreadable = True
+        try:
+            exe = (p.exe() or "").lower()
+        except Exception:
+            exe = ""
+            unreadable = True
+        try:
+            cwd = (p.cwd() or "").lower()
+        except Exception:
+            cwd = ""
+            unreadable = True
+    if _match_comfyui(cmdline, exe, cwd):
+        return True
+    return None if unreadable else False
+
+
+def _cache_classification(key, value: bool):
+    with _classify_lock:
+        if len(_classify_cache) >= _CLASSIFY_CACHE_MAX:
+            _classify_cache.clear()
+        _classify_cache[key] = value
+
+
+def clear_classification_cache():
+    with _classify_lock:
+        _classify_cache.clear()
+
 
 def is_comfyui_pid(app, pid: int) -> bool:
+    key = None
+    # 只有 psutil 读全了属性、或 wmic 给出结论时才缓存，避免把暂时无权限读取的进程永久记为“否”
+    certain = False
     if psutil:
         try:
             p = psutil.Process(pid)
             try:
-                cmdline = " ".join(p.cmdline()).lower()
-            except Exception:
-                cmdline = ""
-            try:
-                exe = (p.exe() or "").lower()
-            except Exception:
-                exe = ""
-            try:
-                cwd = (p.cwd() or "").lower()
+                key = (int(pid), p.create_time())
             except Exception:
-                cwd = ""
-            if ("main.py" in cmdline and ("comfyui" in cmdline or "windows-standalone-build" in cmdline)):
-                return True
-            if ("comfyui" in cmdline or "comfyui" in exe or "comfyui" in cwd):
+                key = None
+            if key is not None:
+                with _classify_lock:
+                    cached = _classify_cache.get(key)
+                if cached is not None:
+                    return cached
+            verdict = _classify_process(p)
+            if verdict:
+                if key is not None:
+                    _cache_classification(key, True)
                 return True
+            certain = verdict is False
         except (Exception):
             pass
+    result = False
     if os.name == 'nt':
         try:
             if getattr(app, "_wmic_available", None) is None:
@@ -88,30 +240,72 @@ def is_comfyui_pid(app, pid: int) -> bool:
             try:
                 r = run_hidden(["wmic", "process", "where", f"ProcessId={pid}", "get", "CommandLine", "/format:list"], capture_output=True, text=True, encoding=preferred_enc, errors="ignore")
                 if r.returncode == 0 and r.stdout:
+                    certain = True
                     out = r.stdout.lower()
                     if ("comfyui" in out) or ("main.py" in out) or (comfy_root and comfy_root in out):
-                        return True
+                        result = True
             except FileNotFoundError:
                 app._wmic_available = False
             except Exception:
                 pass
-    return False
+    if key is not None and certain:
+        _cache_classification(key, result)
+    return result
+
+
+def find_comfyui_pids(app=None) -> list:
+    """单次 process_iter 批量判定所有 ComfyUI 进程。
+
+    只预取 pid/create_time；仅对缓存中未见过的进程读取 cmdline/exe/cwd，
+    并顺带清理已退出进程的缓存条目；属性读取失败的进程不缓存，下次重新判定。
+    无 psutil 时返回空列表。
+    """
+    if not psutil:
+        return []
+    found = []
+    seen = set()
+    self_pid = os.getpid()
+    try:
+        for p in psutil.process_iter(attrs=["pid", "create_time"]):
+            try:
+                pid = p.info.get("pid")
+                ctime = p.info.get("create_time")
+                if not pid or pid == self_pid:
+                    continue
+                key = (int(pid), ctime)
+                seen.add(key)
+                with _classify_lock:
+                    cached = _classify_cache.get(key)
+                if cached is None:
+                    try:
+                        cached = _classify_process(p)
+                    except Exception:
+                        continue
+                    if cached is None:
+                        # 暂时无法读取（权限、进程刚创建等）：本次视为否，下次重新判定
+                        cached = False
+                    else:
+                        _cache_classification(key, cached)
+                if cached:
+                    found.append(int(pid))
+            except Exception:
+                pass
+    except Exception:
+        return found
+    with _classify_lock:
+        for key in [k for k in _classify_cache if k not in seen]:
+            _classify_cache.pop(key, None)
+    return found
 
-def is_http_reachable(app) -> bool:
+def is_http_reachable(app, timeout: float = None) -> bool:
+    """timeout 为本次探测的超时上限；在界面线程中调用时传入 UI_PROBE_TIMEOUT。"""
     try:
         port = int((app.custom_port.get() or "8188").strip())
     except Exception:
         return False
     try:
-        url = f"http://127.0.0.1:{port}/system_stats"
-        req = Request(url, headers={"Accept": "application/json", "User-Agent": "ComfyUI-Launcher"})
-        with urlopen(req, timeout=0.4) as resp:
-            code = getattr(resp, "status", None)
-            if code is None:
-                try:
-                    code = resp.getcode()
-                except Exception:
-                    code = None
-            return code == 200
+        # 复用 keep-alive 连接并自适应超时，记录延迟统计
+        from core.health_probe import get_prober
+        return get_prober().probe(port, timeout=timeout)
     except Exception:
-        return False
\ No newline at end of file
+        return False
@@ -14,8 +14,12 @@ import socket #
 from tkinter import messagebox
 from pathlib import Path
 from utils.common import run_hidden #
-from core.probe import is_http_reachable, find_pids_by_port_safe, is_comfyui_pid
+from core.probe import is_http_reachable, find_pids_by_port_safe, is_comfyui_pid, find_comfyui_pids, invalidate_port_index, UI_PROBE_TIMEOUT
 from core.kill import kill_pids
+from core.console_buffer import ConsoleBuffer, DEFAULT_MAX_LINES
+from core.supervisor import ProcessSupervisor, STATE_READY, STATE_STOPPING, STATE_EXITED, STATE_IDLE
+from core.instances import InstanceManager
+from core.restart_policy import RestartPolicy, ACTION_RESTART, ACTION_CRASH_LOOP
 
 # 尝试导入 psutil，如果失败则在相关功能中回退
 try:
@@ -31,6 +35,25 @@ class ProcessManager:
         """
         self.app = app
         self.comfyui_process = None
+        self._open_browser_on_ready = False
+        # 输出捕获模式下的子进程输出读取器（core.output_capture.OutputCapture）
+        self.output_capture = None
+        # 子进程输出环形缓冲，供控制台视图读取；容量取 ui_settings.log_max_lines
+        try:
+            max_lines = (app.config.get("ui_settings", {}) or {}).get("log_max_lines", DEFAULT_MAX_LINES)
+        except Exception:
+            max_lines = DEFAULT_MAX_LINES
+        self.console_buffer = ConsoleBuffer(max_lines)
+        # 常驻监督器：阻塞等待子进程退出并派发状态切换，取代轮询监控
+        self.supervisor = ProcessSupervisor(app, probe=self._is_http_reachable)
+        self.supervisor.add_listener(self._on_supervisor_state)
+        # 附加实例（各自端口与状态机），主实例仍由本类管理
+        self.instances = InstanceManager(app)
+        # 可选的自动重启策略（launch_options.auto_restart）
+        self.restart_policy = RestartPolicy(app)
+        self._user_stop_requested = False
+        self._restart_after_id = None
+        self._auto_restarting = False
 
     def toggle_comfyui(self): #
         # 防抖与状态保护：启动进行中时忽略重复点击
@@ -53,7 +76,8 @@ class ProcessManager:
             if self.comfyui_process and self.comfyui_process.poll() is None:
                 running = True
             else:
-                running = is_http_reachable(self.app)
+                # 在界面线程中执行：限制探测超时，避免实例负载高时卡住界面
+                running = is_http_reachable(self.app, timeout=UI_PROBE_TIMEOUT)
         except Exception:
             running = False
         if running:
@@ -108,7 +132,11 @@ class ProcessManager:
             # 未占用则正常启动
             self.start_comfyui()
 
-    def start_comfyui(self): #
+    def start_comfyui(self, auto_restart: bool = False): #
+        self._user_stop_requested = False
+        if not auto_restart:
+            self._cancel_pending_restart()
+            self.restart_policy.reset()
         try:
             from core.launcher_cmd import build_launch_params
             cmd, env, run_cwd, py, main = build_launch_params(self.app)
@@ -124,10 +152,11 @@ class ProcessManager:
                 self._show_error("错误", f"主文件不存在: {main}")
                 return
             try:
-                from pathlib import Path as _P
-                rver = run_hidden([str(py), "--version"], capture_output=True, text=True, timeout=0.8)
-                if rver.returncode != 0:
-                    self._show_error("错误", f"Python无法执行: {py}")
+                # 解释器指纹（路径/大小/mtime）未变化时复用上次校验结果，跳过 --version 探测
+                from core.interpreter_cache import validate_interpreter
+                ok, info = validate_interpreter(py)
+                if not ok:
+                    self._show_error("错误", info)
                     return
             except Exception as _e:
                 self._show_error("错误", str(_e))
@@ -157,6 +186,7 @@ class ProcessManager:
 
     def on_start_success(self): #
         self.app._launching = False
+        self._auto_restarting = False
         try:
             self.app.logger.info("ComfyUI 启动成功")
         except Exception:
@@ -171,29 +201,10 @@ class ProcessManager:
             except Exception:
                 mode = "default"
         if mode != "none":
-            def _open_when_ready():
-                try:
-                    import time
-                    deadline = time.time() + 120.0
-                    while time.time() < deadline:
-                        ready = False
-                        try:
-                            ready = self._is_http_reachable()
-                        except Exception:
-                            ready = False
-                        if ready:
-                            try:
-                                self.app.ui_post(self.app.open_comfyui_web)
-                            except Exception:
-                                pass
-                            return
-                        time.sleep(0.25)
-                except Exception:
-                    pass
-            try:
-                threading.Thread(target=_open_when_ready, daemon=True).start()
-            except Exception:
-                pass
+            # 由监督器的就绪探测触发打开网页，避免单独的轮询线程
+            self._open_browser_on_ready = True
+            if self.supervisor.state == STATE_READY:
+                self._open_browser_if_pending()
 
     def on_start_failed(self, error): #
         self.app._launching = False
@@ -203,11 +214,23 @@ class ProcessManager:
             pass
         self.app.big_btn.set_state("idle")
         self.app.big_btn.set_text("一键启动")
+        rc = None
+        try:
+            rc = self.comfyui_process.poll() if self.comfyui_process else None
+        except Exception:
+            pass
         self.comfyui_process = None
+        # 自动重启的这次启动同样失败时，计入策略继续退避（或判定崩溃循环）
+        if self._auto_restarting:
+            self._auto_restarting = False
+            self._maybe_schedule_restart({"returncode": rc if rc is not None else -1, "uptime": 0.0})
 
     def stop_comfyui(self): #
+        self._user_stop_requested = True
+        self._cancel_pending_restart()
         def _bg():
             try:
+                self.supervisor.mark_stopping()
                 from core.runner_stop import stop as run_stop
                 killed = False
                 try:
@@ -247,6 +270,9 @@ class ProcessManager:
             from core.runner_stop import stop as run_stop
         except Exception:
             return False
+        self._user_stop_requested = True
+        self._cancel_pending_restart()
+        self.supervisor.mark_stopping()
         try:
             if not (self.comfyui_process and self.comfyui_process.poll() is None):
                 try:
@@ -265,7 +291,7 @@ class ProcessManager:
                         still = True
                     else:
                         from core.probe import is_http_reachable
-                        still = is_http_reachable(self.app)
+                        still = is_http_reachable(self.app, timeout=UI_PROBE_TIMEOUT)
                 except Exception:
                     still = False
                 if not still:
@@ -279,7 +305,7 @@ class ProcessManager:
                 running = True
             else:
                 from core.probe import is_http_reachable
-                running = is_http_reachable(self.app)
+                running = is_http_reachable(self.app, timeout=UI_PROBE_TIMEOUT)
             if not running:
                 self.on_process_ended()
             else:
@@ -304,204 +330,49 @@ class ProcessManager:
                 pass
 
     def _find_pids_by_port_safe(self, port_str): #
-        # 解析端口并通过 psutil 或 netstat 查找 PID 列表
+        # 委托到 core.probe，共享端口索引快照
         try:
-            port = int(port_str)
+            return find_pids_by_port_safe(port_str)
         except Exception:
             return []
-        # 优先使用 psutil
-        if psutil:
-            try:
-                pids = set()
-                try:
-                    for conn in psutil.net_connections(kind='inet'): #
-                        try:
-                            if conn.laddr and conn.laddr.port == port:
-                                if conn.status in ('LISTEN', 'ESTABLISHED'):  # 监听或连接中
-                                    if conn.pid:
-                                        pids.add(conn.pid)
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-                if pids:
-                    return list(pids)
-            except Exception:
-                pass
-        # 回退到 netstat 解析（Windows）
-        try:
-            import subprocess
-            import re
-            cmd = ["netstat", "-ano"]
-            # 使用系统首选编码并忽略解码错误，且隐藏子进程窗口
-            preferred_enc = locale.getpreferredencoding(False) or "utf-8" #
-            r = run_hidden(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding=preferred_enc,
-                errors="ignore",
-            )
-            if r.returncode == 0 and r.stdout:
-                pids = set()
-                # 只认 TCP 的 LISTENING 或 ESTABLISHED，避免 TIME_WAIT/Close 等状态误判
-                pattern_tcp = re.compile( #
-                    rf"^\s*TCP\s+\S+:{port}\s+\S+:\S+\s+(LISTENING|ESTABLISHED)\s+(\d+)\s*$",
-                    re.IGNORECASE,
-                )
-                for line in r.stdout.splitlines():
-                    m = pattern_tcp.match(line)
-                    if m:
-                        try:
-                            pids.add(int(m.group(2)))
-                        except Exception:
-                            pass
-                # 不再统计 UDP（ComfyUI 使用 HTTP/TCP），以减少误判
-                return list(pids)
-        except Exception:
-            pass
-        return []
-
-    def _is_comfyui_pid(self, pid: int) -> bool: # **修正后的代码块**
-        # 通过 cmdline/exe/cwd 多重特征判断是否为 ComfyUI 相关进程
-        if psutil:
-            try:
-                p = psutil.Process(pid) #
-                # 成功获取进程对象 p，在其内部安全获取属性
-                try:
-                    cmdline = " ".join(p.cmdline()).lower()
-                except Exception:
-                    cmdline = ""
-                try:
-                    exe = (p.exe() or "").lower()
-                except Exception:
-                    exe = ""
-                try:
-                    cwd = (p.cwd() or "").lower()
-                except Exception:
-                    cwd = ""
-
-                # 关键特征：main.py、comfyui 字样。
-                if ("main.py" in cmdline and ("comfyui" in cmdline or "windows-standalone-build" in cmdline)):
-                    return True
-                if ("comfyui" in cmdline or "comfyui" in exe or "comfyui" in cwd):
-                    return True
-            except (psutil.NoSuchProcess, Exception):
-                # 进程不存在或获取信息失败，跳过 psutil 检查
-                pass
 
-        # 回退：使用 wmic 获取命令行（在部分 Windows 环境可用）
-        if os.name == 'nt':
-            try:
-                # 首次检测 wmic 是否存在并缓存结果；不存在则不再尝试，避免日志噪音
-                try:
-                    if getattr(self.app, "_wmic_available", None) is None:
-                        # 确保 app 对象上有 _wmic_available 属性
-                        self.app._wmic_available = bool(shutil.which("wmic")) #
-                except Exception:
-                    self.app._wmic_available = False
-
-                if self.app._wmic_available:
-                    # 避免路径访问异常导致整个方法中断
-                    try:
-                        paths = self.app.config.get("paths", {})
-                        base = Path(paths.get("comfyui_root") or ".").resolve()
-                        comfy_root = str((base / "ComfyUI").resolve()).lower()
-                    except Exception:
-                        comfy_root = None
-                        
-                    preferred_enc = locale.getpreferredencoding(False) or "utf-8" #
-                    try:
-                        r = run_hidden([ #
-                            "wmic", "process", "where", f"ProcessId={pid}", "get", "CommandLine", "/format:list"
-                        ], capture_output=True, text=True, encoding=preferred_enc, errors="ignore")
-                        if r.returncode == 0 and r.stdout:
-                            out = r.stdout.lower()
-                            if ("comfyui" in out) or ("main.py" in out) or (comfy_root and comfy_root in out):
-                                return True
-                    except FileNotFoundError:
-                        # 运行期确认 wmic 不存在，则标记为不可用，后续不再尝试
-                        self.app._wmic_available = False
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-
-        return False
+    def _is_comfyui_pid(self, pid: int) -> bool: #
+        # 委托到 core.probe，共享 (pid, create_time) 判定缓存
+        try:
+            return is_comfyui_pid(self.app, pid)
+        except Exception:
+            return False
 
     def _kill_pids(self, pids): #
-        # 优先使用 psutil 优雅终止，失败则回退到 taskkill
+        # 与停止流程共用 core.kill.kill_pids：连同后代进程终止、按停止时间线升级为强杀并记录统计
         try:
             self.app.logger.info("准备终止进程列表: %s", ", ".join(map(str, pids)))
         except Exception:
             pass
-        killed_any = False
-        if psutil:
-            try:
-                procs_to_wait = []
-                for pid in pids:
-                    try:
-                        p = psutil.Process(pid) #
-                        p.terminate()
-                        procs_to_wait.append(p)
-                        try:
-                            self.app.logger.info("发送terminate信号: PID=%s", str(pid))
-                        except Exception:
-                            pass
-                    except Exception:
-                        pass
-                if procs_to_wait:
-                    # 批量等待
-                    gone, alive = psutil.wait_procs(procs_to_wait, timeout=3) #
-                    if gone:
-                        killed_any = True
-                        try:
-                            self.app.logger.info("psutil 等待结束：已终止 %d 个进程", len(gone))
-                        except Exception:
-                            pass
-                    # 对未结束的进程发送 SIGKILL (kill)
-                    for p in alive:
-                        try:
-                            p.kill()
-                            killed_any = True
-                        except Exception:
-                            pass
-            except Exception:
-                pass
-        # 对未结束的进程使用 taskkill 强制终止（Windows）
-        if os.name == 'nt':
-            try:
-                for pid in pids:
-                    run_hidden(["taskkill", "/PID", str(pid), "/T", "/F"], capture_output=True, text=True) #
-                killed_any = True
-                try:
-                    self.app.logger.info("taskkill 强制终止：%s", ", ".join(map(str, pids)))
-                except Exception:
-                    pass
-            except Exception:
-                pass
-        if not killed_any:
+        try:
+            kill_pids(self.app, list(pids))
+        except RuntimeError:
             try:
                 self.app.logger.error("无法终止目标进程：%s", ", ".join(map(str, pids)))
             except Exception:
                 pass
-            raise RuntimeError("无法终止目标进程")
+            raise
 
-    def _is_http_reachable(self) -> bool: #
+    def _is_http_reachable(self, timeout: float = None) -> bool: #
         try:
             from core.probe import is_http_reachable
-            return is_http_reachable(self.app)
+            return is_http_reachable(self.app, timeout=timeout)
         except Exception:
             return False
 
     def _refresh_running_status(self): #
-        # 根据进程与端口探测结果统一刷新按钮状态
+        # 根据进程与端口探测结果统一刷新按钮状态（界面线程调用，探测超时受 UI_PROBE_TIMEOUT 限制）
         try:
             running = False
             if self.comfyui_process and self.comfyui_process.poll() is None:
                 running = True
             else:
-                running = is_http_reachable(self.app)
+                running = is_http_reachable(self.app, timeout=UI_PROBE_TIMEOUT)
             if running:
                 self.app.big_btn.set_state("running")
                 self.app.big_btn.set_text("停止")
@@ -551,6 +422,163 @@ class ProcessManager:
         from core.runner import monitor
         monitor(self.app, self)
 
+    def probe_stats(self) -> dict:
+        """当前端口的健康探测统计（成功/失败次数、p50/p95 延迟、当前超时）。"""
+        try:
+            from core.health_probe import get_prober
+            port = int((self.app.custom_port.get() or "8188").strip())
+            return get_prober().stats(port)
+        except Exception:
+            return {}
+
+    def status_snapshot(self) -> dict:
+        """主实例状态快照：监督器状态、PID、运行时长、上次退出码与探测延迟统计。"""
+        proc = self.comfyui_process
+        try:
+            pid = proc.pid if proc is not None and proc.poll() is None else None
+        except Exception:
+            pid = None
+        try:
+            port = (self.app.custom_port.get() or "8188").strip()
+        except Exception:
+            port = "8188"
+        sup = self.supervisor
+        return {
+            "state": sup.state,
+            "running": pid is not None or sup.state == STATE_READY,
+            "port": port,
+            "pid": pid,
+            "uptime": sup.uptime(),
+            "last_exit_code": sup.last_exit_code,
+            "probe": self.probe_stats(),
+            "auto_restart_tripped": self.restart_policy.tripped,
+            "instances": self.instances.statuses(),
+        }
+
+    def _log_probe_stats(self):
+        try:
+            from core.health_probe import get_prober
+            port = int((self.app.custom_port.get() or "8188").strip())
+            self.app.logger.info("健康探测统计: %s", get_prober().format_stats(port))
+        except Exception:
+            pass
+
+    def _log_crash_traceback(self, info):
+        try:
+            cap = self.output_capture
+            rc = (info or {}).get("returncode")
+            if cap and rc not in (0, None):
+                tb = cap.last_traceback()
+                if tb:
+                    self.app.logger.error("ComfyUI 异常退出 rc=%s:\n%s", rc, tb)
+        except Exception:
+            pass
+
+    def _cancel_pending_restart(self):
+        aid = self._restart_after_id
+        self._restart_after_id = None
+        if aid is not None:
+            try:
+                self.app.root.after_cancel(aid)
+            except Exception:
+                pass
+
+    def _maybe_schedule_restart(self, info):
+        info = info or {}
+        try:
+            action, delay = self.restart_policy.on_exit(
+                info.get("returncode"), info.get("uptime"), user_stopped=self._user_stop_requested
+            )
+        except Exception:
+            return
+        if action == ACTION_CRASH_LOOP:
+            try:
+                self.app.logger.error("ComfyUI 短时间内反复退出，判定为崩溃循环，已停止自动重启")
+            except Exception:
+                pass
+            try:
+                self._show_error("自动重启已停止", "ComfyUI 在短时间内多次异常退出，已停止自动重启，请检查日志。")
+            except Exception:
+                pass
+            return
+        if action != ACTION_RESTART:
+            return
+        try:
+            self.app.logger.warning("ComfyUI 异常退出 rc=%s，%.1fs 后自动重启", info.get("returncode"), delay)
+        except Exception:
+            pass
+        try:
+            self.app.big_btn.set_text(f"{int(delay)}s 后重启…")
+        except Exception:
+            pass
+        self._cancel_pending_restart()
+        try:
+            self._restart_after_id = self.app.root.after(int(delay * 1000), self._auto_restart)
+        except Exception:
+            pass
+
+    def _auto_restart(self):
+        self._restart_after_id = None
+        if self._user_stop_requested or getattr(self.app, '_launching', False):
+            return
+        try:
+            if self.comfyui_process and self.comfyui_process.poll() is None:
+                return
+            if is_http_reachable(self.app, timeout=UI_PROBE_TIMEOUT):
+                return
+        except Exception:
+            pass
+        try:
+            self.app.logger.info("执行自动重启")
+        except Exception:
+            pass
+        self._auto_restarting = True
+        self.start_comfyui(auto_restart=True)
+
+    def _open_browser_if_pending(self):
+        if not self._open_browser_on_ready:
+            return
+        self._open_browser_on_ready = False
+        try:
+            self.app.ui_post(self.app.open_comfyui_web)
+        except Exception:
+            pass
+
+    def _on_supervisor_state(self, state, info):
+        # 监督器回调位于后台线程，统一投递到界面线程处理
+        def _ui():
+            try:
+                if state == STATE_READY:
+                    self._log_probe_stats()
+                    if getattr(self.app, '_launching', False):
+                        return
+                    self.app.big_btn.set_state("running")
+                    self.app.big_btn.set_text("停止")
+                    self._open_browser_if_pending()
+                elif state == STATE_STOPPING:
+                    self._open_browser_on_ready = False
+                    self.app.big_btn.set_state("starting")
+                    self.app.big_btn.set_text("停止中…")
+                elif state == STATE_EXITED:
+                    self._log_probe_stats()
+                    self._log_crash_traceback(info)
+                    # 启动窗口期内的退出由 runner_start 判定为启动失败
+                    if getattr(self.app, '_launching', False):
+                        return
+                    self.on_process_ended()
+                    self._maybe_schedule_restart(info)
+                elif state == STATE_IDLE:
+                    if self.comfyui_process and self.comfyui_process.poll() is None:
+                        return
+                    self.app.big_btn.set_state("idle")
+                    self.app.big_btn.set_text("一键启动")
+            except Exception:
+                pass
+        try:
+            self.app.root.after(0, _ui)
+        except Exception:
+            pass
+
     def on_process_ended(self): #
         try:
             self.app.logger.info("ComfyUI 进程结束")
@@ -559,7 +587,7 @@ class ProcessManager:
         self.comfyui_process = None
         # 根据端口探测决定显示“停止”或“一键启动”
         try:
-            if is_http_reachable(self.app):
+            if is_http_reachable(self.app, timeout=UI_PROBE_TIMEOUT):
                 self.app.big_btn.set_state("running")
                 self.app.big_btn.set_text("停止")
             else:
@@ -587,27 +615,23 @@ class ProcessManager:
                     pass
         except Exception:
             pass
-        # 2) 通过进程枚举查找（可能是不同端口或手动启动）
-        if psutil:
-            try:
-                for p in psutil.process_iter(attrs=["pid"]): #
-                    pid = p.info.get("pid")
-                    if not pid:
-                        continue
-                    try:
-                        if is_comfyui_pid(self.app, int(pid)):
-                            pids.add(int(pid))
-                    except Exception:
-                        pass
-            except Exception:
-                # 若无 psutil，可忽略此步骤（已有端口方法与回退的 taskkill）
-                pass
+        # 2) 通过进程枚举查找（可能是不同端口或手动启动）；单次遍历并复用判定缓存
+        try:
+            pids.update(find_comfyui_pids(self.app))
+        except Exception:
+            # 若无 psutil，可忽略此步骤（已有端口方法与回退的 taskkill）
+            pass
         # 移除自身跟踪的句柄，避免重复
         try:
             if self.comfyui_process and self.comfyui_process.poll() is None:
                 pids.discard(self.comfyui_process.pid)
         except Exception:
             pass
+        # 附加实例由各自的监督器管理，不参与主实例的全局关闭
+        try:
+            pids.difference_update(self.instances.managed_pids())
+        except Exception:
+            pass
         if not pids:
             try:
                 port = (self.app.custom_port.get() or "8188").strip()
@@ -0,0 +1,121 @@
+"""
+GitHub Releases 的磁盘缓存。
+
+按 owner/repo 把全部 release（精简字段）连同第一页的 ETag / Last-Modified 保存到
+launcher/releases_cache.json；刷新时发送条件请求（If-None-Match / If-Modified-Since），
+304 不计入未认证 API 的速率限制；有变化时按 per_page=100 翻页直到取全。
+离线、限流或请求失败时直接返回旧数据。
+"""
+
+import json
+import time
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from utils.json_cache import JsonStore
+
+PER_PAGE = 100
+MAX_PAGES = 30
+DEFAULT_MAX_AGE = 600
+REQUEST_TIMEOUT = 10
+
+SOURCE_CACHE = "cache"
+SOURCE_NOT_MODIFIED = "not_modified"
+SOURCE_NETWORK = "network"
+SOURCE_STALE = "stale"
+
+_FIELDS = ("tag_name", "name", "prerelease", "draft", "target_commitish", "created_at", "published_at")
+
+_store = JsonStore("releases_cache.json")
+
+
+def slim(release: dict) -> dict:
+    return {k: release.get(k) for k in _FIELDS if k in release}
+
+
+def page_url(url: str, page: int) -> str:
+    sep = "&" if "?" in url else "?"
+    return f"{url}{sep}per_page={PER_PAGE}&page={int(page)}"
+
+
+def entry(key: str):
+    with _store.lock:
+        hit = _store.data().get(key)
+    return hit if isinstance(hit, dict) and isinstance(hit.get("releases"), list) else None
+
+
+def _request(url: str, headers=None):
+    h = {"Accept": "application/vnd.github+json", "User-Agent": "ComfyUI-Launcher"}
+    h.update(headers or {})
+    return urlopen(Request(url, headers=h), timeout=REQUEST_TIMEOUT)
+
+
+def load(key: str, url: str, max_age: float = DEFAULT_MAX_AGE):
+    """返回 (releases, 来源)。
+
+    max_age 秒内取到过的数据直接返回（来源 cache）；否则发送条件请求：
+    304 -> not_modified，200 -> 翻页取全后 network，失败 -> 有旧数据时 stale，否则返回空列表与空来源；
+    第一页之后的某页失败时返回新取到的页并接上旧数据（stale），不刷新缓存时间。
+    """
+    old = entry(key)
+    if old is not None and max_age and (time.time() - float(old.get("fetched_at", 0))) < max_age:
+        return old["releases"], SOURCE_CACHE
+    headers = {}
+    if old is not None:
+        if old.get("etag"):
+            headers["If-None-Match"] = old["etag"]
+        if old.get("last_modified"):
+            headers["If-Modified-Since"] = old["last_modified"]
+    try:
+        with _request(page_url(url, 1), headers) as resp:
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            first = json.loads(resp.read().decode("utf-8"))
+    except HTTPError as e:
+        if e.code == 304 and old is not None:
+            with _store.lock:
+                old["fetched_at"] = time.time()
+                _store.save()
+            return old["releases"], SOURCE_NOT_MODIFIED
+        return (old["releases"], SOURCE_STALE) if old is not None else ([], "")
+    except Exception:
+        return (old["releases"], SOURCE_STALE) if old is not None else ([], "")
+    if not isinstance(first, list):
+        return (old["releases"], SOURCE_STALE) if old is not None else ([], "")
+    releases = [slim(r) for r in first if isinstance(r, dict)]
+    page = 1
+    batch = first
+    complete = True
+    while len(batch) >= PER_PAGE and page < MAX_PAGES:
+        page += 1
+        try:
+            with _request(page_url(url, page)) as resp:
+                batch = json.loads(resp.read().decode("utf-8"))
+        except Exception:
+            complete = False
+            break
+        if not isinstance(batch, list):
+            complete = False
+            break
+        releases.extend(slim(r) for r in batch if isinstance(r, dict))
+    if not complete:
+        # 后续页失败：已取到的新页之后接上旧数据中其余的 release；不更新缓存条目（保留旧的时间与校验头），
+        # 下次刷新重新取全。无旧数据时只保存不带校验头、已过期的条目，供离线时使用
+        seen = {r.get("tag_name") for r in releases}
+        if old is not None:
+            releases.extend(r for r in old["releases"] if r.get("tag_name") not in seen)
+        else:
+            with _store.lock:
+                _store.data()[key] = {"url": url, "etag": None, "last_modified": None, "fetched_at": 0, "releases": releases}
+                _store.save()
+        return releases, SOURCE_STALE
+    with _store.lock:
+        _store.data()[key] = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+            "releases": releases,
+        }
+        _store.save()
+    return releases, SOURCE_NETWORK
@@ -0,0 +1,127 @@
+"""
+ComfyUI 子进程自动重启策略。
+
+可选开启（launch_options.auto_restart）：子进程非正常退出后按指数退避重启；
+若在 crash_loop_window_seconds 内退出达到 crash_loop_exits 次，判定为崩溃循环并停止重启。
+每次退出与决策写入 launcher/restart_history.json，便于事后排查；
+用户手动启动会写入一条 reset 记录，其之前的退出不再计入崩溃循环判定。
+"""
+
+import threading
+import time
+from pathlib import Path
+
+from utils.json_cache import launcher_path, read_json, write_json
+
+DEFAULT_BACKOFF = 2.0
+DEFAULT_BACKOFF_MAX = 60.0
+DEFAULT_CRASH_LOOP_EXITS = 5
+DEFAULT_CRASH_LOOP_WINDOW = 300.0
+HISTORY_MAX = 200
+
+ACTION_RESTART = "restart"
+ACTION_CRASH_LOOP = "crash_loop"
+ACTION_NONE = "none"
+ACTION_RESET = "reset"
+
+
+def _history_file() -> Path:
+    return launcher_path("restart_history.json")
+
+
+class RestartPolicy:
+    def __init__(self, app, history_file=None):
+        self.app = app
+        self._history_file = Path(history_file) if history_file else None
+        self._lock = threading.Lock()
+        self._history = None
+        self._attempt = 0
+        self.tripped = False
+
+    # ---------- 配置 ----------
+    def _opts(self) -> dict:
+        try:
+            return self.app.config.get("launch_options", {}) or {}
+        except Exception:
+            return {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._opts().get("auto_restart", False))
+
+    def settings(self) -> dict:
+        opts = self._opts()
+
+        def _num(key, default, cast=float):
+            try:
+                return max(0, cast(opts.get(key, default)))
+            except Exception:
+                return default
+        return {
+            "backoff": _num("restart_backoff_seconds", DEFAULT_BACKOFF),
+            "backoff_max": _num("restart_backoff_max_seconds", DEFAULT_BACKOFF_MAX),
+            "crash_loop_exits": max(1, _num("crash_loop_exits", DEFAULT_CRASH_LOOP_EXITS, int)),
+            "crash_loop_window": _num("crash_loop_window_seconds", DEFAULT_CRASH_LOOP_WINDOW),
+        }
+
+    # ---------- 历史 ----------
+    def _file(self) -> Path:
+        return self._history_file or _history_file()
+
+    def history(self) -> list:
+        with self._lock:
+            if self._history is None:
+                data = read_json(self._file())
+                self._history = data[-HISTORY_MAX:] if isinstance(data, list) else []
+            return list(self._history)
+
+    def _record(self, entry: dict):
+        self.history()
+        with self._lock:
+            self._history.append(entry)
+            del self._history[:-HISTORY_MAX]
+            write_json(self._file(), self._history, indent=2)
+
+    # ---------- 决策 ----------
+    def reset(self, now: float = None):
+        """用户手动启动/停止后清除退避计数与崩溃循环标记，此前的退出不再计入崩溃循环窗口。"""
+        self._attempt = 0
+        self.tripped = False
+        if self.enabled:
+            self._record({"ts": time.time() if now is None else now, "action": ACTION_RESET})
+
+    def _last_reset(self) -> float:
+        for h in reversed(self.history()):
+            if h.get("action") == ACTION_RESET:
+                return h.get("ts", 0)
+        return 0
+
+    def on_exit(self, returncode, uptime=None, user_stopped: bool = False, now: float = None) -> tuple:
+        """子进程退出时调用，返回 (action, delay)。
+
+        action 为 restart（delay 秒后重启）、crash_loop（已判定崩溃循环）或 none。
+        """
+        now = time.time() if now is None else now
+        entry = {"ts": now, "returncode": returncode, "uptime": round(uptime, 1) if uptime else None}
+        if user_stopped or returncode == 0 or not self.enabled or self.tripped:
+            reason = "user_stop" if user_stopped else ("clean_exit" if returncode == 0 else ("disabled" if not self.enabled else "tripped"))
+            entry.update(action=ACTION_NONE, reason=reason)
+            if self.enabled:
+                self._record(entry)
+            return ACTION_NONE, 0.0
+        s = self.settings()
+        # 稳定运行超过观察窗口后，退避从头计算
+        if uptime is not None and uptime >= s["crash_loop_window"]:
+            self._attempt = 0
+        window_start = max(now - s["crash_loop_window"], self._last_reset())
+        recent = [h for h in self.history() if h.get("ts", 0) >= window_start and h.get("action") in (ACTION_RESTART, ACTION_CRASH_LOOP)]
+        if len(recent) + 1 >= s["crash_loop_exits"]:
+            self.tripped = True
+            entry.update(action=ACTION_CRASH_LOOP, exits_in_window=len(recent) + 1)
+            self._record(entry)
+            return ACTION_CRASH_LOOP, 0.0
+        delay = min(s["backoff"] * (2 ** self._attempt), s["backoff_max"])
+        self._attempt += 1
+        entry.update(action=ACTION_RESTART, delay=delay, attempt=self._attempt)
+        self._record(entry)
+        return ACTION_RESTART, delay
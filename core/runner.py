@@ -1,13 +1,6 @@
-import threading
-
 def monitor(app, process_manager):
-    while True:
-        try:
-            if getattr(app, "_shutting_down", False):
-                break
-            if process_manager.comfyui_process and process_manager.comfyui_process.poll() is not None:
-                process_manager.comfyui_process = None
-            process_manager.refresh_running_status_async()
-            threading.Event().wait(2)
-        except Exception:
-            break
\ No newline at end of file
+    # 由监督器常驻线程阻塞等待子进程退出，不再每 2 秒轮询探测
+    try:
+        process_manager.supervisor.run()
+    except Exception:
+        pass
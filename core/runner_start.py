@@ -2,6 +2,69 @@ import os
 import threading
 import subprocess
 
+# 启动后判定成功的宽限期（秒）；输出捕获模式下就绪标记或进程退出会提前结束等待
+STARTUP_GRACE = 2.0
+
+
+def _capture_enabled(app) -> bool:
+    try:
+        return bool(app.config.get("launch_options", {}).get("capture_output", False))
+    except Exception:
+        return False
+
+
+def _start_captured(app, pm, cmd, env, run_cwd):
+    # 捕获子进程输出：就绪标记即刻触发就绪，异常回溯即刻记录
+    from core.output_capture import OutputCapture
+    env = dict(env)
+    env.setdefault("PYTHONUNBUFFERED", "1")
+    env.setdefault("PYTHONIOENCODING", "utf-8")
+    from core.kill import popen_group_kwargs
+    kwargs = popen_group_kwargs()
+    if os.name == 'nt':
+        kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+    proc = subprocess.Popen(
+        cmd, env=env, cwd=run_cwd,
+        stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        **kwargs,
+    )
+    pm.comfyui_process = proc
+    wake = threading.Event()
+
+    def _on_ready(line):
+        try:
+            app.logger.info("检测到就绪标记: %s", line)
+        except Exception:
+            pass
+        pm.supervisor.mark_ready(marker=line)
+        wake.set()
+
+    def _on_traceback(line):
+        try:
+            app.logger.warning("ComfyUI 输出异常回溯: PID=%s", proc.pid)
+        except Exception:
+            pass
+
+    cap = OutputCapture(proc.stdout, on_ready=_on_ready, on_traceback=_on_traceback, on_closed=wake.set)
+    buf = getattr(pm, "console_buffer", None)
+    if buf is not None:
+        buf.append(f"==== 启动 ComfyUI (PID {proc.pid}) ====")
+        cap.add_listener(buf.append)
+    pm.output_capture = cap
+    # 就绪以输出标记为准；ComfyUI 版本或日志格式变化导致标记缺失时，由低频 HTTP 探测兜底
+    from core.supervisor import READY_FALLBACK_INTERVAL
+    pm.supervisor.attach(proc, ready_interval=READY_FALLBACK_INTERVAL)
+    cap.start()
+    wake.wait(STARTUP_GRACE)
+    if cap.closed_event.is_set():
+        # 输出流关闭时子进程通常已退出，稍等片刻取得返回码
+        try:
+            proc.wait(timeout=1)
+        except Exception:
+            pass
+    return proc, cap
+
+
 def start(app, pm, cmd, env, run_cwd):
     app.big_btn.set_state("starting")
     app.big_btn.set_text("启动中…")
@@ -13,24 +76,41 @@ def start(app, pm, cmd, env, run_cwd):
                 app.logger.info("启动工作目录(cwd): %s", run_cwd)
             except Exception:
                 pass
-            if os.name == 'nt':
-                si = subprocess.STARTUPINFO()
-                si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                si.wShowWindow = 1
-                pm.comfyui_process = subprocess.Popen(
-                    cmd, env=env, cwd=run_cwd,
-                    creationflags=subprocess.CREATE_NEW_CONSOLE,
-                    startupinfo=si,
-                )
+            cap = None
+            if _capture_enabled(app):
+                _proc, cap = _start_captured(app, pm, cmd, env, run_cwd)
             else:
-                pm.comfyui_process = subprocess.Popen(cmd, env=env, cwd=run_cwd)
-            threading.Event().wait(2)
+                if os.name == 'nt':
+                    si = subprocess.STARTUPINFO()
+                    si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+                    si.wShowWindow = 1
+                    pm.comfyui_process = subprocess.Popen(
+                        cmd, env=env, cwd=run_cwd,
+                        creationflags=subprocess.CREATE_NEW_CONSOLE,
+                        startupinfo=si,
+                    )
+                else:
+                    # 独立会话/进程组，停止时可整组终止
+                    from core.kill import popen_group_kwargs
+                    pm.comfyui_process = subprocess.Popen(cmd, env=env, cwd=run_cwd, **popen_group_kwargs())
+                try:
+                    pm.supervisor.attach(pm.comfyui_process)
+                except Exception:
+                    pass
+                threading.Event().wait(STARTUP_GRACE)
             if pm.comfyui_process.poll() is None:
                 app.root.after(0, pm.on_start_success)
             else:
-                app.root.after(0, lambda: pm.on_start_failed("进程退出"))
+                msg = "进程退出"
+                try:
+                    detail = (cap.last_traceback() or "\n".join(cap.tail(5))) if cap else ""
+                    if detail:
+                        msg = f"{msg}\n{detail}"
+                except Exception:
+                    pass
+                app.root.after(0, lambda m=msg: pm.on_start_failed(m))
         except Exception as e:
             msg = str(e)
             app.root.after(0, lambda m=msg: pm.on_start_failed(m))
 
-    threading.Thread(target=worker, daemon=True).start()
\ No newline at end of file
+    threading.Thread(target=worker, daemon=True).start()
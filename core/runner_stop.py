@@ -1,12 +1,36 @@
 import os
 import subprocess
+import time
 from utils.common import run_hidden
+from core.kill import terminate_tree, stop_timeline, record_stop
 
 try:
     import psutil
 except ImportError:
     psutil = None
 
+def _report_error(app, msg: str):
+    """界面下弹窗提示；无界面（headless 等提供 report_error 回调）时交给回调输出。"""
+    try:
+        app.logger.error(msg)
+    except Exception:
+        pass
+    report = getattr(app, "report_error", None)
+    if callable(report):
+        try:
+            report(msg)
+        except Exception:
+            pass
+        return
+    root = getattr(app, "root", None)
+    if root is None:
+        return
+    try:
+        root.after(0, lambda: __import__('tkinter').messagebox.showerror("错误", msg))
+    except Exception:
+        pass
+
+
 def stop(app, pm):
     try:
         app.logger.info("用户点击停止：开始关闭 ComfyUI")
@@ -14,9 +38,14 @@ def stop(app, pm):
         pass
     app._launching = False
     killed = False
+    escalated = False
+    method = "none"
+    started = time.monotonic()
+    grace, _kill_wait = stop_timeline(app)
     if getattr(pm, "comfyui_process", None) and pm.comfyui_process.poll() is None:
         pid_str = str(pm.comfyui_process.pid)
         if os.name == 'nt':
+            method = "taskkill"
             try:
                 r_soft = run_hidden(["taskkill", "/PID", pid_str, "/T"], capture_output=True, text=True)
                 try:
@@ -36,33 +65,37 @@ def stop(app, pm):
                     else:
                         try:
                             pm.comfyui_process.terminate()
-                            pm.comfyui_process.wait(timeout=5)
+                            pm.comfyui_process.wait(timeout=grace)
                             killed = True
                         except subprocess.TimeoutExpired:
                             pm.comfyui_process.kill()
                             killed = True
                         except Exception as e3:
-                            app.root.after(0, lambda: __import__('tkinter').messagebox.showerror("错误", f"停止失败: {e3}"))
+                            _report_error(app, f"停止失败: {e3}")
             except Exception:
                 try:
                     pm.comfyui_process.terminate()
-                    pm.comfyui_process.wait(timeout=5)
+                    pm.comfyui_process.wait(timeout=grace)
                     killed = True
                 except subprocess.TimeoutExpired:
                     pm.comfyui_process.kill()
                     killed = True
                 except Exception as e2:
-                    app.root.after(0, lambda: __import__('tkinter').messagebox.showerror("错误", f"停止失败: {e2}"))
+                    _report_error(app, f"停止失败: {e2}")
         else:
+            # 子进程以独立会话启动：整组 SIGTERM，超时后 SIGKILL，连同自定义节点派生的子进程一并回收
             try:
-                pm.comfyui_process.terminate()
-                pm.comfyui_process.wait(timeout=5)
-                killed = True
-            except subprocess.TimeoutExpired:
-                pm.comfyui_process.kill()
-                killed = True
+                killed, escalated = terminate_tree(app, pm.comfyui_process)
+                method = "group"
             except Exception as e:
-                app.root.after(0, lambda: __import__('tkinter').messagebox.showerror("错误", f"停止失败: {e}"))
+                _report_error(app, f"停止失败: {e}")
+    if killed:
+        # 跟踪进程已终止，后续端口查询需重新读取套接字表
+        try:
+            from core.probe import invalidate_port_index
+            invalidate_port_index()
+        except Exception:
+            pass
     if not killed:
         try:
             port = (app.custom_port.get() or "8188").strip()
@@ -99,6 +132,8 @@ def stop(app, pm):
                     pass
         except Exception:
             pass
+    if method != "none":
+        record_stop(app, started, method, escalated, killed)
     try:
         app.logger.info("停止流程完成: killed=%s", killed)
     except Exception:
@@ -0,0 +1,280 @@
+"""
+后台任务调度器。
+
+统一承载版本刷新、Git 信息、公告、更新等后台任务，取代各处临时创建的线程与线程池：
+- 有界线程池：工作线程按需创建，空闲一段时间后退出；
+- 单飞（single-flight）：相同 key 的任务在排队或执行期间只保留一份，重复提交返回同一个 Job；
+- 优先级：数值越小越先执行，界面可见的信息（PRIORITY_UI）优先于公告等后台任务；
+- 预留：非界面任务最多同时占用 max_workers - ui_reserved 个线程，
+  即使 fetch/pip 等长任务占满其余线程，界面任务也不必排在它们之后；
+- 取消：排队中的任务取消后不再执行，执行中的任务可通过 current_job().cancelled 自行检查；
+- 计时：每个任务记录排队与执行耗时，最近的记录可通过 history() 查看。
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+
+PRIORITY_UI = 0
+PRIORITY_NORMAL = 10
+PRIORITY_BACKGROUND = 20
+
+DEFAULT_MAX_WORKERS = 4
+# 为 PRIORITY_UI 任务保留的线程数
+DEFAULT_UI_RESERVED = 1
+WORKER_IDLE_SECONDS = 30.0
+HISTORY_MAX = 100
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+_local = threading.local()
+
+
+class Job:
+    def __init__(self, fn, args, kwargs, key=None, name=None, priority=PRIORITY_NORMAL):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.name = name or key or getattr(fn, "__name__", "job")
+        self.priority = priority
+        self.state = JOB_QUEUED
+        self.result = None
+        self.error = None
+        self.submitted_at = time.perf_counter()
+        self.started_at = None
+        self.finished_at = None
+        self.ui_lane = False
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+
+    # ---------- 取消 ----------
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    # ---------- 结果 ----------
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout=None) -> bool:
+        return self._done.wait(timeout)
+
+    @property
+    def queue_seconds(self):
+        if self.started_at is None:
+            return None
+        return self.started_at - self.submitted_at
+
+    @property
+    def run_seconds(self):
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def timing(self) -> dict:
+        q, r = self.queue_seconds, self.run_seconds
+        return {
+            "name": self.name,
+            "key": self.key,
+            "priority": self.priority,
+            "state": self.state,
+            "queue_ms": round(q * 1000.0, 1) if q is not None else None,
+            "run_ms": round(r * 1000.0, 1) if r is not None else None,
+            "error": str(self.error) if self.error else None,
+        }
+
+
+class JobScheduler:
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, name: str = "jobs", idle_seconds: float = WORKER_IDLE_SECONDS,
+                 ui_reserved: int = DEFAULT_UI_RESERVED):
+        self.max_workers = max(1, int(max_workers))
+        # 至少留一个线程给非界面任务
+        self.ui_reserved = max(0, min(int(ui_reserved), self.max_workers - 1))
+        self.name = name
+        self.idle_seconds = idle_seconds
+        self._cond = threading.Condition()
+        self._heap = []
+        self._seq = itertools.count()
+        self._inflight = {}
+        self._workers = 0
+        self._idle = 0
+        self._running_other = 0
+        self._shutdown = False
+        self._history = deque(maxlen=HISTORY_MAX)
+        self._logger = logging.getLogger("comfyui_launcher")
+
+    def submit(self, fn, *args, key=None, priority=PRIORITY_NORMAL, name=None, **kwargs) -> Job:
+        """提交任务；key 非空且同 key 任务仍在排队/执行时，直接返回已有 Job。"""
+        with self._cond:
+            if key is not None:
+                existing = self._inflight.get(key)
+                if existing is not None and not existing.cancelled:
+                    # 更高优先级的重复提交可提升排队中任务的优先级
+                    if existing.state == JOB_QUEUED and priority < existing.priority:
+                        existing.priority = priority
+                        heapq.heappush(self._heap, (priority, next(self._seq), existing))
+                    return existing
+            job = Job(fn, args, kwargs, key=key, name=name, priority=priority)
+            if self._shutdown:
+                job.state = JOB_CANCELLED
+                job.cancel()
+                job._done.set()
+                return job
+            if key is not None:
+                self._inflight[key] = job
+            heapq.heappush(self._heap, (priority, next(self._seq), job))
+            if self._idle == 0 and self._workers < self.max_workers:
+                self._workers += 1
+                threading.Thread(target=self._worker, name=f"{self.name}-{self._workers}", daemon=True).start()
+            else:
+                self._cond.notify()
+            return job
+
+    def get(self, key):
+        with self._cond:
+            return self._inflight.get(key)
+
+    def cancel(self, key) -> bool:
+        with self._cond:
+            job = self._inflight.get(key)
+            if job is None:
+                return False
+            job.cancel()
+            if job.state == JOB_QUEUED:
+                self._inflight.pop(key, None)
+            return True
+
+    def cancel_all(self):
+        with self._cond:
+            for _p, _s, job in self._heap:
+                job.cancel()
+            for job in self._inflight.values():
+                job.cancel()
+            self._inflight = {k: j for k, j in self._inflight.items() if j.state == JOB_RUNNING}
+
+    def shutdown(self):
+        """取消全部排队任务并让工作线程退出（执行中的任务继续跑完）。"""
+        with self._cond:
+            self._shutdown = True
+        self.cancel_all()
+        with self._cond:
+            self._cond.notify_all()
+
+    def history(self) -> list:
+        with self._cond:
+            return [j.timing() for j in self._history]
+
+    def stats(self) -> dict:
+        with self._cond:
+            queued = sum(1 for _p, _s, j in self._heap if j.state == JOB_QUEUED and not j.cancelled)
+            running = sum(1 for j in self._inflight.values() if j.state == JOB_RUNNING)
+            return {"workers": self._workers, "idle": self._idle, "queued": queued, "running_keyed": running,
+                    "running_non_ui": self._running_other}
+
+    # ---------- 工作线程 ----------
+    def _next_job(self):
+        with self._cond:
+            while True:
+                while self._heap:
+                    _p, _s, job = self._heap[0]
+                    if job.state != JOB_QUEUED:
+                        # 提升优先级时留下的旧条目
+                        heapq.heappop(self._heap)
+                        continue
+                    if job.cancelled:
+                        heapq.heappop(self._heap)
+                        self._finish_locked(job, JOB_CANCELLED)
+                        continue
+                    ui = job.priority <= PRIORITY_UI
+                    if not ui and self._running_other >= self.max_workers - self.ui_reserved:
+                        # 堆顶已是非界面任务（界面任务总排在前面），其余线程留给界面任务
+                        break
+                    heapq.heappop(self._heap)
+                    job.state = JOB_RUNNING
+                    job.ui_lane = ui
+                    if not ui:
+                        self._running_other += 1
+                    job.started_at = time.perf_counter()
+                    return job
+                if self._shutdown:
+                    self._workers -= 1
+                    return None
+                self._idle += 1
+                woke = self._cond.wait(self.idle_seconds)
+                self._idle -= 1
+                if not woke and not self._heap:
+                    self._workers -= 1
+                    return None
+
+    def _finish_locked(self, job, state):
+        job.state = state
+        job.finished_at = time.perf_counter()
+        if job.key is not None and self._inflight.get(job.key) is job:
+            self._inflight.pop(job.key, None)
+        self._history.append(job)
+        job._done.set()
+
+    def _worker(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            _local.job = job
+            state = JOB_DONE
+            try:
+                job.result = job.fn(*job.args, **job.kwargs)
+            except Exception as e:
+                job.error = e
+                state = JOB_FAILED
+                try:
+                    self._logger.exception("后台任务失败: %s", job.name)
+                except Exception:
+                    pass
+            finally:
+                _local.job = None
+            if state == JOB_DONE and job.cancelled:
+                state = JOB_CANCELLED
+            with self._cond:
+                if not job.ui_lane:
+                    self._running_other -= 1
+                    # 让因预留而等待的线程重新检查队列
+                    if self._heap:
+                        self._cond.notify()
+                self._finish_locked(job, state)
+            try:
+                self._logger.debug("后台任务 %s: %s 排队 %.1fms 执行 %.1fms", job.name, state,
+                                   (job.queue_seconds or 0) * 1000.0, (job.run_seconds or 0) * 1000.0)
+            except Exception:
+                pass
+
+
+def current_job():
+    """返回当前线程正在执行的 Job（不在调度器线程中时为 None）。"""
+    return getattr(_local, "job", None)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> JobScheduler:
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = JobScheduler()
+        return _scheduler
+
+
+def submit(fn, *args, **kwargs) -> Job:
+    return get_scheduler().submit(fn, *args, **kwargs)
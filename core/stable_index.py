@@ -0,0 +1,91 @@
+"""
+稳定版分类索引。
+
+每次 Releases 刷新后构建一次 {标签: 是否稳定} 映射（release 存在且非 prerelease/draft 即稳定，
+不在 Releases 中的标签按语义化版本规则判断），查询为 O(1)；
+{稳定标签: 提交哈希} 按 (标签引用指纹, Releases 指纹) 缓存在内存与 launcher/stable_index.json，
+指纹不变时无需 git 与网络即可得到结果。
+"""
+
+import hashlib
+import json
+import re
+import threading
+from pathlib import Path
+
+from core import tag_index as TAGS
+from utils.json_cache import JsonStore
+
+_SEMVER_RE = re.compile(r"^\d+\.\d+\.\d+(?:[+][\w.-]+)?$")
+
+_lock = threading.Lock()
+_memory = {}
+_store = JsonStore("stable_index.json")
+
+
+def semver_stable(tag: str) -> bool:
+    t = (tag or "").strip().lower()
+    if t.startswith('v'):
+        t = t[1:]
+    if any(x in t for x in ['-alpha', '-beta', '-rc', 'dev']):
+        return False
+    return bool(_SEMVER_RE.match(t))
+
+
+def release_map(releases) -> dict:
+    """{标签: 是否稳定}。"""
+    out = {}
+    for rel in releases or []:
+        try:
+            tag = str(rel.get('tag_name', '')).strip()
+        except Exception:
+            continue
+        if tag and tag not in out:
+            out[tag] = not (rel.get('prerelease', False) or rel.get('draft', False))
+    return out
+
+
+def releases_signature(rmap: dict) -> str:
+    raw = json.dumps(sorted(rmap.items()), ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def is_stable(tag: str, rmap: dict) -> bool:
+    if not tag:
+        return False
+    hit = rmap.get(tag)
+    if hit is not None:
+        return hit
+    return semver_stable(tag)
+
+
+def stable_commits(repo, load_tags, rmap: dict, rsig: str = None) -> dict:
+    """{稳定标签: 提交哈希}；load_tags() 返回 {标签: 提交哈希}，仅在缓存未命中时调用。"""
+    key = str(Path(repo).resolve())
+    sig = TAGS.refs_signature(key)
+    fingerprint = json.dumps([sig, rsig or releases_signature(rmap)])
+    with _lock:
+        hit = _memory.get(key)
+        if sig is not None and hit is not None and hit[0] == fingerprint:
+            return hit[1]
+        disk = _store.data().get(key)
+        if sig is not None and isinstance(disk, dict) and disk.get("fingerprint") == fingerprint:
+            stable = disk.get("stable") or {}
+            _memory[key] = (fingerprint, stable)
+            return stable
+    tags = load_tags() or {}
+    stable = {t: c for t, c in tags.items() if is_stable(t, rmap)}
+    if sig is not None and tags:
+        with _lock:
+            _memory[key] = (fingerprint, stable)
+            _store.data()[key] = {"fingerprint": fingerprint, "stable": stable}
+            _store.save()
+    return stable
+
+
+def invalidate(repo=None):
+    with _lock:
+        if repo is None:
+            _memory.clear()
+        else:
+            _memory.pop(str(Path(repo).resolve()), None)
@@ -0,0 +1,237 @@
+"""
+ComfyUI 子进程监督器。
+
+以单个常驻线程阻塞在 `Popen.wait()` 上等待被跟踪的子进程退出，
+并在每次启动时运行一个就绪探测线程，向界面派发明确的状态切换：
+starting / ready / stopping / exited。
+取代原先每 2 秒新建线程做 HTTP 探测的轮询监控。
+"""
+
+import threading
+import time
+
+STATE_IDLE = "idle"
+STATE_STARTING = "starting"
+STATE_READY = "ready"
+STATE_STOPPING = "stopping"
+STATE_EXITED = "exited"
+
+# 未跟踪子进程时，检测外部启动实例的间隔（秒）
+EXTERNAL_PROBE_INTERVAL = 30.0
+# 外部实例探测失败后的复查间隔（秒），以及判定为已停止所需的连续失败次数
+EXTERNAL_RECHECK_INTERVAL = 5.0
+EXTERNAL_DOWN_PROBES = 3
+# 就绪探测的退避区间与总时限（秒）
+READY_PROBE_MIN_DELAY = 0.25
+READY_PROBE_MAX_DELAY = 2.0
+READY_PROBE_TIMEOUT = 120.0
+# 以输出中的就绪标记为主时，HTTP 兜底探测的固定间隔（秒）；标记出现或进程退出即停止
+READY_FALLBACK_INTERVAL = 5.0
+
+
+class ProcessSupervisor:
+    def __init__(self, app, probe=None, port=None):
+        """
+        :param app: 主 ComfyUILauncherEnhanced 实例的引用。
+        :param probe: 无参可调用对象，返回端口是否可达；默认使用 core.probe.is_http_reachable。
+        :param port: 被监督实例的端口（多实例时传入）；为 None 时跟随界面中的主端口。
+        """
+        self.app = app
+        self._probe = probe
+        self.port = str(port).strip() if port is not None else None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._proc = None
+        self._generation = 0
+        self._listeners = []
+        self._closed = False
+        self.state = STATE_IDLE
+        self.last_exit_code = None
+        self.started_at = None
+
+    # ---------- 订阅 ----------
+    def add_listener(self, fn):
+        """注册状态回调 fn(state, info)；回调在后台线程中触发，界面更新需自行投递到主线程。"""
+        with self._lock:
+            if fn not in self._listeners:
+                self._listeners.append(fn)
+
+    def remove_listener(self, fn):
+        with self._lock:
+            try:
+                self._listeners.remove(fn)
+            except ValueError:
+                pass
+
+    def _emit(self, state, **info):
+        with self._lock:
+            if state == self.state and state != STATE_READY:
+                return
+            self.state = state
+            listeners = list(self._listeners)
+        try:
+            self.app.logger.info("监督器状态: %s %s", state, info or "")
+        except Exception:
+            pass
+        for fn in listeners:
+            try:
+                fn(state, info)
+            except Exception:
+                pass
+
+    # ---------- 子进程跟踪 ----------
+    @property
+    def process(self):
+        return self._proc
+
+    def attach(self, proc, watch_ready: bool = True, ready_interval: float = None):
+        """跟踪新启动的子进程：派发 starting，并启动一次就绪探测。
+
+        watch_ready=False 时完全由调用方通过 mark_ready() 通知就绪；
+        ready_interval 给定时按该固定间隔低频探测且不设总时限，作为就绪标记（mark_ready）
+        迟迟未出现时的兜底，标记触发后探测随即结束。
+        """
+        with self._lock:
+            self._proc = proc
+            self._generation += 1
+            gen = self._generation
+            self.started_at = time.time()
+            self.last_exit_code = None
+        self._emit(STATE_STARTING, pid=getattr(proc, "pid", None))
+        if watch_ready:
+            try:
+                threading.Thread(target=self._watch_ready, args=(proc, gen, ready_interval), daemon=True).start()
+            except Exception:
+                pass
+        self._wake.set()
+
+    def mark_ready(self, **info):
+        if self._proc is not None and self.state == STATE_STARTING:
+            self._emit(STATE_READY, pid=getattr(self._proc, "pid", None), **info)
+
+    def mark_stopping(self):
+        self._emit(STATE_STOPPING)
+
+    def mark_idle(self):
+        if self._proc is None:
+            self._emit(STATE_IDLE)
+
+    def uptime(self):
+        try:
+            if self._proc is not None and self.started_at:
+                return time.time() - self.started_at
+        except Exception:
+            pass
+        return None
+
+    def _is_reachable(self) -> bool:
+        try:
+            if self._probe is not None:
+                return bool(self._probe())
+            from core.probe import is_http_reachable
+            return bool(is_http_reachable(self.app))
+        except Exception:
+            return False
+
+    def _port(self):
+        if self.port:
+            return self.port
+        try:
+            return (self.app.custom_port.get() or "8188").strip()
+        except Exception:
+            return "8188"
+
+    def _port_held(self) -> bool:
+        """端口索引中仍有进程监听该端口（繁忙实例探测超时但进程仍在）。"""
+        try:
+            from core.probe import find_pids_by_port_safe
+            return bool(find_pids_by_port_safe(self._port()))
+        except Exception:
+            return False
+
+    def _ready_delay(self, delay: float) -> float:
+        """下一次就绪探测的间隔：按共享探测器记录的连续失败次数退避，取不到端口时本地倍增。"""
+        try:
+            from core.health_probe import get_prober
+            port = int(self._port())
+            return get_prober().next_delay(port, max_delay=READY_PROBE_MAX_DELAY)
+        except Exception:
+            return min(delay * 2, READY_PROBE_MAX_DELAY)
+
+    def _watch_ready(self, proc, gen, interval: float = None):
+        # 指数退避（或按固定间隔）探测端口，直到可达、已由其他途径就绪、子进程退出或被新的启动替代
+        delay = interval or READY_PROBE_MIN_DELAY
+        deadline = None if interval else time.time() + READY_PROBE_TIMEOUT
+        while deadline is None or time.time() < deadline:
+            if gen != self._generation or self._stopped() or self.state != STATE_STARTING:
+                return
+            try:
+                if proc.poll() is not None:
+                    return
+            except Exception:
+                return
+            if self._is_reachable():
+                if gen == self._generation and self.state == STATE_STARTING:
+                    self._emit(STATE_READY, pid=getattr(proc, "pid", None))
+                return
+            time.sleep(delay)
+            if not interval:
+                delay = self._ready_delay(delay)
+
+    # ---------- 常驻线程 ----------
+    def _stopped(self) -> bool:
+        return self._closed or getattr(self.app, "_shutting_down", False)
+
+    def run(self):
+        """常驻循环：有跟踪进程时阻塞等待其退出；否则低频检测外部实例。
+
+        外部实例就绪后，单次探测失败（负载高、响应慢）不立即判定为停止：需连续
+        EXTERNAL_DOWN_PROBES 次失败且端口已无进程监听，期间按较短间隔复查。
+        """
+        external_up = None
+        misses = 0
+        while not self._stopped():
+            proc = self._proc
+            if proc is not None:
+                try:
+                    rc = proc.wait()
+                except Exception:
+                    rc = None
+                with self._lock:
+                    if self._proc is not proc:
+                        continue
+                    self._proc = None
+                    self.last_exit_code = rc
+                    uptime = (time.time() - self.started_at) if self.started_at else None
+                    self.started_at = None
+                self._emit(STATE_EXITED, returncode=rc, uptime=uptime)
+                external_up = None
+                misses = 0
+                continue
+            self._wake.wait(EXTERNAL_RECHECK_INTERVAL if misses else EXTERNAL_PROBE_INTERVAL)
+            self._wake.clear()
+            if self._proc is not None or self._stopped():
+                continue
+            up = self._is_reachable()
+            if up or not external_up:
+                misses = 0
+            else:
+                misses += 1
+                if misses < EXTERNAL_DOWN_PROBES or self._port_held():
+                    continue
+                misses = 0
+            if up != external_up:
+                external_up = up
+                self._emit(STATE_READY if up else STATE_IDLE, external=True)
+
+    def close(self):
+        """仅结束本监督器的常驻循环（多实例移除时使用），不影响应用级关闭标记。"""
+        self._closed = True
+        self._wake.set()
+
+    def shutdown(self):
+        try:
+            self.app._shutting_down = True
+        except Exception:
+            pass
+        self._wake.set()
@@ -0,0 +1,119 @@
+"""
+Git 标签 -> 提交索引。
+
+一次 `git for-each-ref refs/tags` 取得全部标签及其指向的提交（附注标签取解引用后的提交），
+按仓库缓存；`packed-refs` 或 `refs/tags` 下的文件变化（fetch/新建/删除标签）时自动失效。
+取代逐个标签执行 `git rev-list -n 1 <tag>` 的做法（ComfyUI 有数百个标签）。
+只查单个标签时（lookup）若索引未缓存，先尝试直接读取 packed-refs，无需启动 git。
+"""
+
+import os
+import threading
+from pathlib import Path
+
+from utils import git_refs as REFS
+
+FOR_EACH_REF_FORMAT = "%(refname:short) %(*objectname) %(objectname)"
+
+_lock = threading.Lock()
+_cache = {}
+
+
+def git_dir(repo):
+    """返回仓库的公共 git 目录（兼容 worktree/子模块的 .git 文件与 commondir）；找不到时返回 None。"""
+    dirs = REFS.git_dirs(repo)
+    return dirs[1] if dirs else None
+
+
+def refs_signature(repo):
+    """标签引用的变化指纹：packed-refs 的 (mtime, size) 与 refs/tags 下文件数与最大 mtime。"""
+    gd = git_dir(repo)
+    if gd is None:
+        return None
+    sig = []
+    try:
+        st = (gd / "packed-refs").stat()
+        sig.append((st.st_mtime_ns, st.st_size))
+    except Exception:
+        sig.append(None)
+    count = 0
+    newest = 0
+    stack = [gd / "refs" / "tags"]
+    while stack:
+        d = stack.pop()
+        try:
+            newest = max(newest, d.stat().st_mtime_ns)
+            with os.scandir(d) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append(Path(e.path))
+                    else:
+                        count += 1
+                        newest = max(newest, e.stat(follow_symlinks=False).st_mtime_ns)
+        except Exception:
+            pass
+    sig.append((count, newest))
+    return tuple(sig)
+
+
+def parse_for_each_ref(text: str) -> dict:
+    """解析 FOR_EACH_REF_FORMAT 输出，返回 {标签: 提交哈希}。"""
+    index = {}
+    for line in (text or "").splitlines():
+        parts = line.strip().split(" ")
+        if len(parts) < 2 or not parts[0]:
+            continue
+        name = parts[0]
+        peeled = parts[1] if len(parts) >= 3 else ""
+        obj = parts[-1]
+        commit = peeled or obj
+        if commit:
+            index[name] = commit
+    return index
+
+
+def load(repo, run, force: bool = False) -> dict:
+    """返回 repo 的标签索引；run(args) 执行 git 子命令并返回 CompletedProcess。
+
+    失败时返回空字典且不缓存，便于调用方回退到逐个查询。
+    """
+    key = str(Path(repo).resolve())
+    sig = refs_signature(key)
+    with _lock:
+        hit = _cache.get(key)
+        if hit is not None and not force and sig is not None and hit[0] == sig:
+            return hit[1]
+    try:
+        r = run(["for-each-ref", f"--format={FOR_EACH_REF_FORMAT}", "refs/tags"])
+    except Exception:
+        return {}
+    if r is None or r.returncode != 0:
+        return {}
+    index = parse_for_each_ref(r.stdout)
+    with _lock:
+        _cache[key] = (sig, index)
+    return index
+
+
+def lookup(repo, tag: str, run):
+    """单个标签 -> 提交哈希；依次使用已缓存的索引、packed-refs（utils.git_refs.tag_commit）与 load()。"""
+    if not tag:
+        return None
+    key = str(Path(repo).resolve())
+    sig = refs_signature(key)
+    with _lock:
+        hit = _cache.get(key)
+    if hit is not None and sig is not None and hit[0] == sig:
+        return hit[1].get(tag)
+    commit = REFS.tag_commit(key, tag)
+    if commit:
+        return commit
+    return load(key, run).get(tag)
+
+
+def invalidate(repo=None):
+    with _lock:
+        if repo is None:
+            _cache.clear()
+        else:
+            _cache.pop(str(Path(repo).resolve()), None)
@@ -13,16 +13,23 @@ VersionManager 改进版
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox
 import logging
 import subprocess
-import threading
 import os
 import json
 from pathlib import Path
 from utils.common import run_hidden, have_git, is_git_repo
+from core import scheduler as SCHED
+from core import git_query as GQ
+from core import commit_history as HISTORY
+from core import history_cache as HCACHE
+from core import fetch_strategy as FETCH
 from utils.logging import install_logging
 
+# 搜索/筛选结果不足一屏时，最多自动向后加载的页数（用户滚动到底部加载不受此限）
+HISTORY_AUTO_MAX_PAGES = 10
+
 # 统一从工具模块导入隐藏执行与 Git 检测方法
 
 
@@ -37,7 +44,14 @@ class VersionManager:
         self._after_target = None
 
         self.embedded = False
-        self.commits = []
+        # 提交历史按页加载，界面只物化滑动窗口内的行
+        self.history = HISTORY.CommitHistory()
+        self._history_window = HISTORY.HistoryWindow()
+        self._stable_hashes = set()
+        self._search_after_id = None
+        self._auto_pages = 0
+        self._history_scroll_pos = None
+        self.search_var = None
         self.current_commit = None
 
         # 预先初始化状态变量，防止在界面尚未构建时刷新信息造成 NoneType 错误
@@ -118,17 +132,38 @@ class VersionManager:
         # 若配置缺失，默认启用 gh-proxy，与增强版保持一致
         default_mode = proxy_cfg.get('git_proxy_mode', 'gh-proxy')
         default_url = proxy_cfg.get('git_proxy_url', 'https://gh-proxy.com/')
-        # 内部保存真实值
-        self.proxy_mode_var = tk.StringVar(value=default_mode)
-        self.proxy_url_var = tk.StringVar(value=default_url)
-        # UI 展示值（中文）
-        self.proxy_mode_ui_var = tk.StringVar(value=self._get_mode_ui_text(default_mode))
+        # 拉取策略（见 core/fetch_strategy）
+        self.fetch_mode_var = tk.StringVar(value=proxy_cfg.get('git_fetch_mode', FETCH.MODE_AUTO))
+        try:
+            self.fetch_depth = int(proxy_cfg.get('git_fetch_depth', FETCH.DEFAULT_DEPTH))
+        except Exception:
+            self.fetch_depth = FETCH.DEFAULT_DEPTH
+        self.last_fetch = None
 
         # 变更时持久化
         def _persist(*_):
             self.save_proxy_settings()
-        self.proxy_mode_var.trace_add('write', _persist)
-        self.proxy_url_var.trace_add('write', _persist)
+        shared = [getattr(parent, name, None) for name in ('git_proxy_mode', 'git_proxy_url', 'git_proxy_mode_ui')]
+        if all(v is not None for v in shared):
+            # 沿用启动页网络设置的同一组变量（由其负责持久化），两处显示保持一致
+            self.proxy_mode_var, self.proxy_url_var, self.proxy_mode_ui_var = shared
+        else:
+            # 内部保存真实值
+            self.proxy_mode_var = tk.StringVar(value=default_mode)
+            self.proxy_url_var = tk.StringVar(value=default_url)
+            # UI 展示值（中文）
+            self.proxy_mode_ui_var = tk.StringVar(value=self._get_mode_ui_text(default_mode))
+            self.proxy_mode_var.trace_add('write', _persist)
+            self.proxy_url_var.trace_add('write', _persist)
+        self.fetch_mode_var.trace_add('write', _persist)
+
+    @property
+    def commits(self):
+        return self.history.commits
+
+    @commits.setter
+    def commits(self, value):
+        self.history.reset(self.history.ref, value)
 
     # ---------- 样式 ----------
     def apply_vm_styles(self):
@@ -244,7 +279,7 @@ class VersionManager:
         self.proxy_mode_combo = ttk.Combobox(
             proxy_row,
             textvariable=self.proxy_mode_ui_var,
-            values=["不使用", "gh-proxy", "自定义"],
+            values=["不使用", "gh-proxy", "自动", "自定义"],
             state='readonly',
             width=12
         )
@@ -282,6 +317,21 @@ class VersionManager:
                                selectcolor=self.COLORS["card"]).pack(side=tk.LEFT, padx=(10, 0))
         except Exception:
             pass
+        try:
+            tk.Label(update_row, text="拉取方式:", bg=self.COLORS["card"], fg=self.COLORS["text"]).pack(side=tk.LEFT, padx=(10, 6))
+            fetch_ui_var = tk.StringVar(value=FETCH.MODE_LABELS.get(self.fetch_mode_var.get(), FETCH.MODE_LABELS[FETCH.MODE_AUTO]))
+            fetch_combo = ttk.Combobox(update_row, textvariable=fetch_ui_var, state='readonly', width=12,
+                                       values=[FETCH.MODE_LABELS[m] for m in FETCH.MODES])
+            fetch_combo.pack(side=tk.LEFT)
+
+            def on_fetch_mode_change(_evt=None):
+                for m, label in FETCH.MODE_LABELS.items():
+                    if label == fetch_ui_var.get():
+                        self.fetch_mode_var.set(m)
+                        break
+            fetch_combo.bind('<<ComboboxSelected>>', on_fetch_mode_change)
+        except Exception:
+            pass
         button_row = ttk.Frame(actions_container, style='Card.TFrame')
         button_row.pack(anchor=tk.W, fill=tk.X, pady=(6, 0))
         self.update_latest_button = ttk.Button(button_row, text="更新", command=self._on_update_button_clicked, style='Secondary.TButton')
@@ -315,7 +365,11 @@ class VersionManager:
         self.commit_tree.column('message', width=420, stretch=True)
 
         scrollbar = ttk.Scrollbar(history_card, orient=tk.VERTICAL, command=self.commit_tree.yview)
-        self.commit_tree.configure(yscrollcommand=scrollbar.set)
+
+        def _on_tree_scroll(first, last):
+            scrollbar.set(first, last)
+            self._on_history_scroll(first, last)
+        self.commit_tree.configure(yscrollcommand=_on_tree_scroll)
         self.commit_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
@@ -346,60 +400,69 @@ class VersionManager:
         def _on_filter(_evt=None):
             val = combo.get()
             self.filter_type = 'all' if val == '全部' else ('stable' if val == '稳定版' else 'test')
+            self._auto_pages = 0
             self.update_commit_tree()
         combo.bind('<<ComboboxSelected>>', _on_filter)
+        # 按哈希前缀或提交信息增量搜索
+        ttk.Label(filter_row, text="搜索:", style='Help.TLabel').pack(side=tk.LEFT, padx=(12, 6))
+        self.search_var = tk.StringVar(value="")
+        ttk.Entry(filter_row, textvariable=self.search_var, width=28).pack(side=tk.LEFT)
+        self.search_var.trace_add('write', lambda *_: self._schedule_search())
     # ---------- Git 基础 ----------
-    def run_git_command(self, args, capture_output=True):
+    def _git_executable(self):
+        # 优先使用启动器解析到的 Git 路径；若尚未解析则尝试解析
+        logger = logging.getLogger("comfyui_launcher")
+        git_cmd = None
         try:
-            # 优先使用启动器解析到的 Git 路径；若尚未解析则尝试解析
-            logger = logging.getLogger("comfyui_launcher")
+            git_cmd = getattr(self.parent, 'git_path', None)
+        except Exception:
             git_cmd = None
+        if not git_cmd:
             try:
-                git_cmd = getattr(self.parent, 'git_path', None)
-            except Exception:
-                git_cmd = None
-            if not git_cmd:
-                try:
-                    if hasattr(self.parent, 'resolve_git'):
-                        cmd, src = self.parent.resolve_git()
-                        git_cmd = cmd or 'git'
-                        try:
-                            logger.info(f"VersionManager Git解析: {src}, path={git_cmd}")
-                        except Exception:
-                            pass
-                    else:
-                        git_cmd = 'git'
-                except Exception:
+                if hasattr(self.parent, 'resolve_git'):
+                    cmd, src = self.parent.resolve_git()
+                    git_cmd = cmd or 'git'
+                    try:
+                        logger.info(f"VersionManager Git解析: {src}, path={git_cmd}")
+                    except Exception:
+                        pass
+                else:
                     git_cmd = 'git'
-            else:
-                try:
-                    src_text = '使用整合包Git' if git_cmd != 'git' else '使用系统Git'
-                    logger.info(f"VersionManager Git来源: {src_text}, path={git_cmd}")
-                except Exception:
-                    pass
+            except Exception:
+                git_cmd = 'git'
+        else:
+            try:
+                src_text = '使用整合包Git' if git_cmd != 'git' else '使用系统Git'
+                logger.info(f"VersionManager Git来源: {src_text}, path={git_cmd}")
+            except Exception:
+                pass
+        return git_cmd
+
+    def run_git_command(self, args, capture_output=True):
+        try:
+            git_cmd = self._git_executable()
+
+            def _run():
+                # 小查询经常驻 cat-file 进程/缓存回答，其余命令走有界池
+                if capture_output:
+                    return GQ.run(git_cmd, self.comfyui_path, args)
+                return run_hidden(
+                    [git_cmd] + args,
+                    cwd=self.comfyui_path,
+                    capture_output=capture_output,
+                    text=True,
+                    encoding='utf-8',
+                    creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+                )
+            r = _run()
 
-            r = run_hidden(
-                [git_cmd] + args,
-                cwd=self.comfyui_path,
-                capture_output=capture_output,
-                text=True,
-                encoding='utf-8',
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-            )
-            
             if r and r.returncode != 0 and "dubious ownership" in (getattr(r, 'stderr', '') or ""):
                 try:
                     svc = getattr(self.parent, 'services', None)
                     if svc and getattr(svc, 'git', None):
                         svc.git.fix_unsafe_repo(str(self.comfyui_path))
-                        return run_hidden(
-                            [git_cmd] + args,
-                            cwd=self.comfyui_path,
-                            capture_output=capture_output,
-                            text=True,
-                            encoding='utf-8',
-                            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-                        )
+                        GQ.get(git_cmd, self.comfyui_path).close()
+                        return _run()
                 except Exception:
                     pass
             return r
@@ -468,6 +531,17 @@ class VersionManager:
                 if not is_git_repo(self.comfyui_path):
                     self._after(self.show_not_git_repo)
                     return
+                # 首次打开时先用上次的磁盘缓存渲染提交历史，随后的增量更新在本线程继续完成
+                shown_ref = None
+                if not len(self.history):
+                    try:
+                        cached = HCACHE.load_last(self.comfyui_path)
+                        if cached:
+                            HCACHE.restore(self.history, cached)
+                            shown_ref = cached["ref"]
+                            self._after(self.update_commit_tree)
+                    except Exception:
+                        pass
                 # 当前分支
                 r_branch = self.run_git_command(['branch', '--show-current'])
                 branch = ""
@@ -494,13 +568,10 @@ class VersionManager:
                 try:
                     svc = getattr(self.parent, 'services', None)
                     if svc and getattr(svc, 'version', None):
-                        tags = svc.version._list_tags()
-                        for t in tags:
-                            if svc.version.is_stable_version(t):
-                                th = svc.version._tag_commit(t)
-                                if th and display_commit and th.startswith(display_commit):
-                                    display_commit = t
-                                    break
+                        for t, th in svc.version.stable_tag_commits().items():
+                            if th and display_commit and th.startswith(display_commit):
+                                display_commit = t
+                                break
                 except Exception:
                     pass
                 self._after(lambda: self.current_commit_var and self.current_commit_var.set(display_commit))
@@ -522,14 +593,11 @@ class VersionManager:
                                 origin_url = self.get_remote_url()
                                 proxied = self.compute_proxied_url(origin_url)
                                 if proxied:
-                                    # 仅同步当前分支的远端引用（更快），并带上 tags
-                                    self.run_git_command(['fetch', '--prune', proxied, f'+refs/heads/{query_branch}:refs/remotes/origin/{query_branch}', '--tags'])
                                     target = proxied
-                            else:
-                                # 直接使用 origin 名称，更新远端跟踪分支与 tags
-                                self.run_git_command(['fetch', '--prune', 'origin', '--tags'])
+                            # 仅同步当前分支的远端引用（完整拉取模式除外），标签只取远端新增的
+                            fetched = self.fetch_remote(target, query_branch)
                             try:
-                                logging.getLogger("comfyui_launcher").info("刷新历史: 已强制fetch target=%s branch=%s", target, query_branch)
+                                logging.getLogger("comfyui_launcher").info("刷新历史: 已强制fetch target=%s branch=%s %s", target, query_branch, fetched.summary())
                             except Exception:
                                 pass
                         except Exception:
@@ -604,13 +672,10 @@ class VersionManager:
                 try:
                     svc = getattr(self.parent, 'services', None)
                     if svc and getattr(svc, 'version', None):
-                        tags = svc.version._list_tags()
-                        for t in tags:
-                            if svc.version.is_stable_version(t):
-                                th = svc.version._tag_commit(t)
-                                if th and display_commit2 and th.startswith(display_commit2):
-                                    display_commit2 = t
-                                    break
+                        for t, th in svc.version.stable_tag_commits().items():
+                            if th and display_commit2 and th.startswith(display_commit2):
+                                display_commit2 = t
+                                break
                 except Exception:
                     pass
                 stable_mark = ""
@@ -649,26 +714,10 @@ class VersionManager:
                     except Exception:
                         log_ref = None
 
-                if log_ref:
-                    r_log = self.run_git_command(
-                        ['log', '--pretty=format:%H|%cd|%an|%s', '--date=short', '--date-order', '-200', log_ref])
-                else:
-                    r_log = self.run_git_command(
-                        ['log', '--pretty=format:%H|%cd|%an|%s', '--date=short', '--date-order', '-200'])
-                if r_log and r_log.returncode == 0:
-                    commits = []
-                    for line in r_log.stdout.strip().split('\n'):
-                        if '|' in line:
-                            parts = line.split('|', 3)
-                            if len(parts) == 4:
-                                commits.append({
-                                    'hash': parts[0][:8],
-                                    'full_hash': parts[0],
-                                    'date': parts[1],
-                                    'author': parts[2],
-                                    'message': parts[3]
-                                })
-                    self.commits = commits
+                # 磁盘缓存命中且引用未变时不执行 git log；快进时只追加新提交，否则重新取第一页，
+                # 更早的历史随滚动按页加载
+                source = HCACHE.sync(self.history, self.comfyui_path, log_ref, self.run_git_command)
+                if source and not (source == HCACHE.SOURCE_CACHE and shown_ref == (log_ref or "HEAD")):
                     self._after(self.update_commit_tree)
             except Exception as e:
                 print("获取Git信息失败:", e)
@@ -690,8 +739,8 @@ class VersionManager:
                         self._after(lambda: self.history_status_var.set(""))
                 except Exception:
                     pass
-        # 正常情况下也启动刷新线程（避免仅在异常时启动导致卡在“检查中...”）
-        threading.Thread(target=worker, daemon=True).start()
+        # 正常情况下也启动刷新任务（避免仅在异常时启动导致卡在“检查中...”）；同类刷新进行中时不重复提交
+        SCHED.submit(worker, key=f"version_manager:git_info:{'fetch' if force_fetch else 'local'}", priority=SCHED.PRIORITY_UI)
 
     def show_not_git_repo(self):
         if not self.current_branch_var:
@@ -703,43 +752,148 @@ class VersionManager:
     def update_commit_tree(self):
         if not self.commit_tree:
             return
-        # 先清空
-        for item in self.commit_tree.get_children():
-            self.commit_tree.delete(item)
         # 稳定性集合与过滤
         filter_type = getattr(self, 'filter_type', 'all')
         svc = getattr(self.parent, 'services', None)
         stable_hashes = set()
         try:
             if svc and getattr(svc, 'version', None):
-                tags = svc.version._list_tags()
-                stable_hashes = set(filter(None, (svc.version._tag_commit(t) for t in tags if svc.version.is_stable_version(t))))
+                stable_hashes = svc.version.stable_commit_hashes()
         except Exception:
             stable_hashes = set()
-
-        for commit in self.commits:
-            msg = commit['message']
-            tags = []
-            if commit['hash'] == self.current_commit:
-                # 在当前提交后附加状态标识（已是最新 / 可更新）
-                status = self.current_update_status_text or ""
-                msg = f"{msg}  *当前{status}"
-                tags.append('current')
-            is_stable = bool(commit['full_hash'] in stable_hashes)
-            if filter_type == 'stable' and not is_stable:
-                continue
-            if filter_type == 'test' and is_stable:
-                continue
-            if is_stable:
-                tags.append('stable')
-            self.commit_tree.insert(
-                '',
-                tk.END,
-                values=(commit['hash'], commit['date'], commit['author'], msg),
-                tags=tags
-            )
+        self._stable_hashes = stable_hashes
+        query = self.search_var.get() if self.search_var is not None else ""
+        rows = self.history.view(filter_type, stable_hashes, query)
+        # 只物化窗口内的行，其余随滚动成批插入
+        children = self.commit_tree.get_children()
+        if children:
+            self.commit_tree.delete(*children)
+        for commit in self._history_window.reset(rows):
+            self._insert_commit_row(commit, tk.END)
+        self._update_history_status()
+        # 搜索结果不足一屏时继续向更早的历史加载
+        if query and self._history_window.at_end:
+            self._load_more_history(auto=True)
         # 不自动选中任何一条 —— 用户点击后才出现蓝色高亮
 
+    def _insert_commit_row(self, commit, index):
+        msg = commit['message']
+        tags = []
+        if self.current_commit and commit['full_hash'].startswith(self.current_commit):
+            # 在当前提交后附加状态标识（已是最新 / 可更新）
+            status = self.current_update_status_text or ""
+            msg = f"{msg}  *当前{status}"
+            tags.append('current')
+        if commit['full_hash'] in self._stable_hashes:
+            tags.append('stable')
+        try:
+            self.commit_tree.insert('', index, iid=commit['full_hash'],
+                                    values=(commit['hash'], commit['date'], commit['author'], msg), tags=tags)
+        except tk.TclError:
+            pass
+
+    def _update_history_status(self):
+        try:
+            if getattr(self, 'history_status_var', None) is None:
+                return
+            n = len(self.history)
+            more = "" if self.history.exhausted else "，滚动到底部加载更早的提交"
+            self.history_status_var.set(f"已加载 {n} 条提交{more}" if n else "")
+        except Exception:
+            pass
+
+    def _on_history_scroll(self, first, last):
+        try:
+            first, last = float(first), float(last)
+        except Exception:
+            return
+        # 插入/删除行也会触发 yscrollcommand：位置未变化时不是滚动，不据此加载
+        moved = (first, last) != self._history_scroll_pos
+        self._history_scroll_pos = (first, last)
+        win = self._history_window
+        if last >= 0.98:
+            if not win.at_end:
+                self._slide_history(down=True, first=first, last=last)
+            elif not self.history.exhausted and first <= 0.0:
+                # 内容不足一屏时无从滚动，按自动加载的页数上限补页
+                self._load_more_history(auto=True)
+            elif not self.history.exhausted and moved:
+                self._load_more_history()
+        elif first <= 0.02 and win.start > 0:
+            self._slide_history(down=False, first=first, last=last)
+
+    def _slide_history(self, down: bool, first: float, last: float):
+        """滑动物化窗口，并按行数换算保持当前可见位置。"""
+        tree = self.commit_tree
+        before = len(tree.get_children())
+        top = first * before
+        if down:
+            rows, dropped = self._history_window.slide_down()
+            for c in rows:
+                self._insert_commit_row(c, tk.END)
+            if dropped:
+                tree.delete(*tree.get_children()[:dropped])
+            top -= dropped
+        else:
+            rows, dropped = self._history_window.slide_up()
+            for c in reversed(rows):
+                self._insert_commit_row(c, 0)
+            if dropped:
+                tree.delete(*tree.get_children()[-dropped:])
+            top += len(rows)
+        after = len(tree.get_children())
+        if after:
+            tree.yview_moveto(max(0.0, top / after))
+
+    def _load_more_history(self, auto: bool = False):
+        if self.history.exhausted:
+            return
+        if auto:
+            if self._auto_pages >= HISTORY_AUTO_MAX_PAGES:
+                return
+            self._auto_pages += 1
+        try:
+            if getattr(self, 'history_status_var', None) is not None:
+                self.history_status_var.set(f"已加载 {len(self.history)} 条提交，正在加载更早的提交…")
+        except Exception:
+            pass
+
+        def worker():
+            if self.history.load_more(self.run_git_command) > 0:
+                try:
+                    HCACHE.remember(self.history, self.comfyui_path)
+                except Exception:
+                    pass
+            self._after(self._on_history_page)
+        SCHED.submit(worker, key="version_manager:history_page", priority=SCHED.PRIORITY_UI)
+
+    def _on_history_page(self):
+        if not self.commit_tree:
+            return
+        query = self.search_var.get() if self.search_var is not None else ""
+        rows = self.history.view(getattr(self, 'filter_type', 'all'), self._stable_hashes, query)
+        self._history_window.extend(rows)
+        if not self._history_window.at_end:
+            rows_added, _ = self._history_window.slide_down()
+            for c in rows_added:
+                self._insert_commit_row(c, tk.END)
+        self._update_history_status()
+        if query and self._history_window.at_end:
+            self._load_more_history(auto=True)
+
+    def _schedule_search(self):
+        # 输入停顿后再筛选，避免每个按键都重建列表
+        try:
+            if self._search_after_id is not None:
+                self.commit_tree.after_cancel(self._search_after_id)
+        except Exception:
+            pass
+        self._auto_pages = 0
+        try:
+            self._search_after_id = self.commit_tree.after(200, self.update_commit_tree)
+        except Exception:
+            self.update_commit_tree()
+
     # ---------- 交互 ----------
     def on_commit_double_click(self, _):
         self.show_commit_details()
@@ -754,6 +908,9 @@ class VersionManager:
         sel = self.commit_tree.selection()
         if not sel:
             return None
+        hit = self.history.find(sel[0])
+        if hit:
+            return hit
         vals = self.commit_tree.item(sel[0], 'values')
         if not vals:
             return None
@@ -874,11 +1031,9 @@ class VersionManager:
                     )
                 except Exception:
                     pass
-                if target_remote_url:
-                    fetch = self.run_git_command(['fetch', '--prune', target_remote_url])
-                else:
-                    fetch = self.run_git_command(['fetch', '--all', '--prune'])
-                if not fetch or fetch.returncode != 0:
+                remote_target = target_remote_url or 'origin'
+                fetch = self.fetch_remote(remote_target, branch)
+                if not fetch.ok:
                     self._after(lambda: messagebox.showerror("错误", f"fetch失败: {fetch.stderr if fetch else ''}"))
                     self._after(_on_finish)
                     try:
@@ -887,41 +1042,24 @@ class VersionManager:
                         pass
                     return
 
-                # 额外同步标签：避免本地 `describe` 落后于远端最新标签
-                try:
-                    remote_target = target_remote_url or 'origin'
-                    logging.getLogger("comfyui_launcher").info(
-                        "准备fetch tags: target=%s", remote_target
-                    )
-                    fetch_tags = self.run_git_command(['fetch', '--tags', remote_target])
-                    if fetch_tags and fetch_tags.returncode == 0:
-                        logging.getLogger("comfyui_launcher").info("fetch tags 完成")
-                    else:
-                        logging.getLogger("comfyui_launcher").warning(
-                            "fetch tags 失败: rc=%s, stderr=%s",
-                            getattr(fetch_tags, 'returncode', 'N/A'), getattr(fetch_tags, 'stderr', '')
-                        )
-                except Exception:
-                    pass
-
-                # 诊断：远端标签概览（经代理或origin）
-                try:
-                    remote_target = target_remote_url or 'origin'
-                    r_tags_remote = self.run_git_command(['ls-remote', '--tags', remote_target])
-                    if r_tags_remote and r_tags_remote.returncode == 0:
-                        lines = [ln for ln in r_tags_remote.stdout.splitlines() if ln.strip()]
-                        recent_remote = ", ".join([ln.split('\t')[-1] for ln in lines[-5:]]) if lines else "<none>"
-                        logging.getLogger("comfyui_launcher").info(
-                            "更新诊断: remote_tags_recent=%s target=%s",
-                            recent_remote, remote_target
-                        )
-                    else:
-                        logging.getLogger("comfyui_launcher").warning(
-                            "更新诊断: 远端标签查询失败 rc=%s stderr=%s",
-                            getattr(r_tags_remote, 'returncode', 'N/A'), getattr(r_tags_remote, 'stderr', '')
-                        )
-                except Exception:
-                    pass
+                # 诊断：远端标签概览（经代理或origin）；非完整拉取时标签已按 ls-remote 结果同步，不再重复查询
+                if fetch.mode == FETCH.MODE_FULL:
+                    try:
+                        r_tags_remote = self.run_git_command(['ls-remote', '--tags', remote_target])
+                        if r_tags_remote and r_tags_remote.returncode == 0:
+                            lines = [ln for ln in r_tags_remote.stdout.splitlines() if ln.strip()]
+                            recent_remote = ", ".join([ln.split('\t')[-1] for ln in lines[-5:]]) if lines else "<none>"
+                            logging.getLogger("comfyui_launcher").info(
+                                "更新诊断: remote_tags_recent=%s target=%s",
+                                recent_remote, remote_target
+                            )
+                        else:
+                            logging.getLogger("comfyui_launcher").warning(
+                                "更新诊断: 远端标签查询失败 rc=%s stderr=%s",
+                                getattr(r_tags_remote, 'returncode', 'N/A'), getattr(r_tags_remote, 'stderr', '')
+                            )
+                    except Exception:
+                        pass
 
                 try:
                     logging.getLogger("comfyui_launcher").info(
@@ -930,7 +1068,10 @@ class VersionManager:
                     )
                 except Exception:
                     pass
-                if target_remote_url:
+                if fetch.mode != FETCH.MODE_FULL:
+                    # 跟踪分支已由上面的单分支拉取更新，直接快进，避免 pull 再次访问远端
+                    pull = self.run_git_command(['merge', '--ff-only', f'refs/remotes/origin/{branch}'])
+                elif target_remote_url:
                     pull = self.run_git_command(['pull', '--ff-only', target_remote_url, branch])
                 else:
                     pull = self.run_git_command(['pull', '--ff-only'])
@@ -1017,9 +1158,9 @@ class VersionManager:
             # 仅在用户确认后才切换到“更新中…”状态并禁用按钮
             if messagebox.askyesno("确认", "确定更新到 master 分支最新提交吗？"):
                 self._after(_on_start)
-                threading.Thread(target=worker, daemon=True).start()
+                SCHED.submit(worker, key="version_manager:update_to_latest")
                 try:
-                    logging.getLogger("comfyui_launcher").info("已确认更新，启动后台线程")
+                    logging.getLogger("comfyui_launcher").info("已确认更新，提交后台任务")
                 except Exception:
                     pass
         else:
@@ -1091,6 +1232,8 @@ class VersionManager:
             return 'gh-proxy'
         if mode == 'custom':
             return '自定义'
+        if mode == 'auto':
+            return '自动'
         return '不使用'
 
     def _get_mode_internal(self, ui_text: str) -> str:
@@ -1098,6 +1241,8 @@ class VersionManager:
             return 'gh-proxy'
         if ui_text == '自定义':
             return 'custom'
+        if ui_text == '自动':
+            return 'auto'
         return 'none'
 
     def _update_proxy_entry_state(self):
@@ -1131,6 +1276,7 @@ class VersionManager:
                     cfg['proxy_settings'] = {}
                 mode = self.proxy_mode_var.get()
                 cfg['proxy_settings']['git_proxy_mode'] = mode
+                cfg['proxy_settings']['git_fetch_mode'] = self.fetch_mode_var.get()
                 # 统一 gh-proxy 模式的域名，避免误填 ghproxy.com
                 if mode == 'gh-proxy':
                     cfg['proxy_settings']['git_proxy_url'] = 'https://gh-proxy.com/'
@@ -1158,6 +1304,7 @@ class VersionManager:
                     data['proxy_settings'] = {}
                 mode = self.proxy_mode_var.get()
                 data['proxy_settings']['git_proxy_mode'] = mode
+                data['proxy_settings']['git_fetch_mode'] = self.fetch_mode_var.get()
                 if mode == 'gh-proxy':
                     data['proxy_settings']['git_proxy_url'] = 'https://gh-proxy.com/'
                 else:
@@ -1173,6 +1320,19 @@ class VersionManager:
         except Exception:
             logging.getLogger('comfyui_launcher').warning('保存代理设置失败')
 
+    def fetch_remote(self, remote, branch=None):
+        """按“拉取方式”设置拉取 branch（含新增标签），返回 FetchResult，并记录字节数与耗时。"""
+        mode = self.fetch_mode_var.get() if self.fetch_mode_var is not None else FETCH.MODE_AUTO
+        result = FETCH.fetch(self.run_git_command, self.comfyui_path, remote=remote, branch=branch,
+                             mode=mode, depth=self.fetch_depth)
+        self.last_fetch = result
+        try:
+            if getattr(self, 'history_status_var', None) is not None and result.ok:
+                self._after(lambda: self.history_status_var.set(f"已{result.summary()}"))
+        except Exception:
+            pass
+        return result
+
     def get_remote_url(self) -> str:
         r = self.run_git_command(['remote', 'get-url', 'origin'])
         if r and r.returncode == 0:
@@ -1199,6 +1359,12 @@ class VersionManager:
             # - custom 模式使用用户填写的地址
             if mode == 'gh-proxy':
                 base = 'https://gh-proxy.com/'
+            elif mode == 'auto':
+                # 按测速结果选择；直连最快时不加前缀
+                svc = getattr(self.parent, 'services', None)
+                base = svc.mirror.github_base() if svc and getattr(svc, 'mirror', None) else 'https://gh-proxy.com/'
+                if not base:
+                    return ''
             else:
                 base = (self.proxy_url_var.get() or '').strip()
                 if not base:
@@ -1258,9 +1424,9 @@ class VersionManager:
                         logging.getLogger("comfyui_launcher").exception("切换提交异常")
                     except Exception:
                         pass
-            threading.Thread(target=worker, daemon=True).start()
+            SCHED.submit(worker, key="version_manager:checkout")
             try:
-                logging.getLogger("comfyui_launcher").info("已确认切换提交，启动后台线程")
+                logging.getLogger("comfyui_launcher").info("已确认切换提交，提交后台任务")
             except Exception:
                 pass
 
@@ -1293,28 +1459,116 @@ class VersionManager:
             is_stable = False
             svc = getattr(self.parent, 'services', None)
             if svc and getattr(svc, 'version', None):
-                tags = svc.version._list_tags()
-                stable_hashes = set(filter(None, (svc.version._tag_commit(t) for t in tags if svc.version.is_stable_version(t))))
+                stable_hashes = svc.version.stable_commit_hashes()
                 is_stable = bool(commit['full_hash'] in stable_hashes)
             ttk.Label(info, text=f"版本稳定性: {'稳定版' if is_stable else '测试版'}", style='Help.TLabel').pack(anchor=tk.W)
         except Exception:
             pass
 
+        # 操作行：完整补丁 / 取消 / 加载更多；git show 的输出按块流式写入文本框，达到上限后暂停
+        actions = ttk.Frame(detail, style='Card.TFrame')
+        actions.pack(fill=tk.X, padx=10, pady=(0, 6))
+        status_var = tk.StringVar(value="")
+        patch_btn = ttk.Button(actions, text="显示完整补丁", style='Secondary.TButton')
+        patch_btn.pack(side=tk.LEFT, padx=(0, 8))
+        cancel_btn = ttk.Button(actions, text="取消", style='Secondary.TButton')
+        cancel_btn.pack(side=tk.LEFT, padx=(0, 8))
+        more_btn = ttk.Button(actions, text="加载更多", style='Secondary.TButton', state='disabled')
+        more_btn.pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Label(actions, textvariable=status_var, style='Help.TLabel').pack(side=tk.LEFT)
+
         diff_frame = ttk.Frame(detail, style='Subtle.TFrame', padding=10)
         diff_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        from tkinter import scrolledtext
+        from core.git_stream import GitStream
         diff_text = scrolledtext.ScrolledText(diff_frame, wrap=tk.WORD,
                                               background=self.COLORS["card"],
                                               foreground=self.COLORS["text"])
         diff_text.pack(fill=tk.BOTH, expand=True)
+        state = {"stream": None, "gen": 0}
 
-        def load_diff():
+        def _ui(fn, gen):
+            # 窗口关闭或已重新加载（如切换为完整补丁）后丢弃旧流的回调
+            def _run():
+                try:
+                    if detail.winfo_exists() and state["gen"] == gen:
+                        fn()
+                except Exception:
+                    pass
             try:
-                r = self.run_git_command(['show', '--stat', commit['full_hash']])
-                if r and r.returncode == 0:
-                    diff_text.insert(tk.END, r.stdout)
+                detail.after(0, _run)
+            except Exception:
+                pass
+
+        def _kib(n):
+            return f"{n / 1024:.0f} KiB"
+
+        def on_chunk(text, gen):
+            _ui(lambda: diff_text.insert(tk.END, text), gen)
+
+        def on_pause(received, gen):
+            def _paused():
+                status_var.set(f"已显示 {_kib(received)}，内容较多，点击“加载更多”继续")
+                more_btn.configure(state='normal')
+            _ui(_paused, gen)
+
+        def on_done(rc, stderr, cancelled, gen):
+            def _done():
+                cancel_btn.configure(state='disabled')
+                more_btn.configure(state='disabled')
+                stream = state["stream"]
+                if cancelled:
+                    status_var.set("已取消")
+                elif rc != 0:
+                    if stream is not None and not stream.received:
+                        diff_text.insert(tk.END, "无法获取提交详情")
+                    status_var.set(f"获取详情失败: {(stderr or '').strip()[:200]}")
                 else:
-                    diff_text.insert(tk.END, "无法获取提交详情")
+                    status_var.set(f"共 {_kib(stream.received if stream else 0)}")
+            _ui(_done, gen)
+
+        def load_diff(patch=False):
+            old = state["stream"]
+            if old is not None:
+                old.cancel()
+            state["gen"] += 1
+            gen = state["gen"]
+            diff_text.delete('1.0', tk.END)
+            status_var.set("加载中…")
+            cancel_btn.configure(state='normal')
+            more_btn.configure(state='disabled')
+            args = ['show', '--stat'] + (['--patch'] if patch else []) + [commit['full_hash']]
+            try:
+                state["stream"] = GitStream(
+                    self._git_executable(), self.comfyui_path, args,
+                    lambda text: on_chunk(text, gen),
+                    on_done=lambda rc, err, cancelled: on_done(rc, err, cancelled, gen),
+                    on_pause=lambda received: on_pause(received, gen),
+                ).start()
             except Exception as e:
+                state["stream"] = None
                 diff_text.insert(tk.END, f"获取详情失败: {e}")
-
-        threading.Thread(target=load_diff, daemon=True).start()
+                status_var.set("")
+                cancel_btn.configure(state='disabled')
+
+        def on_more():
+            stream = state["stream"]
+            if stream is not None:
+                more_btn.configure(state='disabled')
+                status_var.set(f"已显示 {_kib(stream.received)}，继续加载…")
+                stream.more()
+
+        def on_cancel():
+            stream = state["stream"]
+            if stream is not None:
+                stream.cancel()
+
+        def on_close():
+            on_cancel()
+            detail.destroy()
+
+        patch_btn.configure(command=lambda: load_diff(patch=True))
+        cancel_btn.configure(command=on_cancel)
+        more_btn.configure(command=on_more)
+        detail.protocol("WM_DELETE_WINDOW", on_close)
+        load_diff()
@@ -1,6 +1,7 @@
-import threading
-import concurrent.futures
 from pathlib import Path
+from core import scheduler as SCHED
+from core import git_query as GQ
+from core import fetch_strategy as FETCH
 from utils.common import run_hidden
 from utils import pip as PIPUTILS
 
@@ -98,12 +99,10 @@ def refresh_version_info(app, scope: str = "all"):
                     pass
 
             core_needed = (scope == "all") or (scope == "core_only") or (scope == "selected" and app.update_core_var.get())
-            executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
-            futures = []
-            def _submit(fn):
+            # 各子项按组件单飞：重复刷新时正在进行的 git/pip 查询不会再起一份
+            def _submit(fn, key):
                 try:
-                    f = executor.submit(fn)
-                    futures.append(f)
+                    SCHED.submit(fn, key=f"version_info:{key}", priority=SCHED.PRIORITY_UI)
                 except Exception:
                     pass
             try:
@@ -127,7 +126,7 @@ def refresh_version_info(app, scope: str = "all"):
                                 pass
                     except Exception:
                         app.ui_post(lambda: app.python_version.set("获取失败"))
-                _submit(_python_ver)
+                _submit(_python_ver, "python")
                 def _torch_ver():
                     try:
                         r = run_hidden([app.python_exec, "-c", "import torch;print(torch.__version__)"], capture_output=True, text=True, timeout=10)
@@ -146,7 +145,7 @@ def refresh_version_info(app, scope: str = "all"):
                             app.root.after(0, lambda: app.torch_version.set("获取失败"))
                         except Exception:
                             pass
-                _submit(_torch_ver)
+                _submit(_torch_ver, "torch")
             if scope == "all" or scope == "front_only" or scope == "python_related" or (scope == "selected" and app.update_frontend_var.get()):
                 def _front_ver():
                     try:
@@ -166,7 +165,7 @@ def refresh_version_info(app, scope: str = "all"):
                             app.root.after(0, lambda: app.frontend_version.set("获取失败"))
                         except Exception:
                             pass
-                _submit(_front_ver)
+                _submit(_front_ver, "frontend")
             if scope == "all" or scope == "template_only" or scope == "python_related" or (scope == "selected" and app.update_template_var.get()):
                 def _tpl_ver():
                     try:
@@ -186,7 +185,7 @@ def refresh_version_info(app, scope: str = "all"):
                             app.root.after(0, lambda: app.template_version.set("获取失败"))
                         except Exception:
                             pass
-                _submit(_tpl_ver)
+                _submit(_tpl_ver, "templates")
             if core_needed and root.exists() and app.git_path:
                 def _core_ver():
                     try:
@@ -195,12 +194,12 @@ def refresh_version_info(app, scope: str = "all"):
                                 app.logger.info("内核版本: describe 开始 cwd=%s git=%s", str(root), str(app.git_path))
                         except Exception:
                             pass
-                        r = run_hidden([app.git_path, "describe", "--tags", "--abbrev=0"], cwd=str(root), capture_output=True, text=True, timeout=8)
+                        r = GQ.run(app.git_path, root, ["describe", "--tags", "--abbrev=0"], timeout=8)
                         if r.returncode != 0 and "dubious ownership" in (getattr(r, 'stderr', '') or ""):
                             try:
                                 if getattr(app, 'services', None) and getattr(app.services, 'git', None):
                                     app.services.git.fix_unsafe_repo(str(root))
-                                    r = run_hidden([app.git_path, "describe", "--tags", "--abbrev=0"], cwd=str(root), capture_output=True, text=True, timeout=8)
+                                    r = GQ.run(app.git_path, root, ["describe", "--tags", "--abbrev=0"], timeout=8)
                             except Exception:
                                 pass
                         
@@ -212,16 +211,14 @@ def refresh_version_info(app, scope: str = "all"):
                                     target_url = app.version_manager.compute_proxied_url(origin_url) or origin_url
                                 except Exception:
                                     target_url = None
-                                fetch_args = [app.git_path, "fetch", "--tags"]
-                                if target_url:
-                                    fetch_args.append(target_url)
-                                run_hidden(fetch_args, cwd=str(root), capture_output=True, text=True, timeout=15)
-                                r = run_hidden([app.git_path, "describe", "--tags", "--abbrev=0"], cwd=str(root), capture_output=True, text=True, timeout=8)
+                                # 只拉取远端新增的标签
+                                FETCH.fetch_new_tags(lambda a: GQ.run(app.git_path, root, a, timeout=15), root, target_url or "origin")
+                                r = GQ.run(app.git_path, root, ["describe", "--tags", "--abbrev=0"], timeout=8)
                             except Exception:
                                 pass
                         if r.returncode == 0:
                             tag = r.stdout.strip()
-                            r2 = run_hidden([app.git_path, "rev-parse", "--short", "HEAD"], cwd=str(root), capture_output=True, text=True, timeout=8)
+                            r2 = GQ.run(app.git_path, root, ["rev-parse", "--short", "HEAD"], timeout=8)
                             commit = r2.stdout.strip() if r2.returncode == 0 else ""
                             def _set():
                                 label = ""
@@ -239,7 +236,7 @@ def refresh_version_info(app, scope: str = "all"):
                                 pass
                         else:
                             try:
-                                r2 = run_hidden([app.git_path, "rev-parse", "--short", "HEAD"], cwd=str(root), capture_output=True, text=True, timeout=6)
+                                r2 = GQ.run(app.git_path, root, ["rev-parse", "--short", "HEAD"], timeout=6)
                                 commit = r2.stdout.strip() if r2.returncode == 0 else ""
                                 if commit:
                                     try:
@@ -261,7 +258,7 @@ def refresh_version_info(app, scope: str = "all"):
                             app.root.after(0, lambda: app.comfyui_version.set("未找到"))
                         except Exception:
                             pass
-                _submit(_core_ver)
+                _submit(_core_ver, "core")
             elif core_needed:
                 try:
                     msg = "未找到Git命令" if not app.git_path else ("ComfyUI未找到" if not root.exists() else "未找到")
@@ -274,10 +271,6 @@ def refresh_version_info(app, scope: str = "all"):
                         app.root.after(0, lambda: app.comfyui_version.set("未找到"))
                     except Exception:
                         pass
-            try:
-                executor.shutdown(wait=False)
-            except Exception:
-                pass
         finally:
             app._version_info_loading = False
-    threading.Thread(target=worker, daemon=True).start()
+    SCHED.submit(worker, key=f"version_info:scan:{scope}", priority=SCHED.PRIORITY_UI)
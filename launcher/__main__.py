@@ -0,0 +1,6 @@
+"""python -m launcher：无界面命令行入口，见 core/headless.py。"""
+import sys
+
+from core.headless import main
+
+sys.exit(main())
@@ -397,7 +397,6 @@ class AnnouncementService:
         self._log('info', 'announcement: start check enabled=%s', enabled)
         if not enabled:
             return
-        import threading
         def worker():
             data = self.fetch()
             if not data:
@@ -540,7 +539,8 @@ class AnnouncementService:
             except Exception:
                 pass
         try:
-            threading.Thread(target=worker, daemon=True).start()
+            from core import scheduler as SCHED
+            SCHED.submit(worker, key="announcement:check", priority=SCHED.PRIORITY_BACKGROUND)
         except Exception:
             pass
 
@@ -0,0 +1,281 @@
+import hmac
+import json
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from core import scheduler as SCHED
+
+DEFAULT_PORT = 18188
+BIND_HOST = "127.0.0.1"
+_LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "[::1]")
+
+
+class ControlService:
+    """本机回环控制接口：以 JSON 暴露启动、停止、状态、版本与批量更新。
+
+    仅监听 127.0.0.1，由配置 control_api.enabled 开启；所有请求需携带请求头
+    `X-Launcher-Token` 或 `Authorization: Bearer <token>`，control_api.token 为空时启动接口会生成
+    随机令牌并写回配置。带 Origin 的（浏览器发起的）请求一律拒绝，POST 须为 application/json，
+    使网页无法以“简单请求”跨站调用。各接口委托给 app.services 中的 process / version / update 服务，
+    涉及界面的操作投递到 Tk 主线程执行。
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._server = None
+        self._thread = None
+        self._update_lock = threading.Lock()
+        self._update_job = {"running": False, "started_at": None, "finished_at": None, "results": None, "summary": None, "error": None}
+
+    # ---------- 配置 ----------
+    def _cfg(self) -> dict:
+        try:
+            return self.app.config.get("control_api", {}) or {}
+        except Exception:
+            return {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._cfg().get("enabled", False))
+
+    @property
+    def port(self) -> int:
+        if self._server is not None:
+            return self._server.server_address[1]
+        try:
+            return int(self._cfg().get("port", DEFAULT_PORT))
+        except Exception:
+            return DEFAULT_PORT
+
+    def _token(self) -> str:
+        return str(self._cfg().get("token") or "").strip()
+
+    def _ensure_token(self) -> str:
+        """未配置令牌时生成随机令牌并写回配置，不允许无令牌访问。"""
+        token = self._token()
+        if token:
+            return token
+        token = secrets.token_urlsafe(24)
+        try:
+            self.app.config.setdefault("control_api", {})["token"] = token
+        except Exception:
+            pass
+        try:
+            cfg = getattr(self._services(), 'config', None)
+            if cfg is not None:
+                cfg.set("control_api.token", token)
+                cfg.save()
+            elif getattr(self.app, 'config_manager', None) is not None:
+                self.app.config_manager.save_config(self.app.config)
+        except Exception:
+            pass
+        try:
+            self.app.logger.info("控制接口已生成访问令牌（见配置 control_api.token）")
+        except Exception:
+            pass
+        return token
+
+    # ---------- 生命周期 ----------
+    def start(self, force: bool = False) -> bool:
+        if self._server is not None:
+            return True
+        if not (force or self.enabled):
+            return False
+        self._ensure_token()
+        service = self
+
+        class _Handler(_ControlHandler):
+            control = service
+
+        try:
+            self._server = ThreadingHTTPServer((BIND_HOST, self.port), _Handler)
+            self._server.daemon_threads = True
+        except Exception as e:
+            try:
+                self.app.logger.error("控制接口启动失败: %s", e)
+            except Exception:
+                pass
+            self._server = None
+            return False
+        self._thread = threading.Thread(target=self._server.serve_forever, name="control-api", daemon=True)
+        self._thread.start()
+        try:
+            self.app.logger.info("控制接口已启动: http://%s:%s", BIND_HOST, self.port)
+        except Exception:
+            pass
+        return True
+
+    def stop(self):
+        srv = self._server
+        self._server = None
+        if srv is None:
+            return
+        try:
+            srv.shutdown()
+            srv.server_close()
+        except Exception:
+            pass
+
+    # ---------- 调度 ----------
+    def _services(self):
+        return getattr(self.app, 'services', None)
+
+    def _post_ui(self, fn):
+        # 启动/停止会操作界面控件，统一投递到 Tk 主线程；无界面时直接执行
+        root = getattr(self.app, 'root', None)
+        if root is None:
+            fn()
+            return
+        root.after(0, fn)
+
+    def authorized(self, headers) -> bool:
+        token = self._token()
+        if not token:
+            return False
+        got = (headers.get("X-Launcher-Token") or "").strip()
+        if not got:
+            auth = (headers.get("Authorization") or "").strip()
+            if auth.lower().startswith("bearer "):
+                got = auth[7:].strip()
+        # 常数时间比较，避免按响应时间逐字节猜测令牌
+        return hmac.compare_digest(got.encode("utf-8"), token.encode("utf-8"))
+
+    def handle(self, method: str, path: str, body: dict = None):
+        """分发请求，返回 (HTTP 状态码, JSON 对象)。"""
+        routes = {
+            ("GET", "/status"): self.status,
+            ("GET", "/version"): self.version,
+            ("POST", "/start"): self.start_comfyui,
+            ("POST", "/stop"): self.stop_comfyui,
+            ("POST", "/update"): self.start_update,
+            ("GET", "/update"): self.update_status,
+        }
+        fn = routes.get((method, path.split("?", 1)[0].rstrip("/") or "/"))
+        if fn is None:
+            return 404, {"error": "not found"}
+        try:
+            return fn()
+        except Exception as e:
+            return 500, {"error": str(e)}
+
+    # ---------- 接口 ----------
+    def status(self):
+        svc = self._services()
+        return 200, svc.process.status()
+
+    def version(self):
+        svc = self._services()
+        data = {"core": svc.version.get_current_kernel_version()}
+        try:
+            data["frontend"] = svc.update.get_frontend_version()
+            data["templates"] = svc.update.get_templates_version()
+        except Exception:
+            pass
+        return 200, data
+
+    def start_comfyui(self):
+        svc = self._services()
+        st = svc.process.status()
+        if st.get("running") or getattr(self.app, '_launching', False):
+            return 409, {"error": "already running", "status": st}
+        # 与界面一键启动、命令行 start 相同：目标端口已被任何进程占用时不再启动新实例
+        from core.probe import find_pids_by_port_safe
+        port = str(st.get("port") or "").strip()
+        if not port:
+            try:
+                port = (self.app.custom_port.get() or "8188").strip()
+            except Exception:
+                port = "8188"
+        pids = find_pids_by_port_safe(port)
+        if pids:
+            return 409, {"error": "port in use", "port": port, "pids": sorted(pids), "status": st}
+        self._post_ui(svc.process.start)
+        return 202, {"accepted": "start"}
+
+    def stop_comfyui(self):
+        svc = self._services()
+        st = svc.process.status()
+        if not st.get("running"):
+            return 409, {"error": "not running", "status": st}
+        self._post_ui(svc.process.stop)
+        return 202, {"accepted": "stop"}
+
+    def start_update(self):
+        svc = self._services()
+        with self._update_lock:
+            if self._update_job["running"] or getattr(self.app, 'batch_updating', False):
+                return 409, {"error": "update in progress"}
+            self._update_job = {"running": True, "started_at": time.time(), "finished_at": None, "results": None, "summary": None, "error": None}
+
+        def _worker():
+            job = {}
+            try:
+                results, summary = svc.update.perform_batch_update()
+                job = {"results": results, "summary": summary}
+            except Exception as e:
+                job = {"error": str(e)}
+            with self._update_lock:
+                self._update_job.update(job)
+                self._update_job["running"] = False
+                self._update_job["finished_at"] = time.time()
+        SCHED.submit(_worker, key="control_api:update")
+        return 202, {"accepted": "update"}
+
+    def update_status(self):
+        with self._update_lock:
+            return 200, dict(self._update_job)
+
+
+class _ControlHandler(BaseHTTPRequestHandler):
+    control = None
+    server_version = "ComfyUILauncherControl/1"
+
+    def _send(self, code, data):
+        body = json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, method):
+        # 拒绝非回环 Host，防止 DNS 重绑定让浏览器页面调用本接口
+        host = (self.headers.get("Host") or "").lower()
+        if host.rsplit(":", 1)[0] not in _LOOPBACK_HOSTS:
+            self._send(403, {"error": "forbidden host"})
+            return
+        # 浏览器跨站请求必带 Origin；本接口只服务脚本，带 Origin 的请求一律拒绝
+        if self.headers.get("Origin") is not None:
+            self._send(403, {"error": "forbidden origin"})
+            return
+        if not self.control.authorized(self.headers):
+            self._send(401, {"error": "unauthorized"})
+            return
+        body = None
+        if method == "POST":
+            # 要求 application/json：网页无法以免预检的“简单请求”发出该类型
+            ctype = (self.headers.get("Content-Type") or "").split(";", 1)[0].strip().lower()
+            if ctype != "application/json":
+                self._send(415, {"error": "content-type must be application/json"})
+                return
+            try:
+                n = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(n) or b"{}") if n else {}
+            except Exception:
+                self._send(400, {"error": "invalid json"})
+                return
+        code, data = self.control.handle(method, self.path, body)
+        self._send(code, data)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def log_message(self, fmt, *args):
+        try:
+            self.control.app.logger.debug("控制接口 %s", fmt % args)
+        except Exception:
+            pass
@@ -8,11 +8,14 @@ from services.network_service import NetworkService
 from services.runtime_service import RuntimeService
 from services.announcement_service import AnnouncementService
 from services.startup_service import StartupService
+from services.control_service import ControlService
+from services.mirror_service import MirrorService
 
 
 class ServiceContainer:
     def __init__(self, process: ProcessService, version: VersionService, config: ConfigService,
-                 update: UpdateService, git: GitService, network: NetworkService, runtime: RuntimeService, announcement: AnnouncementService, startup: StartupService):
+                 update: UpdateService, git: GitService, network: NetworkService, runtime: RuntimeService, announcement: AnnouncementService, startup: StartupService,
+                 control: ControlService = None, mirror: MirrorService = None):
         self.process = process
         self.version = version
         self.config = config
@@ -22,6 +25,8 @@ class ServiceContainer:
         self.runtime = runtime
         self.announcement = announcement
         self.startup = startup
+        self.control = control
+        self.mirror = mirror
 
     @classmethod
     def from_app(cls, app):
@@ -42,4 +47,6 @@ class ServiceContainer:
             runtime=RuntimeService(app),
             announcement=AnnouncementService(app),
             startup=StartupService(app),
+            control=ControlService(app),
+            mirror=MirrorService(app),
         )
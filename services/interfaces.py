@@ -6,6 +6,7 @@ class IProcessService(Protocol):
     def toggle(self) -> None: ...
     def start(self) -> None: ...
     def stop(self) -> bool: ...
+    def status(self) -> dict: ...
     def refresh_status(self) -> None: ...
     def monitor(self) -> None: ...
 
@@ -0,0 +1,128 @@
+from core import mirror_race as RACE
+from core import scheduler as SCHED
+
+MODE_AUTO = "auto"
+
+_DEFAULTS = {
+    RACE.KIND_GITHUB: "https://gh-proxy.com/",
+    RACE.KIND_PYPI: "https://mirrors.aliyun.com/pypi/simple/",
+    RACE.KIND_HF: "https://hf-mirror.com",
+}
+
+
+class MirrorService:
+    """代理/镜像为“自动”时，按测速结果选择 GitHub、PyPI 与 HF 端点。"""
+
+    def __init__(self, app):
+        self.app = app
+
+    def _proxy_cfg(self) -> dict:
+        try:
+            return self.app.config.get('proxy_settings', {}) or {}
+        except Exception:
+            return {}
+
+    def _logger(self):
+        return getattr(self.app, 'logger', None)
+
+    def candidates(self, kind: str) -> list:
+        cfg = self._proxy_cfg()
+        if kind == RACE.KIND_GITHUB:
+            base, extra = list(RACE.GITHUB_CANDIDATES), cfg.get('git_proxy_url', '')
+            if extra and not extra.endswith('/'):
+                extra += '/'
+        elif kind == RACE.KIND_PYPI:
+            base, extra = list(RACE.PYPI_CANDIDATES), cfg.get('pypi_proxy_url', '')
+        else:
+            base, extra = list(RACE.HF_CANDIDATES), cfg.get('hf_mirror_url', '')
+        extra = (extra or '').strip()
+        if extra and extra not in base:
+            base.append(extra)
+        return base
+
+    def _probe(self, kind: str):
+        if kind == RACE.KIND_GITHUB:
+            git_cmd = getattr(self.app, 'git_path', None) or 'git'
+            return lambda c: RACE.probe_github(c, git_cmd)
+        if kind == RACE.KIND_PYPI:
+            return RACE.probe_pypi
+        return RACE.probe_hf
+
+    def race(self, kind: str):
+        """同步测速并记录结果，返回胜出端点（全部失败时返回 None 且不覆盖旧结果）。"""
+        best, results = RACE.race(self.candidates(kind), self._probe(kind))
+        logger = self._logger()
+        try:
+            if logger:
+                logger.info("镜像测速 %s: best=%s results=%s", kind, best if best is not None else '<none>',
+                            {k or '<direct>': (round(v, 3) if v is not None else None) for k, v in results.items()})
+        except Exception:
+            pass
+        if best is not None:
+            previous = RACE.cached(kind)
+            RACE.remember(kind, best, results)
+            # PyPI 胜者变化时重写 pip.ini
+            if kind == RACE.KIND_PYPI and (not previous or previous.get("url") != best):
+                try:
+                    if kind in self.auto_kinds() and getattr(self.app, 'services', None):
+                        self.app.services.network.apply_pip_proxy_settings()
+                except Exception:
+                    pass
+        return best
+
+    def refresh(self, kind: str):
+        """后台重新测速；同类测速进行中时不重复提交。"""
+        return SCHED.submit(self.race, kind, key=f"mirror:race:{kind}", priority=SCHED.PRIORITY_BACKGROUND)
+
+    def best(self, kind: str) -> str:
+        """立即返回当前选择：有记录用记录（过期则后台重新测速），无记录先用默认镜像并后台测速。"""
+        entry = RACE.cached(kind, self.candidates(kind))
+        if not RACE.is_fresh(entry):
+            try:
+                self.refresh(kind)
+            except Exception:
+                pass
+        if entry:
+            return entry["url"]
+        return _DEFAULTS.get(kind, '')
+
+    def refresh_stale(self):
+        """启动时调用：对设为“自动”的类别在后台刷新过期的测速结果。"""
+        for kind in self.auto_kinds():
+            if not RACE.is_fresh(RACE.cached(kind, self.candidates(kind))):
+                try:
+                    self.refresh(kind)
+                except Exception:
+                    pass
+
+    def auto_kinds(self) -> list:
+        kinds = []
+        try:
+            vm = getattr(self.app, 'version_manager', None)
+            git_mode = vm.proxy_mode_var.get() if vm else self._proxy_cfg().get('git_proxy_mode')
+            if git_mode == MODE_AUTO:
+                kinds.append(RACE.KIND_GITHUB)
+        except Exception:
+            pass
+        try:
+            if self.app.pypi_proxy_mode.get() == MODE_AUTO:
+                kinds.append(RACE.KIND_PYPI)
+        except Exception:
+            pass
+        try:
+            if self.app.selected_hf_mirror.get() == "自动":
+                kinds.append(RACE.KIND_HF)
+        except Exception:
+            pass
+        return kinds
+
+    # ---------- 供各调用点使用 ----------
+    def github_base(self) -> str:
+        """GitHub 代理前缀（以 / 结尾）；直连时返回空串。"""
+        return self.best(RACE.KIND_GITHUB)
+
+    def pypi_index(self) -> str:
+        return self.best(RACE.KIND_PYPI)
+
+    def hf_endpoint(self) -> str:
+        return self.best(RACE.KIND_HF)
@@ -6,10 +6,17 @@ class NetworkService:
         self.app = app
 
     def apply_pip_proxy_settings(self):
+        mode = self.app.pypi_proxy_mode.get()
+        url = self.app.pypi_proxy_url.get()
+        if mode == 'auto':
+            # 自动：写入测速最快的索引；官方源最快时不写 index-url
+            svc = getattr(self.app, 'services', None)
+            url = svc.mirror.pypi_index() if svc and getattr(svc, 'mirror', None) else NET.PYPI_ALIYUN_URL
+            mode = 'none' if url == NET.PYPI_OFFICIAL_URL else 'custom'
         NET.apply_pip_proxy_settings(
             self.app.python_exec,
-            self.app.pypi_proxy_mode.get(),
-            self.app.pypi_proxy_url.get(),
+            mode,
+            url,
             "",
             logger=self.app.logger,
         )
\ No newline at end of file
@@ -15,6 +15,9 @@ class ProcessService(IProcessService):
     def stop(self) -> bool:
         return self.pm.stop_comfyui()
 
+    def status(self) -> dict:
+        return self.pm.status_snapshot()
+
     def refresh_status(self) -> None:
         try:
             self.pm.refresh_running_status_async()
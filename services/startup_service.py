@@ -1,4 +1,4 @@
-from concurrent.futures import ThreadPoolExecutor
+from core.scheduler import get_scheduler, PRIORITY_UI, PRIORITY_BACKGROUND
 
 
 class StartupService:
@@ -6,10 +6,7 @@ class StartupService:
         self.app = app
 
     def start_all(self):
-        try:
-            ex = ThreadPoolExecutor(max_workers=2)
-        except Exception:
-            ex = None
+        scheduler = get_scheduler()
         # 版本信息（后台刷新，界面先显示“获取中…”）
         def _version_task():
             try:
@@ -24,14 +21,21 @@ class StartupService:
                     self.app.services.announcement.show_if_available()
             except Exception:
                 pass
-        # 其他可扩展任务占位
-        tasks = [_version_task, _announcement_task]
-        for t in tasks:
+        # 设为“自动”的代理/镜像：后台刷新过期的测速结果
+        def _mirror_task():
             try:
-                if ex:
-                    ex.submit(t)
-                else:
-                    import threading
-                    threading.Thread(target=t, daemon=True).start()
+                if getattr(self.app, 'services', None) and getattr(self.app.services, 'mirror', None):
+                    self.app.services.mirror.refresh_stale()
+            except Exception:
+                pass
+        # 同 key 任务排队或执行中时不会重复提交
+        tasks = [
+            ("startup:version_info", PRIORITY_UI, _version_task),
+            ("startup:announcement", PRIORITY_BACKGROUND, _announcement_task),
+            ("startup:mirror_race", PRIORITY_BACKGROUND, _mirror_task),
+        ]
+        for key, priority, t in tasks:
+            try:
+                scheduler.submit(t, key=key, priority=priority)
             except Exception:
                 pass
@@ -31,18 +31,24 @@ class UpdateService:
         except Exception:
             return None
 
-    def update_frontend(self, notify: bool = False) -> Dict[str, Any]:
-        idx = None
+    def _pypi_index(self):
         try:
             mode = self.app.pypi_proxy_mode.get()
             if mode == 'aliyun':
-                idx = 'https://mirrors.aliyun.com/pypi/simple/'
-            elif mode == 'custom':
+                return 'https://mirrors.aliyun.com/pypi/simple/'
+            if mode == 'custom':
                 u = (self.app.pypi_proxy_url.get() or '').strip()
-                if u:
-                    idx = u
+                return u or None
+            if mode == 'auto':
+                svc = getattr(self.app, 'services', None)
+                if svc and getattr(svc, 'mirror', None):
+                    return svc.mirror.pypi_index() or None
         except Exception:
-            idx = None
+            pass
+        return None
+
+    def update_frontend(self, notify: bool = False) -> Dict[str, Any]:
+        idx = self._pypi_index()
         pkg = "comfyui-frontend-package"
         spec = None
         try:
@@ -66,17 +72,7 @@ class UpdateService:
         }
 
     def update_templates(self, notify: bool = False) -> Dict[str, Any]:
-        idx = None
-        try:
-            mode = self.app.pypi_proxy_mode.get()
-            if mode == 'aliyun':
-                idx = 'https://mirrors.aliyun.com/pypi/simple/'
-            elif mode == 'custom':
-                u = (self.app.pypi_proxy_url.get() or '').strip()
-                if u:
-                    idx = u
-        except Exception:
-            idx = None
+        idx = self._pypi_index()
         pkg = "comfyui-workflow-templates"
         spec = None
         try:
@@ -1,10 +1,9 @@
-import re
 import time
-import json
-from urllib.request import urlopen, Request
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple, List
 from services.interfaces import IVersionService
+from core import releases_cache as RELEASES
+from core import stable_index as STABLE
 from utils.common import run_hidden
 
 
@@ -17,39 +16,89 @@ class VersionService(IVersionService):
         refresh_version_info(self.app, scope)
 
     def is_stable_version(self, tag: str) -> bool:
-        # 优先通过 GitHub Releases 判断：存在且非 prerelease 即稳定
-        if not tag:
-            return False
+        # GitHub Releases 中存在且非 prerelease 即稳定，否则按语义化版本规则；不访问网络
+        return self.is_stable(tag)
+
+    def _known_releases(self) -> List[Dict[str, Any]]:
+        """已取得的 Releases：本次会话内存中的，否则为磁盘缓存（不论新旧）；不发起网络请求。"""
+        cache = getattr(self.app, '_releases_cache', None)
+        if cache:
+            return cache
         try:
-            releases = self._get_releases()
-            for rel in releases:
-                if str(rel.get('tag_name', '')).strip() == tag:
-                    return bool(not rel.get('prerelease', False))
+            owner, repo = self._origin_repo()
+            hit = RELEASES.entry(f"{owner}/{repo}") if owner and repo else None
+            if hit and hit.get('releases'):
+                setattr(self.app, '_releases_cache', hit['releases'])
+                return hit['releases']
         except Exception:
             pass
-        # 回退到语义化版本规则
-        t = tag.strip().lower()
-        if t.startswith('v'):
-            t = t[1:]
-        if any(x in t for x in ['-alpha', '-beta', '-rc', 'dev']):
-            return False
-        return bool(re.match(r"^\d+\.\d+\.\d+(?:[+][\w.-]+)?$", t))
+        return []
+
+    def release_map(self) -> Dict[str, bool]:
+        """{标签: 是否稳定}，每次 Releases 刷新后重建一次。"""
+        releases = self._known_releases()
+        hit = getattr(self, '_release_map_cache', None)
+        if hit is None or hit[0] is not releases:
+            rmap = STABLE.release_map(releases)
+            hit = self._release_map_cache = (releases, rmap, STABLE.releases_signature(rmap))
+        return hit[1]
+
+    def is_stable(self, tag: str) -> bool:
+        try:
+            return STABLE.is_stable(tag, self.release_map())
+        except Exception:
+            return STABLE.semver_stable(tag)
 
     def _run_git(self, cmd: list, **kwargs):
         # 包装 run_hidden 以处理 git ownership 问题
         cwd = kwargs.get('cwd')
-        r = run_hidden(cmd, **kwargs)
+
+        def _run():
+            # 带输出的查询经 core.git_query：小查询由常驻 cat-file 进程/缓存回答，其余走有界池
+            if kwargs.get('capture_output') and cwd:
+                from core import git_query as GQ
+                return GQ.run(cmd[0], cwd, cmd[1:], timeout=kwargs.get('timeout'))
+            return run_hidden(cmd, **kwargs)
+        r = _run()
         if r.returncode != 0 and "dubious ownership" in (r.stderr or ""):
             try:
                 target_cwd = cwd or self._repo_root()
                 if getattr(self.app, 'services', None) and getattr(self.app.services, 'git', None):
                     self.app.services.git.fix_unsafe_repo(target_cwd)
-                    return run_hidden(cmd, **kwargs)
+                    if cwd:
+                        from core import git_query as GQ
+                        GQ.get(cmd[0], cwd).close()
+                    return _run()
             except Exception:
                 pass
         return r
 
+    def tag_index(self, force: bool = False) -> Dict[str, str]:
+        """{标签: 提交哈希}，一次 for-each-ref 取得并按 refs 变化缓存。"""
+        from core import tag_index as TAGS
+        root = self._repo_root()
+        return TAGS.load(root, lambda args: self._run_git(['git'] + args, capture_output=True, text=True, timeout=10, cwd=root), force=force)
+
+    def stable_commits(self) -> Dict[str, str]:
+        """{稳定标签: 提交哈希}；标签引用与 Releases 均未变化时直接取内存/磁盘缓存。"""
+        rmap = self.release_map()
+        rsig = self._release_map_cache[2]
+        return STABLE.stable_commits(self._repo_root(), self.tag_index, rmap, rsig)
+
+    def stable_tag_commits(self) -> Dict[str, str]:
+        """{稳定标签: 提交哈希}。"""
+        return self.stable_commits()
+
+    def stable_commit_hashes(self) -> set:
+        return set(self.stable_tag_commits().values())
+
     def _list_tags(self) -> list:
+        try:
+            index = self.tag_index()
+            if index:
+                return list(index)
+        except Exception:
+            pass
         try:
             r = self._run_git(['git', 'tag', '--list'], capture_output=True, text=True, timeout=10, cwd=self._repo_root())
             if r and r.returncode == 0:
@@ -59,6 +108,14 @@ class VersionService(IVersionService):
         return []
 
     def _tag_commit(self, tag: str) -> Optional[str]:
+        from core import tag_index as TAGS
+        try:
+            root = self._repo_root()
+            commit = TAGS.lookup(root, tag, lambda args: self._run_git(['git'] + args, capture_output=True, text=True, timeout=10, cwd=root))
+            if commit:
+                return commit
+        except Exception:
+            pass
         try:
             r = self._run_git(['git', 'rev-list', '-n', '1', tag], capture_output=True, text=True, timeout=10, cwd=self._repo_root())
             if r and r.returncode == 0:
@@ -105,6 +162,10 @@ class VersionService(IVersionService):
             url = (self.app.config.get('proxy_settings', {}) or {}).get('git_proxy_url', '').strip()
             if mode == 'gh-proxy':
                 return f"https://gh-proxy.com/{base}"
+            if mode == 'auto':
+                svc = getattr(self.app, 'services', None)
+                prefix = svc.mirror.github_base() if svc and getattr(svc, 'mirror', None) else ''
+                return f"{prefix}{base}" if prefix else base
             if mode == 'custom' and url:
                 if not url.endswith('/'):
                     url += '/'
@@ -121,22 +182,24 @@ class VersionService(IVersionService):
         if not owner or not repo:
             return []
         url = self._compute_api_url(owner, repo)
+        # 磁盘缓存 + 条件请求：force_refresh 时总是向服务端确认（304 不计入速率限制），离线时返回旧数据
         try:
-            req = Request(url, headers={'Accept': 'application/vnd.github+json', 'User-Agent': 'ComfyUI-Launcher'})
-            with urlopen(req, timeout=10) as resp:
-                data = json.loads(resp.read().decode('utf-8'))
-                if isinstance(data, list):
-                    setattr(self.app, '_releases_cache', data)
-                    return data
+            data, source = RELEASES.load(f"{owner}/{repo}", url, max_age=0 if force_refresh else RELEASES.DEFAULT_MAX_AGE)
         except Exception:
             return []
-        return []
+        if data:
+            setattr(self.app, '_releases_cache', data)
+        try:
+            self.app.logger.info("releases: %s/%s count=%d source=%s", owner, repo, len(data), source or 'none')
+        except Exception:
+            pass
+        return data
 
     def get_latest_stable_kernel(self, force_refresh: bool = False) -> Dict[str, Any]:
         cache = getattr(self.app, '_stable_kernel_cache', None)
         if cache and (not force_refresh):
             return cache
-        releases = self._get_releases(force_refresh=True)
+        releases = self._get_releases(force_refresh=force_refresh)
         latest_tag = None
         # releases 默认按创建时间降序，取第一个非 prerelease
         for rel in releases:
@@ -185,9 +248,7 @@ class VersionService(IVersionService):
     def upgrade_to_commit(self, commit: str, stable_only: bool = False) -> Dict[str, Any]:
         if stable_only:
             # 检查该提交是否对应稳定标签
-            tags = self._list_tags()
-            stable_hashes = set(filter(None, (self._tag_commit(t) for t in tags if self.is_stable_version(t))))
-            if commit not in stable_hashes:
+            if commit not in self.stable_commit_hashes():
                 return {"component": "core", "error_code": "NON_STABLE", "error": "commit not stable"}
         return self._checkout_commit(commit)
 
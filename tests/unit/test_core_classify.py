@@ -0,0 +1,89 @@
+import contextlib
+import types
+import unittest
+from unittest import mock
+
+
+class FakeProc:
+    reads = 0
+
+    def __init__(self, pid, ctime, cmdline, exe="", cwd=""):
+        self.pid = pid
+        self.info = {"pid": pid, "create_time": ctime}
+        self._ctime = ctime
+        self._cmdline = cmdline
+        self._exe = exe
+        self._cwd = cwd
+
+    def oneshot(self):
+        return contextlib.nullcontext()
+
+    def create_time(self):
+        return self._ctime
+
+    def cmdline(self):
+        FakeProc.reads += 1
+        if isinstance(self._cmdline, Exception):
+            raise self._cmdline
+        return self._cmdline
+
+    def exe(self):
+        return self._exe
+
+    def cwd(self):
+        return self._cwd
+
+
+def _fake_psutil(procs):
+    table = {p.pid: p for p in procs}
+    return types.SimpleNamespace(
+        Process=lambda pid: table[pid],
+        process_iter=lambda attrs=None: list(procs),
+    )
+
+
+class TestComfyClassification(unittest.TestCase):
+    def setUp(self):
+        from core import probe
+        probe.clear_classification_cache()
+        FakeProc.reads = 0
+
+    def test_bulk_classification_uses_cache(self):
+        from core import probe
+        procs = [
+            FakeProc(10, 1.0, ["python", "main.py", "--windows-standalone-build"]),
+            FakeProc(11, 1.0, ["bash"]),
+            FakeProc(12, 1.0, ["python"], cwd="/srv/ComfyUI"),
+        ]
+        with mock.patch.object(probe, "psutil", _fake_psutil(procs)):
+            self.assertEqual(sorted(probe.find_comfyui_pids()), [10, 12])
+            self.assertEqual(FakeProc.reads, 3)
+            self.assertEqual(sorted(probe.find_comfyui_pids()), [10, 12])
+            self.assertEqual(FakeProc.reads, 3)
+            self.assertTrue(probe.is_comfyui_pid(object(), 10))
+            self.assertFalse(probe.is_comfyui_pid(object(), 11))
+            self.assertEqual(FakeProc.reads, 3)
+
+    def test_reused_pid_is_reclassified(self):
+        from core import probe
+        old = [FakeProc(20, 1.0, ["python", "comfyui/main.py"])]
+        new = [FakeProc(20, 2.0, ["sshd"])]
+        with mock.patch.object(probe, "psutil", _fake_psutil(old)):
+            self.assertEqual(probe.find_comfyui_pids(), [20])
+        with mock.patch.object(probe, "psutil", _fake_psutil(new)):
+            self.assertEqual(probe.find_comfyui_pids(), [])
+            self.assertFalse(probe.is_comfyui_pid(object(), 20))
+
+    def test_unreadable_process_is_not_cached_as_negative(self):
+        from core import probe
+        proc = FakeProc(30, 1.0, PermissionError("access denied"))
+        with mock.patch.object(probe, "psutil", _fake_psutil([proc])):
+            self.assertEqual(probe.find_comfyui_pids(), [])
+            self.assertFalse(probe.is_comfyui_pid(object(), 30))
+            # 权限恢复（或进程完成初始化）后能被识别
+            proc._cmdline = ["python", "ComfyUI/main.py"]
+            self.assertEqual(probe.find_comfyui_pids(), [30])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,78 @@
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from core import commit_history as H
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", *args], cwd=str(repo), capture_output=True, text=True, check=True)
+
+
+class TestHistoryWindow(unittest.TestCase):
+    def test_slide_keeps_bounded_window(self):
+        win = H.HistoryWindow(chunk=10, max_rows=30)
+        first = win.reset(list(range(100)))
+        self.assertEqual(first, list(range(20)))
+        for _ in range(3):
+            win.slide_down()
+        self.assertEqual((win.start, win.end), (20, 50))
+        rows, dropped = win.slide_down()
+        self.assertEqual((rows, dropped), (list(range(50, 60)), 10))
+        rows, dropped = win.slide_up()
+        self.assertEqual((rows, dropped), (list(range(20, 30)), 10))
+        self.assertEqual((win.start, win.end), (20, 50))
+
+    def test_extend_then_slide_to_end(self):
+        win = H.HistoryWindow(chunk=10, max_rows=30)
+        win.reset(list(range(15)))
+        self.assertTrue(win.at_end)
+        win.extend(list(range(25)))
+        self.assertFalse(win.at_end)
+        rows, _ = win.slide_down()
+        self.assertEqual(rows, list(range(15, 25)))
+        self.assertTrue(win.at_end)
+
+
+class TestCommitHistoryModel(unittest.TestCase):
+    def test_view_filters_and_search(self):
+        hist = H.CommitHistory()
+        hist.reset("main", [
+            {"hash": "aaaa1111", "full_hash": "aaaa1111" + "0" * 32, "date": "d", "author": "x", "message": "Fix sampler"},
+            {"hash": "bbbb2222", "full_hash": "bbbb2222" + "0" * 32, "date": "d", "author": "y", "message": "Add node"},
+        ])
+        stable = {"bbbb2222" + "0" * 32}
+        self.assertEqual([c["hash"] for c in hist.view("stable", stable)], ["bbbb2222"])
+        self.assertEqual([c["hash"] for c in hist.view("test", stable)], ["aaaa1111"])
+        self.assertEqual([c["hash"] for c in hist.view("all", stable, "SAMPLER")], ["aaaa1111"])
+        self.assertEqual([c["hash"] for c in hist.view("all", stable, "bbbb")], ["bbbb2222"])
+        self.assertEqual(hist.find("aaaa")["message"], "Fix sampler")
+
+
+@unittest.skipUnless(shutil.which("git"), "需要 git")
+class TestCommitHistoryPaging(unittest.TestCase):
+    def test_pages_until_exhausted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = Path(tmp)
+            _git(repo, "init", "-q")
+            _git(repo, "config", "user.email", "t@example.com")
+            _git(repo, "config", "user.name", "t")
+            for i in range(7):
+                _git(repo, "commit", "-q", "--allow-empty", "-m", f"c{i}")
+
+            def run(args):
+                return subprocess.run(["git", *args], cwd=str(repo), capture_output=True, text=True)
+            hist = H.CommitHistory("HEAD", page_size=3)
+            self.assertEqual(hist.load_more(run), 3)
+            self.assertEqual(hist.load_more(run), 3)
+            self.assertFalse(hist.exhausted)
+            self.assertEqual(hist.load_more(run), 1)
+            self.assertTrue(hist.exhausted)
+            self.assertEqual(hist.load_more(run), 0)
+            self.assertEqual([c["message"] for c in hist.commits], [f"c{i}" for i in range(6, -1, -1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+
+class TestConsoleBuffer(unittest.TestCase):
+    def test_incremental_read(self):
+        from core.console_buffer import ConsoleBuffer
+        buf = ConsoleBuffer(max_lines=5)
+        for i in range(3):
+            buf.append(f"l{i}")
+        lines, seq, truncated = buf.read_since(0)
+        self.assertEqual(lines, ["l0", "l1", "l2"])
+        self.assertFalse(truncated)
+        buf.append("l3")
+        lines, seq, truncated = buf.read_since(seq)
+        self.assertEqual(lines, ["l3"])
+        self.assertEqual(buf.read_since(seq), ([], seq, False))
+
+    def test_overflow_reports_truncation(self):
+        from core.console_buffer import ConsoleBuffer
+        buf = ConsoleBuffer(max_lines=3)
+        for i in range(10):
+            buf.append(f"l{i}")
+        self.assertEqual(len(buf), 3)
+        lines, seq, truncated = buf.read_since(2)
+        self.assertTrue(truncated)
+        self.assertEqual(lines, ["l7", "l8", "l9"])
+        self.assertEqual(seq, 10)
+
+    def test_clear_reports_truncation_to_caught_up_reader(self):
+        from core.console_buffer import ConsoleBuffer
+        buf = ConsoleBuffer(max_lines=5)
+        buf.append("old")
+        _, seq, _ = buf.read_since(0)
+        buf.clear()
+        buf.append("new")
+        lines, seq2, truncated = buf.read_since(seq)
+        self.assertTrue(truncated)
+        self.assertEqual(lines, ["new"])
+        self.assertEqual(buf.read_since(seq2), ([], seq2, False))
+
+    def test_long_lines_are_capped(self):
+        from core.console_buffer import ConsoleBuffer
+        buf = ConsoleBuffer(max_lines=2, max_line_chars=10)
+        buf.append("x" * 100)
+        self.assertLessEqual(len(buf.snapshot()[0]), 12)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,108 @@
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from core import fetch_strategy as F
+from core import tag_index as TAGS
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", *args], cwd=str(repo), capture_output=True, text=True, check=True)
+
+
+class TestFetchParsing(unittest.TestCase):
+    def test_received_bytes_from_progress(self):
+        err = ("remote: Enumerating objects: 5, done.\r\n"
+               "Receiving objects:  40% (2/5), 1.00 KiB | 1 KiB/s\r"
+               "Receiving objects: 100% (5/5), 2.50 MiB | 3.00 MiB/s, done.\n")
+        self.assertEqual(F.parse_received_bytes(err), int(2.5 * 1024 * 1024))
+        self.assertEqual(F.parse_received_bytes("Unpacking objects: 100% (3/3), 812 bytes | 0 bytes/s, done."), 812)
+        self.assertEqual(F.parse_received_bytes(""), 0)
+
+    def test_only_new_or_moved_tags_are_missing(self):
+        out = ("a" * 40 + "\trefs/tags/v1\n"
+               + "b" * 40 + "\trefs/tags/v2\n"
+               + "c" * 40 + "\trefs/tags/v2^{}\n"
+               + "d" * 40 + "\trefs/tags/v3\n")
+        remote = F.parse_ls_remote_tags(out)
+        self.assertEqual(remote["v2"], "c" * 40)
+        local = {"v1": "a" * 40, "v2": "c" * 40, "v3": "0" * 40}
+        self.assertEqual(F.missing_tags(remote, local), ["v3"])
+
+    def test_branch_args(self):
+        args = F.branch_args(F.MODE_SHALLOW, "https://proxy/x.git", "master", depth=10)
+        self.assertIn("--depth=10", args)
+        self.assertIn("--no-tags", args)
+        self.assertEqual(args[-1], "+refs/heads/master:refs/remotes/origin/master")
+        self.assertEqual(F.branch_args(F.MODE_FULL, "origin", "master"), ["fetch", "--progress", "--all", "--prune"])
+
+
+@unittest.skipUnless(shutil.which("git"), "需要 git")
+class TestFetchStrategyGit(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.upstream = root / "upstream"
+        self.upstream.mkdir()
+        _git(self.upstream, "init", "-q", "-b", "master")
+        _git(self.upstream, "config", "user.email", "t@example.com")
+        _git(self.upstream, "config", "user.name", "t")
+        _git(self.upstream, "commit", "-q", "--allow-empty", "-m", "c0")
+        _git(self.upstream, "tag", "v0")
+        self.repo = root / "clone"
+        _git(root, "clone", "-q", str(self.upstream), str(self.repo))
+        self.calls = []
+        TAGS.invalidate()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_git(self, args):
+        self.calls.append(list(args))
+        return subprocess.run(["git", *args], cwd=str(self.repo), capture_output=True, text=True)
+
+    def test_branch_fetch_with_new_tags_only(self):
+        _git(self.upstream, "commit", "-q", "--allow-empty", "-m", "c1")
+        _git(self.upstream, "tag", "-a", "v1", "-m", "v1")
+        _git(self.upstream, "branch", "other")
+        self.assertEqual(F.resolve_mode(F.MODE_AUTO, self.repo, self.run_git), F.MODE_BRANCH)
+        res = F.fetch(self.run_git, self.repo, "origin", "master", mode=F.MODE_AUTO)
+        self.assertTrue(res.ok, res.stderr)
+        self.assertEqual(res.mode, F.MODE_BRANCH)
+        self.assertEqual(res.tags_fetched, 1)
+        tag_fetch = [c for c in self.calls if c[0] == "fetch" and any("refs/tags/" in a for a in c)]
+        self.assertEqual(tag_fetch[0][-1], "+refs/tags/v1:refs/tags/v1")
+        self.assertEqual(_git(self.repo, "rev-parse", "origin/master").stdout,
+                         _git(self.upstream, "rev-parse", "master").stdout)
+        self.assertNotEqual(subprocess.run(["git", "rev-parse", "--verify", "origin/other"], cwd=str(self.repo),
+                                           capture_output=True).returncode, 0)
+        self.assertGreaterEqual(res.seconds, 0.0)
+
+    def test_shallow_mode_only_for_shallow_clones(self):
+        self.assertEqual(F.resolve_mode(F.MODE_SHALLOW, self.repo, self.run_git), F.MODE_BRANCH)
+        shallow = Path(self.tmp.name) / "shallow"
+        _git(self.tmp.name, "clone", "-q", "--depth=1", self.upstream.as_uri(), str(shallow))
+        self.assertEqual(F.resolve_mode(F.MODE_SHALLOW, shallow, self.run_git), F.MODE_SHALLOW)
+        # auto 不会隐式改用按深度截断的拉取
+        self.assertEqual(F.resolve_mode(F.MODE_AUTO, shallow, self.run_git), F.MODE_BRANCH)
+
+    def test_shallow_fetch_deepens_when_behind_more_than_depth(self):
+        shallow = Path(self.tmp.name) / "shallow"
+        _git(self.tmp.name, "clone", "-q", "--depth=1", self.upstream.as_uri(), str(shallow))
+        for i in range(12):
+            _git(self.upstream, "commit", "-q", "--allow-empty", "-m", f"n{i}")
+        self.repo = shallow
+        res = F.fetch(self.run_git, shallow, "origin", "master", mode=F.MODE_SHALLOW, depth=3, tags=False)
+        self.assertTrue(res.ok, res.stderr)
+        self.assertEqual(res.mode, F.MODE_SHALLOW)
+        self.assertTrue(any(a.startswith("--deepen=") for c in self.calls for a in c))
+        self.assertTrue(F.is_connected(self.run_git, "master"))
+        _git(shallow, "merge", "--ff-only", "refs/remotes/origin/master")
+        self.assertEqual(_git(shallow, "rev-parse", "HEAD").stdout,
+                         _git(self.upstream, "rev-parse", "master").stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
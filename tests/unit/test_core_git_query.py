@@ -0,0 +1,97 @@
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from core import git_query as GQ
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", *args], cwd=str(repo), capture_output=True, text=True, check=True)
+
+
+@unittest.skipUnless(shutil.which("git"), "需要 git")
+class TestGitQuery(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo = Path(self.tmp.name)
+        _git(self.repo, "init", "-q")
+        _git(self.repo, "config", "user.email", "t@example.com")
+        _git(self.repo, "config", "user.name", "t")
+        _git(self.repo, "remote", "add", "origin", "https://github.com/comfyanonymous/ComfyUI.git")
+        (self.repo / "a.txt").write_text("hello", encoding="utf-8")
+        _git(self.repo, "add", "a.txt")
+        _git(self.repo, "commit", "-q", "-m", "a")
+        _git(self.repo, "tag", "v0.1.0")
+        self.head = _git(self.repo, "rev-parse", "HEAD").stdout.strip()
+        self.q = GQ.GitQuery("git", self.repo)
+
+    def tearDown(self):
+        self.q.close()
+        self.tmp.cleanup()
+
+    def test_rev_parse_answered_over_pipe(self):
+        with mock.patch.object(GQ, "run_hidden", side_effect=AssertionError("spawned")):
+            r = self.q.run(["rev-parse", "--verify", "HEAD"])
+            self.assertEqual((r.returncode, r.stdout.strip()), (0, self.head))
+            r = self.q.run(["rev-parse", "--verify", "no-such-branch"])
+            self.assertNotEqual(r.returncode, 0)
+            self.assertEqual(self.q.read_object("HEAD:a.txt"), ("blob", b"hello"))
+        self.assertEqual(self.q._check.proc.pid, self.q._check._ensure().pid)
+
+    def test_small_commands_cached(self):
+        expected_short = _git(self.repo, "rev-parse", "--short", "HEAD").stdout.strip()
+        cmds = (["rev-parse", "--short", "HEAD"], ["describe", "--tags", "--abbrev=0"], ["remote", "get-url", "origin"])
+        first = [self.q.run(c).stdout.strip() for c in cmds]
+        with mock.patch.object(GQ, "run_hidden", side_effect=AssertionError("spawned")):
+            again = [self.q.run(c).stdout.strip() for c in cmds]
+        self.assertEqual(first, again)
+        self.assertEqual(first[:2], [expected_short, "v0.1.0"])
+        self.assertIn("ComfyUI", first[2])
+
+    def test_describe_follows_new_tag(self):
+        self.assertEqual(self.q.run(["describe", "--tags", "--abbrev=0"]).stdout.strip(), "v0.1.0")
+        (self.repo / "a.txt").write_text("b", encoding="utf-8")
+        _git(self.repo, "commit", "-q", "-am", "b")
+        _git(self.repo, "tag", "v0.2.0")
+        self.assertEqual(self.q.run(["describe", "--tags", "--abbrev=0"]).stdout.strip(), "v0.2.0")
+
+    def test_branch_and_symbolic_ref_without_git(self):
+        _git(self.repo, "update-ref", "refs/remotes/origin/master", self.head)
+        _git(self.repo, "symbolic-ref", "refs/remotes/origin/HEAD", "refs/remotes/origin/master")
+        branch = _git(self.repo, "branch", "--show-current").stdout
+        with mock.patch.object(GQ, "run_hidden", side_effect=AssertionError("spawned")):
+            self.assertEqual(self.q.run(["branch", "--show-current"]).stdout, branch)
+            r = self.q.run(["symbolic-ref", "refs/remotes/origin/HEAD"])
+            self.assertEqual(r.stdout.strip(), "refs/remotes/origin/master")
+        self.assertIsNone(self.q._check.proc)
+
+    def test_other_commands_use_pool(self):
+        r = self.q.run(["log", "-1", "--format=%s"])
+        self.assertEqual(r.stdout.strip(), "a")
+
+    def test_quick_queries_bypass_busy_pool(self):
+        # 长命令占满有界池时，小查询仍能立即执行
+        for _ in range(GQ.MAX_CONCURRENT_GIT):
+            GQ._pool.acquire()
+        try:
+            r = self.q.porcelain(["config", "--get", "user.name"], timeout=10)
+            self.assertEqual(r.returncode, 0)
+            self.assertFalse(GQ._pool.acquire(blocking=False))
+        finally:
+            for _ in range(GQ.MAX_CONCURRENT_GIT):
+                GQ._pool.release()
+
+    def test_dead_process_restarted(self):
+        # 引用名由 utils.git_refs 直接回答，这里用需要 cat-file 的表达式
+        self.q.resolve("HEAD^{commit}")
+        old = self.q._check.proc
+        old.kill()
+        old.wait()
+        self.assertEqual(self.q.resolve("HEAD^{commit}"), self.head)
+        self.assertIsNot(self.q._check.proc, old)
+
+if __name__ == "__main__":
+    unittest.main()
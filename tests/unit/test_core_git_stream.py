@@ -0,0 +1,65 @@
+import shutil
+import subprocess
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from core.git_stream import GitStream
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", *args], cwd=str(repo), capture_output=True, text=True, check=True)
+
+
+@unittest.skipUnless(shutil.which("git"), "需要 git")
+class TestGitStream(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo = Path(self.tmp.name)
+        _git(self.repo, "init", "-q")
+        _git(self.repo, "config", "user.email", "t@example.com")
+        _git(self.repo, "config", "user.name", "t")
+        (self.repo / "big.txt").write_text("".join(f"第 {i} 行\n" for i in range(20000)), encoding="utf-8")
+        _git(self.repo, "add", "big.txt")
+        _git(self.repo, "commit", "-q", "-m", "big")
+        self.chunks = []
+        self.paused = threading.Event()
+        self.done = threading.Event()
+        self.result = None
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _stream(self, limit):
+        def on_done(rc, err, cancelled):
+            self.result = (rc, cancelled)
+            self.done.set()
+        return GitStream("git", self.repo, ["show", "--patch", "HEAD"], self.chunks.append,
+                         on_done=on_done, on_pause=lambda n: self.paused.set(),
+                         chunk_size=4096, limit=limit)
+
+    def test_pauses_at_limit_then_loads_more(self):
+        s = self._stream(limit=16 * 1024).start()
+        self.assertTrue(self.paused.wait(10))
+        self.assertFalse(self.done.is_set())
+        self.assertLess(len("".join(self.chunks).encode("utf-8")), 32 * 1024)
+        s.more(limit=10 * 1024 * 1024)
+        self.assertTrue(self.done.wait(10))
+        self.assertEqual(self.result, (0, False))
+        text = "".join(self.chunks)
+        self.assertIn("+第 19999 行", text)
+        # 多字节字符跨块时不会被截断成替换字符
+        self.assertNotIn("�", text)
+
+    def test_cancel_kills_process(self):
+        s = self._stream(limit=8 * 1024).start()
+        self.assertTrue(self.paused.wait(10))
+        s.cancel()
+        self.assertTrue(self.done.wait(10))
+        self.assertTrue(self.result[1])
+        self.assertIsNotNone(s.proc.poll())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+class TestHeadlessCli(unittest.TestCase):
+    def _run(self, *args):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = str(ROOT) + os.pathsep + env.get("PYTHONPATH", "")
+        return subprocess.run([sys.executable, *args], cwd=str(ROOT), env=env, capture_output=True, text=True, timeout=60)
+
+    def test_never_imports_tkinter(self):
+        code = (
+            "import sys, core.headless as h;"
+            "h.build_parser();"
+            "import core.runner_stop, core.probe, core.launcher_cmd;"
+            "print('tkinter' in sys.modules)"
+        )
+        r = self._run("-c", code)
+        self.assertEqual(r.returncode, 0, r.stderr)
+        self.assertEqual(r.stdout.strip(), "False")
+
+    def test_status_json_when_not_running(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "launcher").mkdir()
+            Path(tmp, "launcher", "config.json").write_text(json.dumps({"launch_options": {"default_port": "1"}}), encoding="utf-8")
+            r = self._run("-m", "launcher", "--root", tmp, "status", "--json")
+        self.assertEqual(r.returncode, 3, r.stderr)
+        st = json.loads(r.stdout)
+        self.assertEqual(st["port"], "1")
+        self.assertFalse(st["running"])
+
+
+@unittest.skipIf(os.name == "nt", "POSIX")
+class TestPidHandle(unittest.TestCase):
+    def test_poll_terminate_wait(self):
+        from core.headless import _PidHandle
+        proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            h = _PidHandle(proc.pid)
+            self.assertIsNone(h.poll())
+            h.terminate()
+            proc.wait(timeout=10)
+            self.assertIsNotNone(h.wait(timeout=5))
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+
+
+class TestHeadlessStopErrors(unittest.TestCase):
+    def test_stop_error_goes_to_callback_without_root(self):
+        import logging
+        from types import SimpleNamespace
+        from unittest import mock
+        from core import runner_stop
+        from core.headless import _Var
+        errors = []
+        app = SimpleNamespace(logger=logging.getLogger("test_headless"), config={},
+                              custom_port=_Var("1"), report_error=errors.append)
+        handle = SimpleNamespace(pid=999999, poll=lambda: None, terminate=mock.Mock(side_effect=OSError("boom")))
+        with mock.patch.object(runner_stop, "terminate_tree", side_effect=OSError("boom")), \
+                mock.patch.object(runner_stop, "run_hidden", side_effect=OSError("boom")), \
+                mock.patch("core.probe.find_pids_by_port_safe", return_value=[]):
+            self.assertFalse(runner_stop.stop(app, SimpleNamespace(comfyui_process=handle)))
+        self.assertEqual(len(errors), 1)
+        self.assertIn("boom", errors[0])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,91 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    delay = 0.0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self):
+        if type(self).delay:
+            time.sleep(type(self).delay)
+        body = b"{}" if self.path == "/system_stats" else b"no"
+        self.send_response(200 if self.path == "/system_stats" else 404)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_):
+        pass
+
+
+class TestHealthProber(unittest.TestCase):
+    def setUp(self):
+        _Handler.connections = 0
+        _Handler.delay = 0.0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_keepalive_reuse_and_stats(self):
+        from core.health_probe import HealthProber
+        prober = HealthProber()
+        for _ in range(5):
+            self.assertTrue(prober.probe(self.port))
+        prober.close()
+        self.assertEqual(_Handler.connections, 1)
+        st = prober.stats(self.port)
+        self.assertEqual(st["ok"], 5)
+        self.assertEqual(st["samples"], 5)
+        self.assertIsNotNone(st["p95_ms"])
+        self.assertEqual(sum(c for _, c in prober.histogram(self.port)), 5)
+
+    def test_unreachable_port_backs_off(self):
+        from core.health_probe import HealthProber
+        prober = HealthProber(min_interval=0.25, max_interval=2.0)
+        self.server.shutdown()
+        self.server.server_close()
+        self.assertFalse(prober.probe(self.port))
+        self.assertFalse(prober.probe(self.port))
+        self.assertEqual(prober.next_delay(self.port), 1.0)
+        self.assertEqual(prober.next_delay(self.port, max_delay=0.5), 0.5)
+        self.assertEqual(prober.stats(self.port)["fail"], 2)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def test_caller_timeout_caps_adaptive_timeout(self):
+        from core.health_probe import HealthProber
+        prober = HealthProber(min_timeout=3.0)
+        _Handler.delay = 1.0
+        t0 = time.perf_counter()
+        self.assertFalse(prober.probe(self.port, timeout=0.1))
+        self.assertLess(time.perf_counter() - t0, 0.8)
+
+    def test_ui_probe_not_blocked_by_background_probe(self):
+        from core.health_probe import HealthProber
+        prober = HealthProber(min_timeout=3.0)
+        _Handler.delay = 1.0
+        bg = threading.Thread(target=prober.probe, args=(self.port,))
+        bg.start()
+        time.sleep(0.1)
+        t0 = time.perf_counter()
+        self.assertFalse(prober.probe(self.port, timeout=0.1))
+        self.assertLess(time.perf_counter() - t0, 0.6)
+        bg.join()
+        self.assertEqual(prober.stats(self.port)["ok"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
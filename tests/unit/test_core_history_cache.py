@@ -0,0 +1,133 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from core import commit_history as H
+from core import history_cache as HC
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", *args], cwd=str(repo), capture_output=True, text=True, check=True)
+
+
+@unittest.skipUnless(shutil.which("git"), "需要 git")
+class TestHistoryCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self._dir = mock.patch.object(HC, "_cache_dir", lambda: root / "cache")
+        self._dir.start()
+        self.repo = root / "repo"
+        self.repo.mkdir()
+        _git(self.repo, "init", "-q", "-b", "main")
+        _git(self.repo, "config", "user.email", "t@example.com")
+        _git(self.repo, "config", "user.name", "t")
+        self.commit("c0")
+        self.calls = []
+
+    def tearDown(self):
+        self._dir.stop()
+        self.tmp.cleanup()
+
+    def commit(self, msg, ts=None):
+        env = dict(os.environ)
+        if ts is not None:
+            env["GIT_COMMITTER_DATE"] = env["GIT_AUTHOR_DATE"] = f"{ts} +0000"
+        subprocess.run(["git", "commit", "-q", "--allow-empty", "-m", msg], cwd=str(self.repo),
+                       capture_output=True, check=True, env=env)
+
+    def run_git(self, args):
+        self.calls.append(list(args))
+        return subprocess.run(["git", *args], cwd=str(self.repo), capture_output=True, text=True)
+
+    def logs(self):
+        return [c for c in self.calls if c[0] == "log"]
+
+    def test_unchanged_tip_served_from_cache(self):
+        self.commit("c1")
+        hist = H.CommitHistory()
+        self.assertEqual(HC.sync(hist, self.repo, "main", self.run_git), HC.SOURCE_FULL)
+        self.calls.clear()
+        hist2 = H.CommitHistory()
+        self.assertEqual(HC.sync(hist2, self.repo, "main", self.run_git), HC.SOURCE_CACHE)
+        self.assertEqual(self.logs(), [])
+        self.assertEqual([c["message"] for c in hist2.commits], ["c1", "c0"])
+        self.assertTrue(hist2.exhausted)
+        self.assertEqual(HC.load_last(self.repo)["ref"], "main")
+
+    def test_full_load_respects_page_size(self):
+        self.commit("c1")
+        self.commit("c2")
+        hist = H.CommitHistory(page_size=2)
+        self.assertEqual(HC.sync(hist, self.repo, "main", self.run_git), HC.SOURCE_FULL)
+        self.assertIn("-2", self.logs()[0])
+        self.assertEqual([c["message"] for c in hist.commits], ["c2", "c1"])
+        self.assertFalse(hist.exhausted)
+
+    def test_fast_forward_appends_only_new_commits(self):
+        HC.sync(H.CommitHistory(), self.repo, "main", self.run_git)
+        self.commit("c1")
+        self.commit("c2")
+        self.calls.clear()
+        hist = H.CommitHistory()
+        self.assertEqual(HC.sync(hist, self.repo, "main", self.run_git), HC.SOURCE_INCREMENTAL)
+        self.assertEqual(len(self.logs()), 1)
+        self.assertIn("..", self.logs()[0][-1])
+        self.assertEqual([c["message"] for c in hist.commits], ["c2", "c1", "c0"])
+
+    def test_rewritten_history_reloads(self):
+        self.commit("c1")
+        HC.sync(H.CommitHistory(), self.repo, "main", self.run_git)
+        _git(self.repo, "reset", "-q", "--hard", "HEAD~1")
+        self.commit("c1b")
+        hist = H.CommitHistory()
+        self.assertEqual(HC.sync(hist, self.repo, "main", self.run_git), HC.SOURCE_FULL)
+        self.assertEqual([c["message"] for c in hist.commits], ["c1b", "c0"])
+
+    def test_paging_after_incremental_merge_keeps_every_commit(self):
+        for i in range(1, 6):
+            self.commit(f"c{i}", ts=1_700_000_000 + i * 86400)
+        hist = H.CommitHistory(page_size=2)
+        HC.sync(hist, self.repo, "main", self.run_git)
+        # 旁支的提交日期早于主干已缓存的提交，合并后按日期排序会与旧列表交错
+        _git(self.repo, "checkout", "-q", "-b", "side", "HEAD~4")
+        self.commit("s1", ts=1_700_000_000 + 3 * 86400 + 10)
+        self.commit("s2", ts=1_700_000_000 + 3 * 86400 + 20)
+        _git(self.repo, "checkout", "-q", "main")
+        _git(self.repo, "merge", "-q", "--no-ff", "-m", "merge side", "side")
+        hist2 = H.CommitHistory(page_size=2)
+        self.assertEqual(HC.sync(hist2, self.repo, "main", self.run_git), HC.SOURCE_INCREMENTAL)
+        while hist2.load_more(self.run_git) > 0:
+            pass
+        self.assertTrue(hist2.exhausted)
+        expected = _git(self.repo, "rev-list", "main").stdout.split()
+        self.assertEqual(sorted(c["full_hash"] for c in hist2.commits), sorted(expected))
+        # 翻页状态写入缓存，重新打开后继续按旧 tip 翻页
+        HC.remember(hist2, self.repo)
+        hist3 = H.CommitHistory(page_size=2)
+        self.assertEqual(HC.sync(hist3, self.repo, "main", self.run_git), HC.SOURCE_CACHE)
+        self.assertEqual((hist3.base, hist3.base_offset), (hist2.base, hist2.base_offset))
+
+    def test_remember_uses_synced_tip(self):
+        self.commit("c1")
+        hist = H.CommitHistory(page_size=1)
+        HC.sync(hist, self.repo, "main", self.run_git)
+        tip = hist.tip
+        # 翻页期间引用前进：缓存仍记在 sync 时的 tip 下，下次同步走增量而不是误判为命中
+        self.commit("c2")
+        hist.load_more(self.run_git)
+        self.calls.clear()
+        HC.remember(hist, self.repo)
+        self.assertEqual(self.calls, [])
+        self.assertEqual(HC.load(self.repo, "main")["tip"], tip)
+        hist2 = H.CommitHistory(page_size=1)
+        self.assertEqual(HC.sync(hist2, self.repo, "main", self.run_git), HC.SOURCE_INCREMENTAL)
+        self.assertEqual([c["message"] for c in hist2.commits], ["c2", "c1", "c0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
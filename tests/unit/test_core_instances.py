@@ -0,0 +1,63 @@
+import unittest
+
+
+class _Var:
+    def __init__(self, v):
+        self.v = v
+
+    def get(self):
+        return self.v
+
+
+class _Logger:
+    def info(self, *a, **k):
+        pass
+
+    warning = error = info
+
+
+class _App:
+    def __init__(self, instances=None):
+        self.logger = _Logger()
+        self.custom_port = _Var("8188")
+        self.config = {"instances": instances or []}
+        self.saved = 0
+
+    def save_config(self):
+        self.saved += 1
+
+
+class TestInstanceManager(unittest.TestCase):
+    def test_load_add_remove_persist(self):
+        from core.instances import InstanceManager
+        app = _App([{"name": "b", "port": "8190"}, {"name": "a", "port": "8189", "extra_args": "--cpu"}])
+        mgr = InstanceManager(app)
+        self.assertEqual([i.port for i in mgr.instances()], ["8189", "8190"])
+        mgr.add("8191", "c")
+        self.assertEqual([i["port"] for i in app.config["instances"]], ["8189", "8190", "8191"])
+        self.assertTrue(mgr.remove("8190"))
+        self.assertIsNone(mgr.get("8190"))
+        self.assertEqual(app.saved, 2)
+
+    def test_add_rejects_conflicts(self):
+        from core.instances import InstanceManager
+        mgr = InstanceManager(_App([{"port": "8189"}]))
+        for bad in ("8188", "8189", "abc", "70000"):
+            with self.assertRaises(ValueError):
+                mgr.add(bad)
+
+    def test_aggregate(self):
+        from core.instances import InstanceManager
+        from core.supervisor import STATE_READY
+        mgr = InstanceManager(_App([{"port": "8189"}, {"port": "8190"}]))
+        mgr.get("8189").supervisor.state = STATE_READY
+        agg = mgr.aggregate()
+        self.assertEqual((agg["total"], agg[STATE_READY], agg["stopped"]), (2, 1, 1))
+
+    def test_strip_port_args(self):
+        from core.instances import _strip_port_args
+        self.assertEqual(_strip_port_args(["py", "main.py", "--port", "8188", "--cpu", "--port=1"]), ["py", "main.py", "--cpu"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
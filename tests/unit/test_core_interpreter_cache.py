@@ -0,0 +1,48 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+class TestInterpreterCache(unittest.TestCase):
+    def setUp(self):
+        import core.interpreter_cache as ic
+        self.ic = ic
+        self.tmp = tempfile.TemporaryDirectory()
+        self._file = mock.patch.object(ic._store, "path", lambda: Path(self.tmp.name) / "interpreter_cache.json")
+        self._file.start()
+        ic._store.reset()
+
+    def tearDown(self):
+        self._file.stop()
+        self.ic._store.reset()
+        self.tmp.cleanup()
+
+    def test_second_validation_skips_probe(self):
+        ok, ver = self.ic.validate_interpreter(sys.executable)
+        self.assertTrue(ok)
+        self.assertIn("Python", ver)
+        with mock.patch.object(self.ic, "run_hidden", side_effect=AssertionError("probed")):
+            self.assertEqual(self.ic.validate_interpreter(sys.executable), (True, ver))
+        # 重新加载持久化文件后仍然命中
+        self.ic._store.reset()
+        self.assertEqual(self.ic.lookup(sys.executable), ver)
+
+    def test_fingerprint_change_revalidates(self):
+        fake = Path(self.tmp.name) / "python"
+        fake.write_text("x", encoding="utf-8")
+        self.ic.remember(fake, "Python 3.0")
+        self.assertEqual(self.ic.lookup(fake), "Python 3.0")
+        fake.write_text("changed", encoding="utf-8")
+        self.assertIsNone(self.ic.lookup(fake))
+
+    def test_timeout_is_not_a_failure(self):
+        import subprocess
+        with mock.patch.object(self.ic, "run_hidden", side_effect=subprocess.TimeoutExpired("py", 5)):
+            self.assertEqual(self.ic.validate_interpreter(sys.executable), (True, ""))
+        self.assertIsNone(self.ic.lookup(sys.executable))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
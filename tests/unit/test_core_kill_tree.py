@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+import unittest
+
+
+class _Logger:
+    def info(self, *a, **k):
+        pass
+
+    warning = info
+
+
+class _App:
+    def __init__(self, grace=0.5, kill_wait=2.0):
+        self.logger = _Logger()
+        self.config = {"launch_options": {"stop_grace_seconds": grace, "stop_kill_wait_seconds": kill_wait}}
+
+
+_SPAWN_CHILD = (
+    "import subprocess, sys, time;"
+    "subprocess.Popen([sys.executable, '-c', %r]);"
+    "time.sleep(60)"
+)
+
+
+@unittest.skipIf(os.name == "nt", "POSIX 进程组")
+class TestTerminateTree(unittest.TestCase):
+    def _spawn(self, child_code):
+        from core.kill import popen_group_kwargs
+        code = _SPAWN_CHILD % child_code
+        return subprocess.Popen([sys.executable, "-c", code], **popen_group_kwargs())
+
+    def _group_alive(self, pgid):
+        from core.kill import _group_alive
+        return _group_alive(pgid)
+
+    def test_group_terminated_including_grandchild(self):
+        from core.kill import terminate_tree
+        proc = self._spawn("import time; time.sleep(60)")
+        import time
+        time.sleep(0.5)
+        ok, escalated = terminate_tree(_App(), proc)
+        self.assertTrue(ok)
+        self.assertFalse(escalated)
+        self.assertFalse(self._group_alive(proc.pid))
+
+    def test_escalates_to_sigkill(self):
+        from core.kill import terminate_tree
+        proc = self._spawn("import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); time.sleep(60)")
+        import time
+        time.sleep(0.5)
+        ok, escalated = terminate_tree(_App(grace=0.3), proc)
+        self.assertTrue(ok)
+        self.assertTrue(escalated)
+        self.assertFalse(self._group_alive(proc.pid))
+
+    @unittest.skipUnless(os.path.isdir("/proc"), "需要 /proc")
+    def test_group_poll_rescans_only_when_known_members_exit(self):
+        from unittest import mock
+        from core import kill
+        proc = self._spawn("import time; time.sleep(60)")
+        try:
+            import time
+            time.sleep(0.5)
+            with mock.patch.object(kill, "_scan_group", wraps=kill._scan_group) as scan:
+                for _ in range(5):
+                    self.assertTrue(kill._group_alive(proc.pid))
+                self.assertEqual(scan.call_count, 1)
+        finally:
+            kill.terminate_tree(_App(), proc)
+        self.assertFalse(self._group_alive(proc.pid))
+        self.assertNotIn(proc.pid, kill._group_members)
+
+    def test_timeline_from_config(self):
+        from core.kill import stop_timeline, DEFAULT_STOP_GRACE, DEFAULT_STOP_KILL_WAIT
+        self.assertEqual(stop_timeline(_App(1.5, 0.5)), (1.5, 0.5))
+        app = _App()
+        app.config = {}
+        self.assertEqual(stop_timeline(app), (DEFAULT_STOP_GRACE, DEFAULT_STOP_KILL_WAIT))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
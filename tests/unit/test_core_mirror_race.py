@@ -0,0 +1,74 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from core import mirror_race as RACE
+
+
+class TestMirrorRace(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self._file = mock.patch.object(RACE._store, "path", lambda: Path(self.tmp.name) / "mirror_cache.json")
+        self._file.start()
+        RACE._store.reset()
+
+    def tearDown(self):
+        self._file.stop()
+        RACE._store.reset()
+        self.tmp.cleanup()
+
+    def test_fastest_successful_candidate_wins(self):
+        delays = {"slow": 0.2, "fast": 0.02, "broken": 0.0}
+
+        def probe(c):
+            time.sleep(delays[c])
+            if c == "broken":
+                raise OSError("refused")
+            return True
+
+        t0 = time.perf_counter()
+        best, results = RACE.race(["slow", "fast", "broken"], probe)
+        self.assertEqual(best, "fast")
+        self.assertIsNone(results["broken"])
+        self.assertGreater(results["slow"], results["fast"])
+        # 并行探测：总耗时接近最慢者而非总和
+        self.assertLess(time.perf_counter() - t0, 0.2 + 0.15)
+
+    def test_all_failed(self):
+        best, results = RACE.race(["a", "b"], lambda c: False)
+        self.assertIsNone(best)
+        self.assertEqual(results, {"a": None, "b": None})
+
+    def test_cache_persists_with_ttl(self):
+        RACE.remember(RACE.KIND_HF, "https://hf-mirror.com", {"https://hf-mirror.com": 0.1})
+        RACE._store.reset()
+        entry = RACE.cached(RACE.KIND_HF, RACE.HF_CANDIDATES)
+        self.assertEqual(entry["url"], "https://hf-mirror.com")
+        self.assertTrue(RACE.is_fresh(entry))
+        self.assertFalse(RACE.is_fresh(entry, ttl=0))
+        # 胜者已不在候选列表中（如自定义地址被修改）时视为无记录
+        self.assertIsNone(RACE.cached(RACE.KIND_HF, ["https://huggingface.co"]))
+
+    def test_service_serves_default_then_refreshes_in_background(self):
+        from services.mirror_service import MirrorService
+
+        class App:
+            config = {"proxy_settings": {"pypi_proxy_url": "https://example.org/simple/"}}
+            logger = None
+
+        svc = MirrorService(App())
+        self.assertIn("https://example.org/simple/", svc.candidates(RACE.KIND_PYPI))
+        with mock.patch("core.scheduler.submit") as submit:
+            self.assertEqual(svc.pypi_index(), "https://mirrors.aliyun.com/pypi/simple/")
+            self.assertEqual(submit.call_args.kwargs["key"], "mirror:race:pypi")
+        with mock.patch.object(RACE, "probe_pypi", side_effect=lambda c: c == "https://example.org/simple/"):
+            self.assertEqual(svc.race(RACE.KIND_PYPI), "https://example.org/simple/")
+        with mock.patch("core.scheduler.submit") as submit:
+            self.assertEqual(svc.pypi_index(), "https://example.org/simple/")
+            submit.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+import unittest
+
+
+class TestOutputCapture(unittest.TestCase):
+    def _spawn(self, code):
+        return subprocess.Popen([sys.executable, "-u", "-c", code],
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+    def test_ready_marker_fires_once(self):
+        from core.output_capture import OutputCapture
+        proc = self._spawn("print('loading'); print('To see the GUI go to: http://127.0.0.1:8188'); print('To see the GUI go to: again')")
+        hits = []
+        lines = []
+        cap = OutputCapture(proc.stdout, on_ready=hits.append)
+        cap.add_listener(lines.append)
+        cap.start()
+        self.assertTrue(cap.closed_event.wait(10))
+        proc.wait(timeout=10)
+        self.assertTrue(cap.ready_event.is_set())
+        self.assertEqual(len(hits), 1)
+        self.assertEqual(lines[0], "loading")
+        self.assertEqual(len(lines), 3)
+
+    def test_traceback_is_collected(self):
+        from core.output_capture import OutputCapture
+        proc = self._spawn("import sys; print('boot'); raise RuntimeError('boom')")
+        seen = []
+        cap = OutputCapture(proc.stdout, on_traceback=seen.append, on_closed=lambda: seen.append("closed"))
+        cap.start()
+        self.assertTrue(cap.closed_event.wait(10))
+        proc.wait(timeout=10)
+        self.assertFalse(cap.ready_event.is_set())
+        self.assertTrue(seen[0].startswith("Traceback"))
+        self.assertEqual(seen[-1], "closed")
+        tb = cap.last_traceback()
+        self.assertIn("RuntimeError: boom", tb)
+        self.assertEqual(cap.tail(1), ["RuntimeError: boom"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,49 @@
+import os
+import socket
+import unittest
+from unittest import mock
+
+
+class TestPortIndex(unittest.TestCase):
+    def setUp(self):
+        from core import probe
+        probe.invalidate_port_index()
+
+    def tearDown(self):
+        from core import probe
+        probe.invalidate_port_index()
+
+    def test_snapshot_is_shared_within_ttl(self):
+        from core import probe
+        calls = []
+        def _fake():
+            calls.append(1)
+            return {8188: {111}, 9000: {222}}
+        with mock.patch("core.probe._read_psutil_index", side_effect=_fake):
+            self.assertEqual(probe.find_pids_by_port_safe("8188"), [111])
+            self.assertEqual(probe.find_pids_by_port_safe("9000"), [222])
+            self.assertEqual(len(calls), 1)
+            probe.invalidate_port_index()
+            probe.find_pids_by_port_safe("8188")
+            self.assertEqual(len(calls), 2)
+
+    def test_invalid_port_returns_empty(self):
+        from core import probe
+        self.assertEqual(probe.find_pids_by_port_safe("abc"), [])
+
+    @unittest.skipUnless(os.path.isdir("/proc/net"), "需要 Linux /proc")
+    def test_proc_net_index_finds_listener(self):
+        from core import probe
+        s = socket.socket()
+        try:
+            s.bind(("127.0.0.1", 0))
+            s.listen(1)
+            port = s.getsockname()[1]
+            index = probe._read_proc_net_index()
+            self.assertIn(os.getpid(), index.get(port, set()))
+        finally:
+            s.close()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
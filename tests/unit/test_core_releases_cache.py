@@ -0,0 +1,116 @@
+import json
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from core import releases_cache as RC
+
+
+class _Handler(BaseHTTPRequestHandler):
+    releases = []
+    requests = []
+    etag = '"v1"'
+    fail_from_page = None
+
+    def do_GET(self):
+        q = parse_qs(urlparse(self.path).query)
+        page = int(q.get("page", ["1"])[0])
+        per = int(q.get("per_page", ["30"])[0])
+        type(self).requests.append((page, self.headers.get("If-None-Match")))
+        if type(self).fail_from_page and page >= type(self).fail_from_page:
+            self.send_error(502)
+            return
+        if page == 1 and self.headers.get("If-None-Match") == type(self).etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps(type(self).releases[(page - 1) * per: page * per]).encode("utf-8")
+        self.send_response(200)
+        self.send_header("ETag", type(self).etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestReleasesCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self._file = mock.patch.object(RC._store, "path", lambda: Path(self.tmp.name) / "releases_cache.json")
+        self._file.start()
+        RC._store.reset()
+        _Handler.releases = [{"tag_name": f"v0.{i}", "prerelease": i % 2 == 1, "body": "x" * 50} for i in range(250)]
+        _Handler.requests = []
+        _Handler.etag = '"v1"'
+        _Handler.fail_from_page = None
+        self.server = HTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/repos/o/r/releases"
+
+    def tearDown(self):
+        self._stop_server()
+        self._file.stop()
+        RC._store.reset()
+        self.tmp.cleanup()
+
+    def _stop_server(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def test_paginates_then_revalidates_with_etag(self):
+        releases, source = RC.load("o/r", self.url, max_age=0)
+        self.assertEqual(source, RC.SOURCE_NETWORK)
+        self.assertEqual(len(releases), 250)
+        self.assertEqual([p for p, _ in _Handler.requests], [1, 2, 3])
+        self.assertNotIn("body", releases[0])
+
+        _Handler.requests = []
+        RC._store.reset()  # 从磁盘重新读取
+        releases2, source2 = RC.load("o/r", self.url, max_age=0)
+        self.assertEqual(source2, RC.SOURCE_NOT_MODIFIED)
+        self.assertEqual(releases2, releases)
+        self.assertEqual(_Handler.requests, [(1, '"v1"')])
+
+        _Handler.requests = []
+        self.assertEqual(RC.load("o/r", self.url, max_age=600)[1], RC.SOURCE_CACHE)
+        self.assertEqual(_Handler.requests, [])
+
+    def test_offline_serves_stale(self):
+        RC.load("o/r", self.url, max_age=0)
+        self._stop_server()
+        releases, source = RC.load("o/r", self.url, max_age=0)
+        self.assertEqual(source, RC.SOURCE_STALE)
+        self.assertEqual(len(releases), 250)
+        self.assertEqual(RC.load("other/repo", self.url, max_age=0), ([], ""))
+
+    def test_later_page_failure_keeps_old_entry(self):
+        RC.load("o/r", self.url, max_age=0)
+        before = dict(RC.entry("o/r"))
+        _Handler.releases = [{"tag_name": "v1.0", "prerelease": False}] + _Handler.releases
+        _Handler.etag = '"v2"'
+        _Handler.fail_from_page = 2
+        releases, source = RC.load("o/r", self.url, max_age=0)
+        self.assertEqual(source, RC.SOURCE_STALE)
+        # 新的第一页 + 旧数据中其余的 release
+        self.assertEqual(len(releases), 251)
+        self.assertEqual(releases[0]["tag_name"], "v1.0")
+        after = RC.entry("o/r")
+        self.assertEqual((after["fetched_at"], after["etag"]), (before["fetched_at"], '"v1"'))
+        self.assertEqual(len(after["releases"]), 250)
+        # 恢复后旧校验头不再匹配，重新取全
+        _Handler.fail_from_page = None
+        releases, source = RC.load("o/r", self.url, max_age=0)
+        self.assertEqual((source, len(releases)), (RC.SOURCE_NETWORK, 251))
+
+
+if __name__ == "__main__":
+    unittest.main()
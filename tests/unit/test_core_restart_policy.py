@@ -0,0 +1,72 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+
+class _App:
+    def __init__(self, **opts):
+        base = {"auto_restart": True, "restart_backoff_seconds": 1, "restart_backoff_max_seconds": 4,
+                "crash_loop_exits": 4, "crash_loop_window_seconds": 60}
+        base.update(opts)
+        self.config = {"launch_options": base}
+
+
+class TestRestartPolicy(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.file = Path(self.tmp.name) / "restart_history.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _policy(self, **opts):
+        from core.restart_policy import RestartPolicy
+        return RestartPolicy(_App(**opts), history_file=self.file)
+
+    def test_disabled_and_clean_exit_do_not_restart(self):
+        from core.restart_policy import ACTION_NONE
+        self.assertEqual(self._policy(auto_restart=False).on_exit(1)[0], ACTION_NONE)
+        p = self._policy()
+        self.assertEqual(p.on_exit(0)[0], ACTION_NONE)
+        self.assertEqual(p.on_exit(-15, user_stopped=True)[0], ACTION_NONE)
+
+    def test_backoff_then_crash_loop(self):
+        from core.restart_policy import ACTION_RESTART, ACTION_CRASH_LOOP, ACTION_NONE
+        p = self._policy()
+        t = 1000.0
+        self.assertEqual(p.on_exit(1, 3, now=t), (ACTION_RESTART, 1))
+        self.assertEqual(p.on_exit(1, 3, now=t + 5), (ACTION_RESTART, 2))
+        self.assertEqual(p.on_exit(1, 3, now=t + 10), (ACTION_RESTART, 4))
+        self.assertEqual(p.on_exit(1, 3, now=t + 15)[0], ACTION_CRASH_LOOP)
+        self.assertTrue(p.tripped)
+        self.assertEqual(p.on_exit(1, 3, now=t + 20)[0], ACTION_NONE)
+        saved = json.loads(self.file.read_text(encoding="utf-8"))
+        self.assertEqual([h["action"] for h in saved][-2:], ["crash_loop", "none"])
+
+    def test_history_persists_and_long_uptime_resets_backoff(self):
+        from core.restart_policy import ACTION_RESTART
+        p = self._policy()
+        p.on_exit(1, 3, now=1000.0)
+        p.on_exit(1, 3, now=1005.0)
+        p2 = self._policy()
+        self.assertEqual(len(p2.history()), 2)
+        # 稳定运行超过窗口后退出：退避从初始值开始，且旧记录已不在窗口内
+        self.assertEqual(p2.on_exit(1, 120, now=2000.0), (ACTION_RESTART, 1))
+
+    def test_reset_forgets_previous_exits(self):
+        from core.restart_policy import ACTION_RESTART, ACTION_CRASH_LOOP
+        p = self._policy()
+        t = 1000.0
+        for i in range(3):
+            p.on_exit(1, 3, now=t + i)
+        self.assertEqual(p.on_exit(1, 3, now=t + 3)[0], ACTION_CRASH_LOOP)
+        # 用户手动重新启动后单次崩溃应当重启，而不是再次判定为崩溃循环
+        p.reset(now=t + 4)
+        self.assertEqual(p.on_exit(1, 3, now=t + 5), (ACTION_RESTART, 1))
+        # reset 记录会持久化，新进程读取历史后同样只统计 reset 之后的退出
+        self.assertEqual(self._policy().on_exit(1, 3, now=t + 6)[0], ACTION_RESTART)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,121 @@
+import threading
+import unittest
+
+from core.scheduler import (JobScheduler, current_job, PRIORITY_UI, PRIORITY_BACKGROUND,
+                            JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+
+class TestJobScheduler(unittest.TestCase):
+    def _blocked(self, sched):
+        # 占住唯一的工作线程，便于观察排队行为
+        gate = threading.Event()
+        started = threading.Event()
+
+        def block():
+            started.set()
+            gate.wait(5)
+        job = sched.submit(block, key="block")
+        self.assertTrue(started.wait(5))
+        return gate, job
+
+    def test_single_flight_returns_same_job(self):
+        sched = JobScheduler(max_workers=1)
+        gate, _ = self._blocked(sched)
+        calls = []
+        a = sched.submit(lambda: calls.append(1), key="refresh")
+        b = sched.submit(lambda: calls.append(2), key="refresh")
+        self.assertIs(a, b)
+        gate.set()
+        self.assertTrue(a.wait(5))
+        self.assertEqual(calls, [1])
+        # 完成后同 key 可再次提交
+        c = sched.submit(lambda: calls.append(3), key="refresh")
+        self.assertIsNot(a, c)
+        self.assertTrue(c.wait(5))
+        self.assertEqual(calls, [1, 3])
+
+    def test_priority_order(self):
+        sched = JobScheduler(max_workers=1)
+        gate, _ = self._blocked(sched)
+        order = []
+        low = sched.submit(lambda: order.append("bg"), priority=PRIORITY_BACKGROUND)
+        high = sched.submit(lambda: order.append("ui"), priority=PRIORITY_UI)
+        gate.set()
+        self.assertTrue(low.wait(5) and high.wait(5))
+        self.assertEqual(order, ["ui", "bg"])
+
+    def test_ui_jobs_not_starved_by_long_jobs(self):
+        sched = JobScheduler(max_workers=2, ui_reserved=1)
+        gate, _ = self._blocked(sched)
+        ran = []
+        bg = sched.submit(lambda: ran.append("bg"), priority=PRIORITY_BACKGROUND)
+        ui = sched.submit(lambda: ran.append("ui"), priority=PRIORITY_UI)
+        # 预留线程只执行界面任务：长任务占着另一个线程时，界面任务立即执行，后台任务继续排队
+        self.assertTrue(ui.wait(5))
+        self.assertFalse(bg.wait(0.2))
+        self.assertEqual(ran, ["ui"])
+        gate.set()
+        self.assertTrue(bg.wait(5))
+        self.assertEqual(ran, ["ui", "bg"])
+
+    def test_cancel_queued_job(self):
+        sched = JobScheduler(max_workers=1)
+        gate, _ = self._blocked(sched)
+        ran = []
+        job = sched.submit(lambda: ran.append(1), key="x")
+        self.assertTrue(sched.cancel("x"))
+        gate.set()
+        self.assertTrue(job.wait(5))
+        self.assertEqual(job.state, JOB_CANCELLED)
+        self.assertEqual(ran, [])
+
+    def test_running_job_sees_cancel_and_timing(self):
+        sched = JobScheduler(max_workers=2)
+        seen = threading.Event()
+
+        def work():
+            job = current_job()
+            seen.set()
+            while not job.cancelled:
+                job._cancel.wait(0.01)
+            return "stopped"
+        job = sched.submit(work, key="long", name="long")
+        self.assertTrue(seen.wait(5))
+        sched.cancel("long")
+        self.assertTrue(job.wait(5))
+        self.assertEqual(job.state, JOB_CANCELLED)
+        self.assertEqual(job.result, "stopped")
+        timing = sched.history()[-1]
+        self.assertEqual(timing["name"], "long")
+        self.assertIsNotNone(timing["run_ms"])
+
+    def test_failure_recorded(self):
+        sched = JobScheduler(max_workers=1)
+        ok = sched.submit(lambda: 42)
+        bad = sched.submit(lambda: 1 / 0)
+        self.assertTrue(ok.wait(5) and bad.wait(5))
+        self.assertEqual((ok.state, ok.result), (JOB_DONE, 42))
+        self.assertEqual(bad.state, JOB_FAILED)
+        self.assertIsInstance(bad.error, ZeroDivisionError)
+
+    def test_bounded_workers(self):
+        sched = JobScheduler(max_workers=2)
+        gate = threading.Event()
+        jobs = [sched.submit(gate.wait, 5) for _ in range(6)]
+        self.assertLessEqual(sched.stats()["workers"], 2)
+        gate.set()
+        self.assertTrue(all(j.wait(5) for j in jobs))
+
+    def test_shutdown_cancels_pending(self):
+        sched = JobScheduler(max_workers=1)
+        gate, _ = self._blocked(sched)
+        job = sched.submit(lambda: None)
+        sched.shutdown()
+        gate.set()
+        self.assertTrue(job.wait(5))
+        self.assertEqual(job.state, JOB_CANCELLED)
+        self.assertEqual(sched.submit(lambda: None).state, JOB_CANCELLED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from core import stable_index as S
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", *args], cwd=str(repo), capture_output=True, text=True, check=True)
+
+
+class TestReleaseMap(unittest.TestCase):
+    def test_release_metadata_then_semver_fallback(self):
+        rmap = S.release_map([
+            {"tag_name": "v0.3.10", "prerelease": False},
+            {"tag_name": "v0.3.11", "prerelease": True},
+            {"tag_name": "v0.3.12", "draft": True},
+        ])
+        self.assertTrue(S.is_stable("v0.3.10", rmap))
+        self.assertFalse(S.is_stable("v0.3.11", rmap))
+        self.assertFalse(S.is_stable("v0.3.12", rmap))
+        self.assertTrue(S.is_stable("v1.0.0", rmap))
+        self.assertFalse(S.is_stable("v1.0.0-rc1", rmap))
+        self.assertFalse(S.is_stable("", rmap))
+
+    def test_service_lookup_does_not_touch_network(self):
+        from services.version_service import VersionService
+
+        class App:
+            config = {"paths": {"comfyui_root": "."}}
+            logger = None
+            _releases_cache = [{"tag_name": "v2.0.0", "prerelease": True}]
+
+        vs = VersionService(App())
+        with mock.patch.object(vs, "_get_releases", side_effect=AssertionError("network")):
+            self.assertFalse(vs.is_stable_version("v2.0.0"))
+            self.assertTrue(vs.is_stable_version("v1.9.0"))
+
+
+@unittest.skipUnless(shutil.which("git"), "需要 git")
+class TestStableCommits(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self._file = mock.patch.object(S._store, "path", lambda: root / "stable_index.json")
+        self._file.start()
+        S._store.reset()
+        S.invalidate()
+        self.repo = root / "repo"
+        self.repo.mkdir()
+        _git(self.repo, "init", "-q")
+        _git(self.repo, "config", "user.email", "t@example.com")
+        _git(self.repo, "config", "user.name", "t")
+        _git(self.repo, "commit", "-q", "--allow-empty", "-m", "c0")
+        _git(self.repo, "tag", "v1.0.0")
+        _git(self.repo, "tag", "v1.1.0-beta")
+        self.loads = 0
+
+    def tearDown(self):
+        self._file.stop()
+        S._store.reset()
+        S.invalidate()
+        self.tmp.cleanup()
+
+    def load_tags(self):
+        self.loads += 1
+        out = _git(self.repo, "for-each-ref", "--format=%(refname:short) %(objectname)", "refs/tags").stdout
+        return dict(line.split(" ") for line in out.splitlines())
+
+    def test_cached_in_memory_and_on_disk_until_refs_change(self):
+        rmap = {}
+        first = S.stable_commits(self.repo, self.load_tags, rmap)
+        self.assertEqual(list(first), ["v1.0.0"])
+        S.stable_commits(self.repo, self.load_tags, rmap)
+        self.assertEqual(self.loads, 1)
+        # 进程重启：内存缓存清空后从磁盘命中
+        S.invalidate()
+        S._store.reset()
+        self.assertEqual(S.stable_commits(self.repo, self.load_tags, rmap), first)
+        self.assertEqual(self.loads, 1)
+        # Releases 变化（v1.0.0 被标为预发布）时重建
+        self.assertEqual(S.stable_commits(self.repo, self.load_tags, {"v1.0.0": False}), {})
+        self.assertEqual(self.loads, 2)
+        _git(self.repo, "tag", "v1.2.0")
+        self.assertIn("v1.2.0", S.stable_commits(self.repo, self.load_tags, rmap))
+        self.assertEqual(self.loads, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import threading
+import time
+
+
+class ProcStub:
+    def __init__(self, rc=0):
+        self.pid = 4321
+        self._rc = rc
+        self._done = threading.Event()
+
+    def poll(self):
+        return self._rc if self._done.is_set() else None
+
+    def wait(self, timeout=None):
+        self._done.wait(timeout)
+        return self.poll()
+
+    def finish(self):
+        self._done.set()
+
+
+class AppStub:
+    def __init__(self):
+        self.logger = type("L", (), {"info": lambda *a, **k: None})()
+
+
+class TestProcessSupervisor(unittest.TestCase):
+    def test_transitions_starting_ready_exited(self):
+        from core.supervisor import ProcessSupervisor
+        app = AppStub()
+        reachable = {"v": False}
+        sup = ProcessSupervisor(app, probe=lambda: reachable["v"])
+        events = []
+        sup.add_listener(lambda st, info: events.append((st, info)))
+        threading.Thread(target=sup.run, daemon=True).start()
+        proc = ProcStub(rc=3)
+        sup.attach(proc)
+        reachable["v"] = True
+        deadline = time.time() + 3
+        while time.time() < deadline and sup.state != "ready":
+            time.sleep(0.05)
+        self.assertEqual(sup.state, "ready")
+        proc.finish()
+        deadline = time.time() + 3
+        while time.time() < deadline and sup.state != "exited":
+            time.sleep(0.05)
+        sup.shutdown()
+        states = [e[0] for e in events]
+        self.assertEqual(states[:3], ["starting", "ready", "exited"])
+        self.assertEqual(events[2][1].get("returncode"), 3)
+        self.assertEqual(sup.last_exit_code, 3)
+        self.assertIsNone(sup.process)
+
+    def test_mark_stopping_emits_once(self):
+        from core.supervisor import ProcessSupervisor
+        sup = ProcessSupervisor(AppStub(), probe=lambda: False)
+        events = []
+        sup.add_listener(lambda st, info: events.append(st))
+        sup.mark_stopping()
+        sup.mark_stopping()
+        self.assertEqual(events, ["stopping"])
+
+    def _run_external(self, results, port_pids=()):
+        from unittest import mock
+        import core.supervisor as SUP
+        seq = list(results)
+        sup = SUP.ProcessSupervisor(AppStub(), probe=lambda: seq.pop(0) if len(seq) > 1 else (sup.close() or seq[0]))
+        events = []
+        sup.add_listener(lambda st, info: events.append(st))
+        with mock.patch.object(SUP, "EXTERNAL_PROBE_INTERVAL", 0.01), \
+                mock.patch.object(SUP, "EXTERNAL_RECHECK_INTERVAL", 0.01), \
+                mock.patch("core.probe.find_pids_by_port_safe", return_value=list(port_pids)):
+            t = threading.Thread(target=sup.run, daemon=True)
+            t.start()
+            t.join(5)
+        return events
+
+    def test_external_instance_needs_consecutive_failures(self):
+        # 单次、两次失败后恢复：保持 ready；连续三次失败：判定为停止
+        events = self._run_external([True, False, True, False, False, True, False, False, False, False])
+        self.assertEqual(events, ["ready", "idle"])
+
+    def test_external_instance_stays_ready_while_port_held(self):
+        events = self._run_external([True, False, False, False, False, False], port_pids=[4321])
+        self.assertEqual(events, ["ready"])
+
+    def test_ready_delay_uses_own_port(self):
+        from unittest import mock
+        from core.supervisor import ProcessSupervisor, READY_PROBE_MAX_DELAY
+        app = AppStub()
+        app.custom_port = type("V", (), {"get": lambda self: "8188"})()
+        prober = mock.Mock()
+        prober.next_delay.return_value = 0.5
+        with mock.patch("core.health_probe.get_prober", return_value=prober):
+            self.assertEqual(ProcessSupervisor(app, port="9001")._ready_delay(0.25), 0.5)
+            ProcessSupervisor(app)._ready_delay(0.25)
+        self.assertEqual(prober.next_delay.call_args_list,
+                         [mock.call(9001, max_delay=READY_PROBE_MAX_DELAY), mock.call(8188, max_delay=READY_PROBE_MAX_DELAY)])
+
+    def test_fallback_probe_readies_without_marker_and_stops_after_marker(self):
+        from core.supervisor import ProcessSupervisor
+        # 就绪标记缺失：低频兜底探测仍能判定就绪
+        sup = ProcessSupervisor(AppStub(), probe=lambda: True)
+        proc = ProcStub()
+        sup.attach(proc, ready_interval=0.05)
+        deadline = time.time() + 3
+        while time.time() < deadline and sup.state != "ready":
+            time.sleep(0.02)
+        self.assertEqual(sup.state, "ready")
+        proc.finish()
+        # 标记先到：兜底探测随即停止
+        probes = []
+        sup = ProcessSupervisor(AppStub(), probe=lambda: probes.append(1) and False)
+        proc = ProcStub()
+        sup.attach(proc, ready_interval=0.05)
+        sup.mark_ready(marker="To see the GUI go to: http://127.0.0.1:8188")
+        time.sleep(0.2)
+        count = len(probes)
+        time.sleep(0.2)
+        self.assertLessEqual(count, 1)
+        self.assertEqual(len(probes), count)
+        proc.finish()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,70 @@
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from core import tag_index as TAGS
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", *args], cwd=str(repo), capture_output=True, text=True, check=True)
+
+
+@unittest.skipUnless(shutil.which("git"), "需要 git")
+class TestTagIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo = Path(self.tmp.name)
+        _git(self.repo, "init", "-q")
+        _git(self.repo, "config", "user.email", "t@example.com")
+        _git(self.repo, "config", "user.name", "t")
+        (self.repo / "a.txt").write_text("a", encoding="utf-8")
+        _git(self.repo, "add", "a.txt")
+        _git(self.repo, "commit", "-q", "-m", "a")
+        self.c1 = _git(self.repo, "rev-parse", "HEAD").stdout.strip()
+        _git(self.repo, "tag", "v1.0.0")
+        _git(self.repo, "tag", "-a", "v1.0.1", "-m", "annotated")
+        self.calls = []
+        TAGS.invalidate()
+
+    def tearDown(self):
+        TAGS.invalidate()
+        self.tmp.cleanup()
+
+    def _run(self, args):
+        self.calls.append(args)
+        return subprocess.run(["git", *args], cwd=str(self.repo), capture_output=True, text=True)
+
+    def test_annotated_tags_peeled_and_cached(self):
+        index = TAGS.load(self.repo, self._run)
+        self.assertEqual(index, {"v1.0.0": self.c1, "v1.0.1": self.c1})
+        TAGS.load(self.repo, self._run)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_invalidated_when_tags_change(self):
+        TAGS.load(self.repo, self._run)
+        _git(self.repo, "tag", "v2.0.0")
+        self.assertIn("v2.0.0", TAGS.load(self.repo, self._run))
+        _git(self.repo, "pack-refs", "--all")
+        _git(self.repo, "tag", "-d", "v1.0.0")
+        self.assertNotIn("v1.0.0", TAGS.load(self.repo, self._run))
+        self.assertEqual(len(self.calls), 3)
+
+    def test_lookup_reads_packed_refs_without_git(self):
+        _git(self.repo, "pack-refs", "--all")
+        self.assertEqual(TAGS.lookup(self.repo, "v1.0.1", self._run), self.c1)
+        self.assertEqual(self.calls, [])
+        # 松散的附注标签无法直接读出提交，回退到一次 for-each-ref，之后命中索引缓存
+        _git(self.repo, "tag", "-a", "v2.0.0", "-m", "annotated")
+        self.assertEqual(TAGS.lookup(self.repo, "v2.0.0", self._run), self.c1)
+        self.assertEqual(TAGS.lookup(self.repo, "missing", self._run), None)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_parse_lightweight_and_annotated(self):
+        text = "v1 abc obj1\nv2  def\n"
+        self.assertEqual(TAGS.parse_for_each_ref(text), {"v1": "abc", "v2": "def"})
+
+
+if __name__ == "__main__":
+    unittest.main()
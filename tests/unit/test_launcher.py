@@ -128,13 +128,11 @@ class TestComfyUILauncherEnhanced(unittest.TestCase):
         app.update_template_library = mock.Mock(return_value={"component": "templates", "updated": True, "version": "0.1.0"})
         msgs = []
         with mock.patch("tkinter.messagebox.showinfo", side_effect=lambda t, m: msgs.append(m)):
-            class StubThread:
-                def __init__(self, target=None, daemon=None):
-                    self.target = target
-                def start(self):
-                    if self.target:
-                        self.target()
-            with mock.patch("threading.Thread", StubThread):
+            def run_now(fn, *args, **kwargs):
+                kwargs.pop("key", None)
+                kwargs.pop("priority", None)
+                fn(*args, **kwargs)
+            with mock.patch("core.scheduler.submit", side_effect=run_now):
                 app.perform_batch_update()
         self.assertTrue(any("内核" in m and "已更新" in m for m in msgs))
         self.assertTrue(any("前端" in m and "已更新" in m for m in msgs))
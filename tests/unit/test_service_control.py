@@ -0,0 +1,158 @@
+import http.client
+import json
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+
+class _Process:
+    def __init__(self):
+        self.running = False
+        self.calls = []
+
+    def status(self):
+        return {"running": self.running, "pid": 42 if self.running else None, "uptime": None,
+                "last_exit_code": 1, "probe": {"p50_ms": 1.0}}
+
+    def start(self):
+        self.calls.append("start")
+        self.running = True
+
+    def stop(self):
+        self.calls.append("stop")
+        self.running = False
+        return True
+
+
+class _Update:
+    def perform_batch_update(self):
+        return [{"component": "core", "updated": False}], "内核：已是最新，无需更新"
+
+    def get_frontend_version(self):
+        return "1.0"
+
+    def get_templates_version(self):
+        return "2.0"
+
+
+class _Version:
+    def get_current_kernel_version(self):
+        return {"tag": "v0.3.0", "commit": "abc123"}
+
+
+def _app(token=""):
+    app = SimpleNamespace()
+    app.config = {"control_api": {"enabled": True, "port": 0, "token": token}}
+    app.logger = None
+    app.services = SimpleNamespace(process=_Process(), update=_Update(), version=_Version())
+    return app
+
+
+class TestControlService(unittest.TestCase):
+    def setUp(self):
+        from services.control_service import ControlService
+        self.app = _app()
+        self.svc = ControlService(self.app)
+        self.assertTrue(self.svc.start())
+        # /start 会检查目标端口占用，测试中不依赖本机端口的实际状态
+        self._ports = mock.patch("core.probe.find_pids_by_port_safe", return_value=[])
+        self._ports.start()
+
+    def tearDown(self):
+        self._ports.stop()
+        self.svc.stop()
+
+    def _req(self, method, path, headers=None, token=True):
+        hdrs = {"Content-Type": "application/json"} if method == "POST" else {}
+        if token:
+            hdrs["X-Launcher-Token"] = self.app.config["control_api"]["token"]
+        hdrs.update(headers or {})
+        conn = http.client.HTTPConnection("127.0.0.1", self.svc.port, timeout=5)
+        conn.request(method, path, body=b"{}" if method == "POST" else None, headers=hdrs)
+        r = conn.getresponse()
+        data = json.loads(r.read())
+        conn.close()
+        return r.status, data
+
+    def test_status_start_stop(self):
+        code, data = self._req("GET", "/status")
+        self.assertEqual((code, data["running"], data["last_exit_code"]), (200, False, 1))
+        self.assertEqual(self._req("POST", "/start")[0], 202)
+        self.assertEqual(self._req("POST", "/start")[0], 409)
+        self.assertEqual(self._req("POST", "/stop")[0], 202)
+        self.assertEqual(self.app.services.process.calls, ["start", "stop"])
+        self.assertEqual(self._req("GET", "/nope")[0], 404)
+
+    def test_version_and_update_job(self):
+        code, data = self._req("GET", "/version")
+        self.assertEqual(data["core"]["commit"], "abc123")
+        self.assertEqual(data["frontend"], "1.0")
+        self.assertEqual(self._req("POST", "/update")[0], 202)
+        for _ in range(50):
+            code, job = self._req("GET", "/update")
+            if not job["running"]:
+                break
+            time.sleep(0.05)
+        self.assertIn("无需更新", job["summary"])
+
+    def test_start_refused_when_port_occupied(self):
+        with mock.patch("core.probe.find_pids_by_port_safe", return_value=[4321]):
+            code, data = self._req("POST", "/start")
+        self.assertEqual((code, data["error"], data["pids"]), (409, "port in use", [4321]))
+        self.assertEqual(self.app.services.process.calls, [])
+
+    def test_rejects_foreign_host(self):
+        code, _ = self._req("GET", "/status", headers={"Host": "evil.example:80"})
+        self.assertEqual(code, 403)
+
+    def test_generates_token_when_empty(self):
+        token = self.app.config["control_api"]["token"]
+        self.assertGreaterEqual(len(token), 16)
+        self.assertEqual(self._req("GET", "/status", token=False)[0], 401)
+        self.assertEqual(self._req("GET", "/status")[0], 200)
+
+    def test_rejects_browser_style_requests(self):
+        # 网页跨站发出的简单请求：带 Origin，或 POST 使用非 JSON 的类型
+        code, data = self._req("POST", "/start", headers={"Origin": "https://evil.example"})
+        self.assertEqual((code, data["error"]), (403, "forbidden origin"))
+        self.assertEqual(self._req("POST", "/stop", headers={"Content-Type": "text/plain"})[0], 415)
+        self.assertEqual(self.app.services.process.calls, [])
+
+
+class TestControlToken(unittest.TestCase):
+    def test_token_required(self):
+        from services.control_service import ControlService
+        svc = ControlService(_app(token="s3cret"))
+        self.assertFalse(svc.authorized({}))
+        self.assertTrue(svc.authorized({"X-Launcher-Token": "s3cret"}))
+        self.assertTrue(svc.authorized({"Authorization": "Bearer s3cret"}))
+        self.assertFalse(svc.authorized({"X-Launcher-Token": "s3cre"}))
+        self.assertFalse(svc.authorized({"X-Launcher-Token": "密钥"}))
+
+    def test_empty_token_rejects(self):
+        from services.control_service import ControlService
+        self.assertFalse(ControlService(_app()).authorized({}))
+
+    def test_generated_token_is_persisted(self):
+        from services.control_service import ControlService
+        app = _app()
+        saved = []
+        app.services.config = SimpleNamespace(set=lambda k, v: saved.append((k, v)), save=lambda: saved.append("save"))
+        svc = ControlService(app)
+        self.assertTrue(svc.start())
+        try:
+            token = app.config["control_api"]["token"]
+            self.assertEqual(saved, [("control_api.token", token), "save"])
+        finally:
+            svc.stop()
+
+    def test_disabled_by_default(self):
+        from services.control_service import ControlService
+        app = _app()
+        app.config = {}
+        self.assertFalse(ControlService(app).start())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
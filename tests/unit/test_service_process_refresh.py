@@ -41,12 +41,12 @@ class TestServiceProcessRefresh(unittest.TestCase):
         self.assertEqual(app.big_btn.text, "停止")
         # 空句柄 + 可达
         pm.comfyui_process = None
-        pm_mod.is_http_reachable = lambda _app: True
+        pm_mod.is_http_reachable = lambda _app, timeout=None: True
         pm._refresh_running_status()
         self.assertEqual(app.big_btn.state, "running")
         self.assertEqual(app.big_btn.text, "停止")
         # 空句柄 + 不可达
-        pm_mod.is_http_reachable = lambda _app: False
+        pm_mod.is_http_reachable = lambda _app, timeout=None: False
         pm._refresh_running_status()
         self.assertEqual(app.big_btn.state, "idle")
         self.assertEqual(app.big_btn.text, "一键启动")
@@ -54,5 +54,27 @@ class TestServiceProcessRefresh(unittest.TestCase):
         pm_mod.is_http_reachable = real_is_http
 
 
+class TestUiThreadProbeTimeout(unittest.TestCase):
+    def test_ui_thread_probes_pass_ui_cap(self):
+        import tempfile
+        from unittest import mock
+        import core.process_manager as pm_mod
+        from core.probe import UI_PROBE_TIMEOUT
+        calls = []
+
+        def fake(_app, timeout=None):
+            calls.append(timeout)
+            return False
+        with tempfile.TemporaryDirectory() as tmp:
+            app = AppStub(Path(tmp))
+            app.logger = mock.Mock()
+            pm = pm_mod.ProcessManager(app)
+            with mock.patch.object(pm_mod, "is_http_reachable", fake):
+                pm._refresh_running_status()
+                pm.on_process_ended()
+        self.assertEqual(calls, [UI_PROBE_TIMEOUT, UI_PROBE_TIMEOUT])
+        self.assertEqual(app.big_btn.state, "idle")
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
\ No newline at end of file
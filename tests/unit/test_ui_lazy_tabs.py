@@ -0,0 +1,55 @@
+import sys
+import unittest
+from types import SimpleNamespace
+
+_built = []
+
+
+def _fake_builder(app, parent):
+    _built.append(parent)
+
+
+class TestLazyTabs(unittest.TestCase):
+    def setUp(self):
+        _built.clear()
+
+    def test_tab_built_once_on_demand(self):
+        from ui.layout import ensure_tab_built
+        app = SimpleNamespace(tab_frames={"about": "frame"}, _tab_builders={"about": (__name__, "_fake_builder")})
+        self.assertTrue(ensure_tab_built(app, "about"))
+        self.assertFalse(ensure_tab_built(app, "about"))
+        self.assertEqual(_built, ["frame"])
+
+    def test_unknown_or_built_tab_is_noop(self):
+        from ui.layout import ensure_tab_built
+        self.assertFalse(ensure_tab_built(SimpleNamespace(), "launch"))
+
+    def test_heavy_tabs_not_imported_with_layout(self):
+        import subprocess
+        code = ("import sys, ui.layout; "
+                "print(','.join(m for m in ('ui.about_tab', 'ui.comfyui_tab', 'ui.launcher_about_tab', "
+                "'ui.external_models_tab', 'core.version_manager') if m in sys.modules))")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=30)
+        self.assertEqual(out.returncode, 0, out.stderr)
+        self.assertEqual(out.stdout.strip(), "")
+    def test_select_tab_uses_tab_table_order(self):
+        from ui.layout import TAB_ORDER
+        from ui.events import select_tab
+        self.assertIn("console", TAB_ORDER)
+        self.assertIn("instances", TAB_ORDER)
+        selected = []
+        notebook = SimpleNamespace(tabs=lambda: list(TAB_ORDER), select=selected.append)
+        app = SimpleNamespace(notebook=notebook, nav_buttons={}, _tab_builders={}, _vm_embedded=True)
+        select_tab(app, "instances")
+        self.assertEqual(selected, ["instances"])
+
+    def test_assigned_version_manager_skips_lazy_creation(self):
+        from comfyui_launcher_enhanced import ComfyUILauncherEnhanced
+        app = ComfyUILauncherEnhanced.__new__(ComfyUILauncherEnhanced)
+        vm = object()
+        app.version_manager = vm
+        self.assertIs(app.version_manager, vm)
+
+
+if __name__ == "__main__":
+    unittest.main()
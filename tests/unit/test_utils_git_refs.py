@@ -0,0 +1,73 @@
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils import git_refs as REFS
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", *args], cwd=str(repo), capture_output=True, text=True, check=True).stdout.strip()
+
+
+@unittest.skipUnless(shutil.which("git"), "需要 git")
+class TestGitRefs(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo = Path(self.tmp.name) / "repo"
+        self.repo.mkdir()
+        _git(self.repo, "init", "-q", "-b", "main")
+        _git(self.repo, "config", "user.email", "t@example.com")
+        _git(self.repo, "config", "user.name", "t")
+        (self.repo / "a.txt").write_text("a", encoding="utf-8")
+        _git(self.repo, "add", "a.txt")
+        _git(self.repo, "commit", "-q", "-m", "a")
+        self.c1 = _git(self.repo, "rev-parse", "HEAD")
+        REFS.clear_cache()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_branch_head_and_detached(self):
+        self.assertEqual(REFS.head(self.repo), {"branch": "main", "commit": self.c1, "detached": False})
+        self.assertEqual(REFS.current_branch(self.repo), "main")
+        _git(self.repo, "checkout", "-q", "--detach")
+        self.assertEqual(REFS.head(self.repo), {"branch": None, "commit": self.c1, "detached": True})
+        self.assertEqual(REFS.current_branch(self.repo), "")
+
+    def test_packed_refs_and_peeled_tags(self):
+        _git(self.repo, "tag", "light")
+        _git(self.repo, "tag", "-a", "v1.0.0", "-m", "annotated")
+        # 松散的附注标签无法在不读对象时确定提交
+        self.assertIsNone(REFS.tag_commit(self.repo, "v1.0.0"))
+        _git(self.repo, "pack-refs", "--all")
+        self.assertEqual(REFS.resolve_ref(self.repo, "refs/heads/main"), self.c1)
+        self.assertEqual(REFS.tag_commit(self.repo, "v1.0.0"), self.c1)
+        self.assertEqual(REFS.tag_commit(self.repo, "light"), self.c1)
+        self.assertEqual(REFS.dwim(self.repo, "v1.0.0"), _git(self.repo, "rev-parse", "v1.0.0"))
+        self.assertEqual(REFS.dwim(self.repo, "main"), self.c1)
+        self.assertIsNone(REFS.dwim(self.repo, "HEAD~1"))
+        self.assertIsNone(REFS.dwim(self.repo, "no-such"))
+
+    def test_symbolic_ref(self):
+        _git(self.repo, "update-ref", "refs/remotes/origin/main", self.c1)
+        _git(self.repo, "symbolic-ref", "refs/remotes/origin/HEAD", "refs/remotes/origin/main")
+        self.assertEqual(REFS.symbolic_ref(self.repo, "refs/remotes/origin/HEAD"), "refs/remotes/origin/main")
+        self.assertIsNone(REFS.symbolic_ref(self.repo, "refs/heads/main"))
+        self.assertEqual(REFS.dwim(self.repo, "origin"), self.c1)
+
+    def test_worktree_git_file(self):
+        wt = Path(self.tmp.name) / "wt"
+        _git(self.repo, "worktree", "add", "-q", "-b", "side", str(wt))
+        self.assertTrue((wt / ".git").is_file())
+        self.assertEqual(REFS.head(wt), {"branch": "side", "commit": self.c1, "detached": False})
+        self.assertEqual(REFS.current_branch(self.repo), "main")
+
+    def test_not_a_repo(self):
+        self.assertIsNone(REFS.head(self.tmp.name))
+        self.assertIsNone(REFS.current_branch(self.tmp.name))
+
+
+if __name__ == "__main__":
+    unittest.main()
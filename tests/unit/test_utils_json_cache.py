@@ -0,0 +1,44 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from utils.json_cache import JsonStore, read_json, write_json
+
+
+class TestJsonCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_write_is_atomic_and_read_falls_back(self):
+        path = self.root / "sub" / "a.json"
+        self.assertIsNone(read_json(path))
+        self.assertEqual(read_json(path, {}), {})
+        self.assertTrue(write_json(path, {"k": "值"}))
+        self.assertEqual(read_json(path), {"k": "值"})
+        self.assertFalse(path.with_suffix(".tmp").exists())
+        path.write_text("{broken", encoding="utf-8")
+        self.assertEqual(read_json(path, []), [])
+
+    def test_store_loads_lazily_and_reset_rereads_disk(self):
+        path = self.root / "store.json"
+        path.write_text(json.dumps(["not", "a", "dict"]), encoding="utf-8")
+        store = JsonStore("store.json", indent=2)
+        with mock.patch.object(store, "path", lambda: path):
+            self.assertEqual(store.data(), {})
+            with store.lock:
+                store.data()["x"] = 1
+                store.save()
+            path.write_text(json.dumps({"y": 2}), encoding="utf-8")
+            self.assertEqual(store.data(), {"x": 1})
+            store.reset()
+            self.assertEqual(store.data(), {"y": 2})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,42 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+
+class TestStartupTracer(unittest.TestCase):
+    def test_spans_written_as_chrome_trace(self):
+        from utils.startup_trace import StartupTracer
+        tr = StartupTracer()
+        tr.since_start("module_imports")
+        with tr.span("outer", step=1):
+            with tr.span("inner"):
+                pass
+        with tempfile.TemporaryDirectory() as tmp:
+            path = tr.write(Path(tmp) / "startup_trace.json")
+            data = json.loads(path.read_text(encoding="utf-8"))
+        events = data["traceEvents"]
+        spans = {e["name"]: e for e in events if e["ph"] == "X"}
+        self.assertEqual(set(spans), {"module_imports", "outer", "inner"})
+        self.assertEqual(spans["outer"]["args"], {"step": 1})
+        self.assertGreaterEqual(spans["outer"]["dur"], spans["inner"]["dur"])
+        self.assertTrue(any(e["ph"] == "M" and e["name"] == "thread_name" for e in events))
+        self.assertIn("outer=", tr.summary())
+
+    def test_first_only_once(self):
+        from utils.startup_trace import StartupTracer
+        tr = StartupTracer()
+        self.assertTrue(tr.first("resolve_git"))
+        self.assertFalse(tr.first("resolve_git"))
+
+    def test_span_records_on_exception(self):
+        from utils.startup_trace import StartupTracer
+        tr = StartupTracer()
+        with self.assertRaises(ValueError):
+            with tr.span("boom"):
+                raise ValueError()
+        self.assertEqual([e["name"] for e in tr.events()], ["boom"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
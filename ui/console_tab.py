@@ -0,0 +1,129 @@
+import tkinter as tk
+from tkinter import ttk
+
+# 每帧最多从缓冲拉取一次并批量写入 Text，避免逐行插入阻塞 Tk 线程
+FRAME_INTERVAL_MS = 50
+IDLE_INTERVAL_MS = 250
+
+
+def _cfg_get(app, key_path, default):
+    try:
+        if getattr(app, 'services', None):
+            return app.services.config.get(key_path, default)
+    except Exception:
+        pass
+    try:
+        node = app.config
+        for k in key_path.split('.'):
+            node = node[k]
+        return node
+    except Exception:
+        return default
+
+
+def _cfg_set(app, key_path, value):
+    try:
+        if getattr(app, 'services', None):
+            app.services.config.set(key_path, value)
+            app.services.config.save()
+            app.config = app.services.config.get_config()
+            return
+    except Exception:
+        pass
+    try:
+        app.config_manager.set(key_path, value)
+        app.config_manager.save_config()
+        app.config = app.config_manager.get_config()
+    except Exception:
+        pass
+
+
+def build_console_tab(app, parent):
+    tab = ttk.Frame(parent, padding="10 8 12 10", style='Card.TFrame')
+    tab.pack(fill=tk.BOTH, expand=True)
+
+    ttk.Label(tab, text="ComfyUI 控制台", font=("Microsoft YaHei", 16, 'bold')).pack(anchor='w', pady=(0, 12))
+
+    options = ttk.Frame(tab, style='Subtle.TFrame', padding=12)
+    options.pack(fill=tk.X, pady=(0, 10))
+
+    capture_var = tk.BooleanVar(value=bool(_cfg_get(app, "launch_options.capture_output", False)))
+    auto_scroll_var = tk.BooleanVar(value=bool(_cfg_get(app, "advanced.auto_scroll_logs", True)))
+    ttk.Checkbutton(options, text="捕获 ComfyUI 输出（下次启动生效）", variable=capture_var,
+                    command=lambda: _cfg_set(app, "launch_options.capture_output", bool(capture_var.get()))).pack(side=tk.LEFT, padx=(0, 12))
+    ttk.Checkbutton(options, text="自动滚动", variable=auto_scroll_var,
+                    command=lambda: _cfg_set(app, "advanced.auto_scroll_logs", bool(auto_scroll_var.get()))).pack(side=tk.LEFT, padx=(0, 12))
+
+    body = ttk.Frame(tab, style='Card.TFrame')
+    body.pack(fill=tk.BOTH, expand=True)
+    text = tk.Text(body, wrap='none', height=24, font=("Consolas", 10), bg="#1E1E1E", fg="#D4D4D4",
+                   insertbackground="#D4D4D4", relief='flat', undo=False)
+    yscroll = ttk.Scrollbar(body, orient=tk.VERTICAL, command=text.yview)
+    xscroll = ttk.Scrollbar(body, orient=tk.HORIZONTAL, command=text.xview)
+    text.configure(yscrollcommand=yscroll.set, xscrollcommand=xscroll.set, state='disabled')
+    yscroll.pack(side=tk.RIGHT, fill=tk.Y)
+    xscroll.pack(side=tk.BOTTOM, fill=tk.X)
+    text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    app.console_text = text
+
+    buf = getattr(getattr(app, 'process_manager', None), 'console_buffer', None)
+    state = {"seq": 0, "lines": 0}
+
+    def _write(lines, reset):
+        text.configure(state='normal')
+        try:
+            if reset:
+                text.delete('1.0', tk.END)
+                state["lines"] = 0
+            if lines:
+                text.insert(tk.END, "\n".join(lines) + "\n")
+                state["lines"] += len(lines)
+            # 控件内容与缓冲容量保持一致，超出部分从头部整块删除
+            excess = state["lines"] - buf.max_lines
+            if excess > 0:
+                text.delete('1.0', f'{excess + 1}.0')
+                state["lines"] -= excess
+        finally:
+            text.configure(state='disabled')
+        if auto_scroll_var.get():
+            text.see(tk.END)
+
+    def _pump():
+        try:
+            if not text.winfo_exists():
+                return
+        except Exception:
+            return
+        delay = IDLE_INTERVAL_MS
+        try:
+            lines, seq, truncated = buf.read_since(state["seq"])
+            state["seq"] = seq
+            if lines or truncated:
+                _write(lines, truncated)
+                delay = FRAME_INTERVAL_MS
+        except Exception:
+            pass
+        try:
+            text.after(delay, _pump)
+        except Exception:
+            pass
+
+    def _clear():
+        # 与渲染路径一致：缓冲不可用时保留“控制台不可用”提示
+        if buf is None:
+            return
+        try:
+            buf.clear()
+        except Exception:
+            pass
+        _write([], True)
+
+    ttk.Button(options, text="清空", command=_clear, style='Secondary.TButton').pack(side=tk.RIGHT)
+
+    if buf is None:
+        text.configure(state='normal')
+        text.insert(tk.END, "控制台不可用\n")
+        text.configure(state='disabled')
+        return tab
+    _pump()
+    return tab
@@ -24,4 +24,6 @@ SHADOW_WIDTH = 6
 
 SECTION_TITLE_FONT = ("Microsoft YaHei", 18, "bold")
 INTERNAL_HEAD_LABEL_FONT = ("Microsoft YaHei", 14, "bold")
-BODY_FONT = ("Microsoft YaHei", 10)
\ No newline at end of file
+BODY_FONT = ("Microsoft YaHei", 10)
+# GitHub 代理模式 -> 界面显示文字
+GIT_PROXY_MODE_TEXT = {"gh-proxy": "gh-proxy", "custom": "自定义", "auto": "自动", "none": "不使用"}
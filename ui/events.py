@@ -2,8 +2,17 @@ from tkinter import messagebox, filedialog
 from pathlib import Path
 
 def select_tab(app, name):
-    tab_order = ["launch", "version", "external_models", "about", "comfyui", "about_launcher"]
-    idx = tab_order.index(name)
+    from ui.layout import TAB_ORDER
+    idx = TAB_ORDER.index(name)
+    # 非首屏页在第一次选中时才构建
+    try:
+        from ui.layout import ensure_tab_built
+        ensure_tab_built(app, name)
+    except Exception as e:
+        try:
+            app.logger.exception(f"构建页面 {name} 出错: {e}")
+        except Exception:
+            pass
     tabs = app.notebook.tabs()
     if idx < len(tabs):
         app.notebook.select(tabs[idx])
@@ -163,8 +172,8 @@ def perform_batch_update(app):
                     except Exception:
                         pass
             app.root.after(0, _reset_btn)
-    import threading
-    threading.Thread(target=worker, daemon=True).start()
+    from core import scheduler as SCHED
+    SCHED.submit(worker, key="update:batch")
 def reset_settings(app):
     if messagebox.askyesno("确认", "确定恢复默认设置?"):
         app.compute_mode.set("gpu")
@@ -0,0 +1,142 @@
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+_STATE_TEXT = {
+    "idle": "已停止",
+    "starting": "启动中",
+    "ready": "运行中",
+    "stopping": "停止中",
+    "exited": "已退出",
+}
+
+
+def build_instances_tab(app, parent):
+    tab = ttk.Frame(parent, padding="10 8 12 10", style='Card.TFrame')
+    tab.pack(fill=tk.BOTH, expand=True)
+
+    ttk.Label(tab, text="多实例管理", font=("Microsoft YaHei", 16, 'bold')).pack(anchor='w', pady=(0, 12))
+
+    mgr = getattr(getattr(app, 'process_manager', None), 'instances', None)
+    if mgr is None:
+        ttk.Label(tab, text="多实例管理不可用", style='Help.TLabel').pack(anchor='w')
+        return tab
+
+    form = ttk.Frame(tab, style='Subtle.TFrame', padding=12)
+    form.pack(fill=tk.X, pady=(0, 10))
+    port_var = tk.StringVar()
+    name_var = tk.StringVar()
+    args_var = tk.StringVar()
+    ttk.Label(form, text="端口:", style='Help.TLabel').grid(row=0, column=0, sticky=tk.W, padx=(0, 6))
+    ttk.Entry(form, textvariable=port_var, width=8).grid(row=0, column=1, sticky=tk.W, padx=(0, 12))
+    ttk.Label(form, text="名称:", style='Help.TLabel').grid(row=0, column=2, sticky=tk.W, padx=(0, 6))
+    ttk.Entry(form, textvariable=name_var, width=16).grid(row=0, column=3, sticky=tk.W, padx=(0, 12))
+    ttk.Label(form, text="额外参数:", style='Help.TLabel').grid(row=0, column=4, sticky=tk.W, padx=(0, 6))
+    ttk.Entry(form, textvariable=args_var, width=28).grid(row=0, column=5, sticky=tk.W, padx=(0, 12))
+
+    summary_var = tk.StringVar(value=mgr.format_aggregate())
+    ttk.Label(tab, textvariable=summary_var, style='Help.TLabel').pack(anchor='w', pady=(0, 6))
+
+    tree = ttk.Treeview(tab, columns=("name", "port", "state", "pid"), show='headings', height=10)
+    for col, text, width in (("name", "名称", 180), ("port", "端口", 80), ("state", "状态", 100), ("pid", "PID", 100)):
+        tree.heading(col, text=text)
+        tree.column(col, width=width, stretch=(col == "name"))
+    tree.pack(fill=tk.BOTH, expand=True)
+
+    def refresh():
+        try:
+            selected = tree.selection()
+            tree.delete(*tree.get_children())
+            for st in mgr.statuses():
+                tree.insert('', tk.END, iid=st["port"], values=(
+                    st["name"], st["port"], _STATE_TEXT.get(st["state"], st["state"]), st["pid"] or "",
+                ))
+            keep = [i for i in selected if tree.exists(i)]
+            if keep:
+                tree.selection_set(keep)
+            summary_var.set(mgr.format_aggregate())
+        except Exception:
+            pass
+
+    def _on_state(port, state, info):
+        # 监督器回调在后台线程，投递到界面线程刷新
+        try:
+            app.root.after(0, refresh)
+        except Exception:
+            pass
+    mgr.add_listener(_on_state)
+
+    def _selected_port():
+        sel = tree.selection()
+        if not sel:
+            messagebox.showinfo("提示", "请先选择一个实例")
+            return None
+        return sel[0]
+
+    def _in_background(fn, port, action):
+        def _bg():
+            try:
+                fn(port)
+            except Exception as e:
+                msg = str(e)
+                try:
+                    app.root.after(0, lambda: messagebox.showerror("错误", f"{action}失败: {msg}"))
+                except Exception:
+                    pass
+            try:
+                app.root.after(0, refresh)
+            except Exception:
+                pass
+        threading.Thread(target=_bg, daemon=True).start()
+
+    def add_instance():
+        try:
+            mgr.add(port_var.get(), name_var.get().strip(), args_var.get())
+            port_var.set("")
+            name_var.set("")
+            args_var.set("")
+        except Exception as e:
+            messagebox.showerror("错误", str(e))
+        refresh()
+
+    def remove_instance():
+        port = _selected_port()
+        if port is None:
+            return
+        try:
+            mgr.remove(port)
+        except Exception as e:
+            messagebox.showerror("错误", str(e))
+        refresh()
+
+    def start_instance():
+        port = _selected_port()
+        if port is not None:
+            _in_background(mgr.start, port, "启动")
+
+    def stop_instance():
+        port = _selected_port()
+        if port is not None:
+            _in_background(mgr.stop, port, "停止")
+
+    def open_instance():
+        port = _selected_port()
+        if port is None:
+            return
+        try:
+            import webbrowser
+            webbrowser.open(f"http://127.0.0.1:{port}")
+        except Exception:
+            pass
+
+    ttk.Button(form, text="添加", command=add_instance, style='Secondary.TButton').grid(row=0, column=6, sticky=tk.W)
+
+    actions = ttk.Frame(tab, style='Card.TFrame')
+    actions.pack(fill=tk.X, pady=(8, 0))
+    for text, cmd in (("启动", start_instance), ("停止", stop_instance), ("打开网页", open_instance), ("移除", remove_instance)):
+        ttk.Button(actions, text=text, command=cmd, style='Secondary.TButton').pack(side=tk.LEFT, padx=(0, 8))
+    ttk.Button(actions, text="全部停止", command=lambda: _in_background(lambda _p: mgr.stop_all(), None, "停止"),
+               style='Secondary.TButton').pack(side=tk.RIGHT)
+
+    refresh()
+    return tab
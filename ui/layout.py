@@ -5,11 +5,8 @@ from ui.custom_widges import BigLaunchButton, RoundedButton, SectionCard
 from ui import version_panel as VERSION
 from ui import quick_links_panel as QUICK
 from ui import launch_controls_panel as LAUNCH
-from ui import about_tab as ABOUT
-from ui import comfyui_tab as COMFY
 from ui import start_button_panel as START
-from ui import launcher_about_tab as LAUNCHER_ABOUT
-from ui import external_models_tab as EXT_MODELS
+from utils.startup_trace import span as TRACE_SPAN
 from ui.constants import COLORS, LAUNCH_BUTTON_CENTER, SIDEBAR_DIVIDER_SHADOW, SIDEBAR_DIVIDER_COLOR, SHADOW_WIDTH, LEFT_RIGHT_GAP, CARD_BORDER_COLOR, CARD_BG, SECTION_TITLE_FONT, INTERNAL_HEAD_LABEL_FONT, BODY_FONT
 
 def build_layout(app):
@@ -23,11 +20,7 @@ def build_layout(app):
     sidebar_header.pack(fill=tk.X, pady=(18, 12))
     tk.Label(sidebar_header, text="ComfyUI\n启动器", bg=c["SIDEBAR_BG"], fg="#FFFFFF", font=("Microsoft YaHei", 18, 'bold'), anchor='center', justify='center').pack(fill=tk.X)
     tk.Label(sidebar_header, text="by 黎黎原上咩", bg=c["SIDEBAR_BG"], fg=c.get("TEXT_MUTED", "#A0A4AA"), font=("Microsoft YaHei", 11), anchor='center', justify='center').pack(fill=tk.X, pady=(4, 0))
-    app.nav_buttons = {}
-    for key, label in [("launch", "🚀 启动与更新"), ("version", "🧬 内核版本管理"), ("external_models", "📦 外置模型库管理"), ("about", "👤 关于我"), ("comfyui", "📚 关于ComfyUI"), ("about_launcher", "🧰 关于启动器")]:
-        btn = ttk.Button(app.sidebar, text=label, style='Nav.TButton', command=lambda k=key: app.select_tab(k))
-        btn.pack(fill=tk.X, padx=8, pady=3)
-        app.nav_buttons[key] = btn
+    build_nav_buttons(app)
     if True:
         if SIDEBAR_DIVIDER_SHADOW:
             shadow_canvas = tk.Canvas(app.main_container, width=1 + SHADOW_WIDTH, highlightthickness=0, bd=0, bg=c["BG"])
@@ -40,29 +33,62 @@ def build_layout(app):
     app.content_area.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
     app.notebook = ttk.Notebook(app.content_area, style='Hidden.TNotebook')
     app.notebook.pack(fill=tk.BOTH, expand=True)
-    app.tab_frames = {
-        "launch": tk.Frame(app.notebook, bg=c["BG"]),
-        "version": tk.Frame(app.notebook, bg=c["BG"]),
-        "external_models": tk.Frame(app.notebook, bg=c["BG"]),
-        "comfyui": tk.Frame(app.notebook, bg=c["BG"]),
-        "about": tk.Frame(app.notebook, bg=c["BG"]),
-        "about_launcher": tk.Frame(app.notebook, bg=c["BG"]),
-    }
-    app.notebook.add(app.tab_frames["launch"], text="启动与更新")
-    app.notebook.add(app.tab_frames["version"], text="内核版本管理")
-    app.notebook.add(app.tab_frames["external_models"], text="外置模型库管理")
-    app.notebook.add(app.tab_frames["about"], text="关于我")
-    app.notebook.add(app.tab_frames["comfyui"], text="关于 ComfyUI")
-    app.notebook.add(app.tab_frames["about_launcher"], text="关于启动器")
-    build_launch_tab(app, app.tab_frames["launch"])
-    build_version_tab(app, app.tab_frames["version"])
-    EXT_MODELS.build_external_models_tab(app, app.tab_frames["external_models"])
-    ABOUT.build_about_tab(app, app.tab_frames["about"])
-    LAUNCHER_ABOUT.build_about_launcher(app, app.tab_frames["about_launcher"])
-    COMFY.build_about_comfyui(app, app.tab_frames["comfyui"])
+    build_tab_frames(app, c["BG"])
+
+
+# 页名, 侧栏文字, 页标题, (模块, 构建函数)：侧栏按钮、Notebook 页与按需构建共用此表，顺序即页序。
+# 构建函数按需导入，首次选中对应页时才构建
+_LAZY_TABS = (
+    ("launch", "🚀 启动与更新", "启动与更新", ("ui.layout", "build_launch_tab")),
+    ("version", "🧬 内核版本管理", "内核版本管理", ("ui.layout", "build_version_tab")),
+    ("external_models", "📦 外置模型库管理", "外置模型库管理", ("ui.external_models_tab", "build_external_models_tab")),
+    ("console", "🖥 控制台", "控制台", ("ui.console_tab", "build_console_tab")),
+    ("instances", "🧩 多实例", "多实例", ("ui.instances_tab", "build_instances_tab")),
+    ("about", "👤 关于我", "关于我", ("ui.about_tab", "build_about_tab")),
+    ("comfyui", "📚 关于ComfyUI", "关于 ComfyUI", ("ui.comfyui_tab", "build_about_comfyui")),
+    ("about_launcher", "🧰 关于启动器", "关于启动器", ("ui.launcher_about_tab", "build_about_launcher")),
+)
+TAB_ORDER = tuple(t[0] for t in _LAZY_TABS)
+
+
+def build_nav_buttons(app):
+    app.nav_buttons = {}
+    for key, label, _title, _spec in _LAZY_TABS:
+        btn = ttk.Button(app.sidebar, text=label, style='Nav.TButton', command=lambda k=key: app.select_tab(k))
+        btn.pack(fill=tk.X, padx=8, pady=3)
+        app.nav_buttons[key] = btn
+
+
+def build_tab_frames(app, bg):
+    """创建各页容器并登记构建函数。
+
+    首屏只构建“启动与更新”页；其余页在首次选中时由 ensure_tab_built 构建，
+    对应模块（含图片解码的关于页、内核版本管理等）也推迟到那时才导入。
+    """
+    app.tab_frames = {}
+    for key, _label, title, _spec in _LAZY_TABS:
+        frame = tk.Frame(app.notebook, bg=bg)
+        app.notebook.add(frame, text=title)
+        app.tab_frames[key] = frame
+    app._tab_builders = {key: spec for key, _label, _title, spec in _LAZY_TABS}
+    ensure_tab_built(app, "launch")
     app.notebook.select(app.notebook.tabs()[0])
     app.current_tab_name = "launch"
-    
+
+
+def ensure_tab_built(app, name) -> bool:
+    """若页 name 尚未构建则构建之；返回本次是否实际构建。"""
+    builders = getattr(app, '_tab_builders', None) or {}
+    spec = builders.pop(name, None)
+    if spec is None:
+        return False
+    import importlib
+    module_name, func_name = spec
+    with TRACE_SPAN(f"tab:{name}"):
+        builder = getattr(importlib.import_module(module_name), func_name)
+        builder(app, app.tab_frames[name])
+    return True
+
 
 def build_launch_tab(app, parent):
     c = app.COLORS
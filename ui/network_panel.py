@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import ttk
-from ui.constants import CARD_BG, BODY_FONT
+from ui.constants import CARD_BG, BODY_FONT, GIT_PROXY_MODE_TEXT
 
 
 def build_network_panel(app, form, rounded_button_cls=None, row_index: int = 3):
@@ -19,7 +19,7 @@ def build_network_panel(app, form, rounded_button_cls=None, row_index: int = 3):
     app.hf_mirror_combobox = ttk.Combobox(
         net_frame,
         textvariable=app.selected_hf_mirror,
-        values=["不使用镜像", "hf-mirror", "自定义"],
+        values=["不使用镜像", "hf-mirror", "自动", "自定义"],
         state="readonly",
         width=12
     )
@@ -39,22 +39,22 @@ def build_network_panel(app, form, rounded_button_cls=None, row_index: int = 3):
     )
     app.github_proxy_mode_combo = ttk.Combobox(
         net_frame,
-        textvariable=app.version_manager.proxy_mode_ui_var,
-        values=["不使用", "gh-proxy", "自定义"],
+        textvariable=app.git_proxy_mode_ui,
+        values=["不使用", "gh-proxy", "自动", "自定义"],
         state='readonly',
         width=12
     )
     app.github_proxy_mode_combo.grid(row=1, column=1, sticky='w', padx=(0, 8), pady=(6, 0))
     app.github_proxy_url_entry = ttk.Entry(
         net_frame,
-        textvariable=app.version_manager.proxy_url_var,
+        textvariable=app.git_proxy_url,
         width=24
     )
     app.github_proxy_url_entry.grid(row=1, column=2, sticky='w', padx=(8, 0), pady=(6, 0))
 
     def _set_github_entry_visibility():
         try:
-            mode = app.version_manager.proxy_mode_var.get()
+            mode = app.git_proxy_mode.get()
             if mode == 'custom':
                 if not app.github_proxy_url_entry.winfo_ismapped():
                     app.github_proxy_url_entry.grid(row=1, column=2, sticky='w', padx=(8, 0), pady=(6, 0))
@@ -67,12 +67,13 @@ def build_network_panel(app, form, rounded_button_cls=None, row_index: int = 3):
 
     def _on_mode_change_local(_evt=None):
         try:
-            vm = app.version_manager
-            vm.proxy_mode_var.set(vm._get_mode_internal(vm.proxy_mode_ui_var.get()))
-            if vm.proxy_mode_var.get() == 'gh-proxy':
-                vm.proxy_url_var.set('https://gh-proxy.com/')
+            # 内核版本管理尚未创建也能切换；变量的写入回调负责保存配置
+            ui_text = app.git_proxy_mode_ui.get()
+            mode = next((k for k, v in GIT_PROXY_MODE_TEXT.items() if v == ui_text), 'none')
+            app.git_proxy_mode.set(mode)
+            if mode == 'gh-proxy':
+                app.git_proxy_url.set('https://gh-proxy.com/')
             _set_github_entry_visibility()
-            vm.save_proxy_settings()
         except Exception:
             pass
 
@@ -89,7 +90,7 @@ def build_network_panel(app, form, rounded_button_cls=None, row_index: int = 3):
     app.pypi_proxy_mode_combo = ttk.Combobox(
         net_frame,
         textvariable=app.pypi_proxy_mode_ui,
-        values=["不使用", "阿里云", "自定义"],
+        values=["不使用", "阿里云", "自动", "自定义"],
         state='readonly',
         width=12
     )
@@ -143,6 +144,8 @@ def build_network_panel(app, form, rounded_button_cls=None, row_index: int = 3):
             return "aliyun"
         if ui_text == "自定义":
             return "custom"
+        if ui_text == "自动":
+            return "auto"
         return "none"
 
     def _on_pypi_mode_change(_evt=None):
@@ -26,7 +26,7 @@ def setup_variables(app):
     app.pypi_proxy_mode = tk.StringVar(value=default_pypi_mode)
     app.pypi_proxy_url = tk.StringVar(value=default_pypi_url)
     def _pypi_mode_ui_text(mode: str):
-        return "阿里云" if mode == "aliyun" else ("自定义" if mode == "custom" else "不使用")
+        return {"aliyun": "阿里云", "custom": "自定义", "auto": "自动"}.get(mode, "不使用")
     app.pypi_proxy_mode_ui = tk.StringVar(value=_pypi_mode_ui_text(default_pypi_mode))
     app.pypi_proxy_mode.trace_add("write", lambda *a: (app.save_config(), app.apply_pip_proxy_settings()))
     app.pypi_proxy_url.trace_add("write", lambda *a: (app.save_config(), app.apply_pip_proxy_settings()))
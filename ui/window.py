@@ -4,6 +4,7 @@ from tkinter import ttk
 from ui import assets_helper as ASSETS
 from ui import theme as THEME
 from ui.constants import COLORS
+from utils.startup_trace import span as TRACE_SPAN
 
 def setup_window(app):
     try:
@@ -24,13 +25,16 @@ def setup_window(app):
         except Exception:
             pass
         try:
-            ASSETS.apply_window_icons(app.root, getattr(app, 'logger', None))
+            with TRACE_SPAN("window_icons"):
+                ASSETS.apply_window_icons(app.root, getattr(app, 'logger', None))
         except Exception:
             pass
-        app.style = THEME.create_style(logger=getattr(app, 'logger', None))
+        with TRACE_SPAN("theme_create"):
+            app.style = THEME.create_style(logger=getattr(app, 'logger', None))
         if not app.style:
             return
-        THEME.apply_theme(app.style, logger=getattr(app, 'logger', None))
+        with TRACE_SPAN("theme_apply"):
+            THEME.apply_theme(app.style, logger=getattr(app, 'logger', None))
         try:
             app.style.layout('Hidden.TNotebook.Tab', [])
         except Exception:
@@ -40,8 +44,9 @@ def setup_window(app):
         except Exception:
             pass
         
-        THEME.configure_default_font(app.root, logger=getattr(app, 'logger', None))
-        THEME.configure_styles(app.style, COLORS, logger=getattr(app, 'logger', None))
+        with TRACE_SPAN("theme_styles"):
+            THEME.configure_default_font(app.root, logger=getattr(app, 'logger', None))
+            THEME.configure_styles(app.style, COLORS, logger=getattr(app, 'logger', None))
         try:
             def _on_cfg(_=None):
                 try:
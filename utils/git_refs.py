@@ -0,0 +1,232 @@
+"""
+只读的纯 Python Git 引用读取。
+
+直接读取 `.git/HEAD`、`refs/*` 与 `packed-refs` 回答当前分支、HEAD 哈希、符号引用与标签查询，
+支持分离 HEAD、符号引用链、packed-refs（含 `^` 解引用行）以及 worktree/子模块的 `.git` 文件。
+无法确定的情况（reftable 存储、附注标签未打包时的解引用等）返回 None，由调用方回退到 git。
+"""
+
+import re
+import threading
+from pathlib import Path
+
+_SHA_RE = re.compile(r"^[0-9a-f]{40}(?:[0-9a-f]{24})?$")
+_MAX_SYMREF_DEPTH = 5
+
+_lock = threading.Lock()
+_packed_cache = {}
+
+
+def _is_sha(s: str) -> bool:
+    return bool(s) and bool(_SHA_RE.match(s))
+
+
+def git_dirs(repo):
+    """返回 (gitdir, commondir)：前者存放 HEAD 等 worktree 私有引用，后者存放共享 refs；找不到时返回 None。"""
+    try:
+        dot = Path(repo) / ".git"
+        if dot.is_dir():
+            gd = dot
+        elif dot.is_file():
+            txt = dot.read_text(encoding="utf-8", errors="ignore").strip()
+            if not txt.startswith("gitdir:"):
+                return None
+            gd = Path(txt[len("gitdir:"):].strip())
+            if not gd.is_absolute():
+                gd = (Path(repo) / gd).resolve()
+        else:
+            return None
+        common = gd
+        cf = gd / "commondir"
+        if cf.is_file():
+            c = Path(cf.read_text(encoding="utf-8", errors="ignore").strip())
+            common = c if c.is_absolute() else (gd / c).resolve()
+        return gd, common
+    except Exception:
+        return None
+
+
+def _supported(dirs) -> bool:
+    # reftable 存储无法用文件读取解析
+    try:
+        return not (dirs[1] / "reftable").is_dir()
+    except Exception:
+        return False
+
+
+def _packed(common: Path):
+    """解析公共目录下的 packed-refs，返回 (traits, {引用名: (哈希, 解引用哈希或 None)})；按 mtime/大小缓存。"""
+    path = common / "packed-refs"
+    try:
+        st = path.stat()
+    except Exception:
+        return set(), {}
+    key = str(path)
+    sig = (st.st_mtime_ns, st.st_size)
+    with _lock:
+        hit = _packed_cache.get(key)
+        if hit is not None and hit[0] == sig:
+            return hit[1], hit[2]
+    traits = set()
+    refs = {}
+    last = None
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if line.startswith("# pack-refs with:"):
+                    traits = set(line.split(":", 1)[1].split())
+                    continue
+                if not line or line.startswith("#"):
+                    continue
+                if line.startswith("^"):
+                    if last is not None:
+                        refs[last] = (refs[last][0], line[1:].strip())
+                    continue
+                parts = line.split(" ", 1)
+                if len(parts) == 2 and _is_sha(parts[0]):
+                    last = parts[1].strip()
+                    refs[last] = (parts[0], None)
+    except Exception:
+        return set(), {}
+    with _lock:
+        _packed_cache[key] = (sig, traits, refs)
+    return traits, refs
+
+
+def packed_refs(repo) -> dict:
+    """返回 {引用名: (哈希, 解引用后的哈希或 None)}。"""
+    dirs = git_dirs(repo)
+    if dirs is None:
+        return {}
+    return _packed(dirs[1])[1]
+
+
+def _ref_file(dirs, name: str) -> Path:
+    # HEAD 等根级伪引用与 refs/bisect、refs/worktree 属于当前 worktree，其余 refs 在公共目录
+    gd, common = dirs
+    if "/" not in name or name.startswith(("refs/bisect/", "refs/worktree/", "refs/rewritten/")):
+        return gd / name
+    return common / name
+
+
+def _read_raw(dirs, name: str):
+    """返回 ("sha", 值) / ("sym", 目标) / None（引用不存在）。"""
+    try:
+        p = _ref_file(dirs, name)
+        if p.is_file():
+            txt = p.read_text(encoding="utf-8", errors="ignore").strip()
+            if txt.startswith("ref:"):
+                return "sym", txt[4:].strip()
+            if _is_sha(txt):
+                return "sha", txt
+            return None
+    except Exception:
+        return None
+    if name.startswith("refs/"):
+        hit = _packed(dirs[1])[1].get(name)
+        if hit:
+            return "sha", hit[0]
+    return None
+
+
+def resolve_ref(repo, name: str):
+    """完整引用名 -> 哈希（沿符号引用解析）；不存在或无法回答时返回 None。"""
+    dirs = git_dirs(repo)
+    if dirs is None or not _supported(dirs):
+        return None
+    for _ in range(_MAX_SYMREF_DEPTH):
+        raw = _read_raw(dirs, name)
+        if raw is None:
+            return None
+        kind, value = raw
+        if kind == "sha":
+            return value
+        name = value
+    return None
+
+
+def symbolic_ref(repo, name: str):
+    """读取符号引用的直接目标（如 refs/remotes/origin/HEAD -> refs/remotes/origin/master）。
+
+    返回目标引用名；引用不是符号引用或无法确定时返回 None。
+    """
+    dirs = git_dirs(repo)
+    if dirs is None or not _supported(dirs):
+        return None
+    raw = _read_raw(dirs, name)
+    if raw and raw[0] == "sym":
+        return raw[1]
+    return None
+
+
+def head(repo):
+    """返回 {"branch": 分支名或 None, "commit": 哈希或 None, "detached": bool}；无法回答时返回 None。
+
+    未诞生的分支（尚无提交）返回分支名且 commit 为 None。
+    """
+    dirs = git_dirs(repo)
+    if dirs is None or not _supported(dirs):
+        return None
+    raw = _read_raw(dirs, "HEAD")
+    if raw is None:
+        return None
+    kind, value = raw
+    if kind == "sha":
+        return {"branch": None, "commit": value, "detached": True}
+    branch = value[len("refs/heads/"):] if value.startswith("refs/heads/") else value
+    return {"branch": branch, "commit": resolve_ref(repo, value), "detached": False}
+
+
+def current_branch(repo):
+    """等价于 `git branch --show-current`：分离 HEAD 时返回空串；无法回答时返回 None。"""
+    h = head(repo)
+    if h is None:
+        return None
+    return h["branch"] or ""
+
+
+def dwim(repo, name: str):
+    """按 git 的简写规则解析引用名：HEAD/refs/...、refs/<name>、refs/tags、refs/heads、refs/remotes。
+
+    哈希、含修饰符（~ ^ : 等）或无法解析时返回 None（对象是否存在需由 git 确认）。
+    """
+    if not name or name.startswith("-") or any(c in name for c in " ~^:?*[@{\\") or ".." in name:
+        return None
+    if _is_sha(name):
+        return None
+    if name in ("HEAD", "ORIG_HEAD") or name.startswith("refs/"):
+        cands = [name]
+    else:
+        cands = [f"refs/tags/{name}", f"refs/heads/{name}", f"refs/remotes/{name}", f"refs/remotes/{name}/HEAD"]
+        if "/" in name:
+            cands.insert(0, f"refs/{name}")
+    for cand in cands:
+        sha = resolve_ref(repo, cand)
+        if sha:
+            return sha
+    return None
+
+
+def tag_commit(repo, tag: str):
+    """标签 -> 提交哈希。
+
+    仅在 packed-refs 为 fully-peeled 时可回答（附注标签取 ^ 行，轻量标签取自身）；
+    松散标签可能指向附注标签对象，返回 None 交由 git 解析。
+    """
+    dirs = git_dirs(repo)
+    if dirs is None or not _supported(dirs):
+        return None
+    name = f"refs/tags/{tag}"
+    if _ref_file(dirs, name).is_file():
+        return None
+    traits, refs = _packed(dirs[1])
+    hit = refs.get(name)
+    if hit is None or "fully-peeled" not in traits:
+        return None
+    return hit[1] or hit[0]
+
+
+def clear_cache():
+    with _lock:
+        _packed_cache.clear()
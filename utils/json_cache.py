@@ -0,0 +1,62 @@
+"""
+launcher/ 下 JSON 缓存文件的通用读写。
+
+- launcher_path(*parts)：当前工作目录下 launcher/ 中的路径；
+- read_json / write_json：读取失败返回默认值；写入先写临时文件再 os.replace，中途退出不会留下半个文件；
+- JsonStore：单个 {键: 值} 缓存文件，首次访问时从磁盘加载，调用方在 store.lock 内修改 data() 后 save()。
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+
+def launcher_path(*parts) -> Path:
+    try:
+        return Path.cwd().joinpath("launcher", *parts)
+    except Exception:
+        return Path("launcher").joinpath(*parts)
+
+
+def read_json(path, default=None):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except Exception:
+        return default
+
+
+def write_json(path, data, indent=None) -> bool:
+    try:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=indent), encoding="utf-8")
+        os.replace(tmp, path)
+        return True
+    except Exception:
+        return False
+
+
+class JsonStore:
+    def __init__(self, name: str, indent=None):
+        self.name = name
+        self.indent = indent
+        self.lock = threading.Lock()
+        self._data = None
+
+    def path(self) -> Path:
+        return launcher_path(self.name)
+
+    def data(self) -> dict:
+        if self._data is None:
+            data = read_json(self.path())
+            self._data = data if isinstance(data, dict) else {}
+        return self._data
+
+    def save(self) -> bool:
+        return write_json(self.path(), self._data or {}, indent=self.indent)
+
+    def reset(self):
+        """丢弃内存中的副本，下次访问时重新读取磁盘。"""
+        self._data = None
@@ -2,6 +2,7 @@ from pathlib import Path
 from urllib.parse import urlparse
 
 PYPI_ALIYUN_URL = 'https://mirrors.aliyun.com/pypi/simple/'
+PYPI_OFFICIAL_URL = 'https://pypi.org/simple/'
 HF_MIRROR_URL_DEFAULT = 'https://hf-mirror.com'
 GITHUB_PROXY_DEFAULT_URL = 'https://gh-proxy.com/'
 
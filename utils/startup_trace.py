@@ -0,0 +1,109 @@
+"""
+启动阶段追踪：以 span 记录各初始化步骤耗时，输出 Chrome trace 格式
+（chrome://tracing 或 https://ui.perfetto.dev 可直接打开）。
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+TRACE_FILE_NAME = "startup_trace.json"
+_MAX_EVENTS = 5000
+
+
+class StartupTracer:
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self._events = []
+        self._threads = {}
+        self._once = set()
+        self.path = None
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._t0) * 1e6
+
+    def _add(self, event: dict):
+        tid = threading.get_ident()
+        event.setdefault("pid", os.getpid())
+        event["tid"] = tid
+        with self._lock:
+            if tid not in self._threads:
+                self._threads[tid] = threading.current_thread().name
+            if len(self._events) < _MAX_EVENTS:
+                self._events.append(event)
+
+    @contextmanager
+    def span(self, name: str, cat: str = "startup", **args):
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            ev = {"name": name, "cat": cat, "ph": "X", "ts": round(start, 1), "dur": round(self._now_us() - start, 1)}
+            if args:
+                ev["args"] = args
+            self._add(ev)
+
+    def since_start(self, name: str, cat: str = "startup", **args):
+        """记录从追踪器创建（模块导入）到现在的 span，例如模块导入阶段。"""
+        ev = {"name": name, "cat": cat, "ph": "X", "ts": 0.0, "dur": round(self._now_us(), 1)}
+        if args:
+            ev["args"] = args
+        self._add(ev)
+
+    def first(self, key: str) -> bool:
+        """key 第一次出现时返回 True，用于只追踪首次调用（如首次 resolve_git）。"""
+        with self._lock:
+            if key in self._once:
+                return False
+            self._once.add(key)
+            return True
+
+    def instant(self, name: str, cat: str = "startup", **args):
+        ev = {"name": name, "cat": cat, "ph": "i", "s": "g", "ts": round(self._now_us(), 1)}
+        if args:
+            ev["args"] = args
+        self._add(ev)
+
+    def events(self) -> list:
+        with self._lock:
+            return list(self._events)
+
+    def to_chrome_trace(self) -> dict:
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+        meta = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+                for tid, name in threads.items()]
+        return {"traceEvents": meta + events, "displayTimeUnit": "ms"}
+
+    def write(self, path=None):
+        """写出 trace 文件；可重复调用，后续调用会覆盖并包含新增的 span。"""
+        try:
+            target = Path(path) if path else (self.path or Path.cwd() / "launcher" / TRACE_FILE_NAME)
+            self.path = target
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.to_chrome_trace(), ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, target)
+            return target
+        except Exception:
+            return None
+
+    def summary(self, top: int = 8) -> str:
+        spans = sorted((e for e in self.events() if e.get("ph") == "X"), key=lambda e: e["dur"], reverse=True)
+        return ", ".join(f"{e['name']}={e['dur'] / 1000.0:.1f}ms" for e in spans[:top])
+
+
+_tracer = StartupTracer()
+
+
+def get_tracer() -> StartupTracer:
+    return _tracer
+
+
+def span(name: str, **args):
+    return _tracer.span(name, **args)